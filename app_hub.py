@@ -434,7 +434,7 @@ class ImageToolkitHub(tk.Tk):
         # Fall back to legacy config
         if os.path.exists('imagesorter_config.json'):
             try:
-                with open('imagesorter_config.json', 'r') as f:
+                with open('imagesorter_config.json', 'rb') as f:  # UTF-8
                     config = json.load(f)
                     self.source_folders = config.get('source_folders', [])
                     self.active_sources = config.get('active_sources', {})
@@ -17,72 +17,352 @@ Version: 1.0
 
 import os
 import logging
-import shutil
 import json
 import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from enum import Enum
 
+from file_ops import fast_copy
+
+import numpy as np
+from PIL import Image
+
+# Try to import numba to compile the per-image scoring kernel
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Try to import xxhash for faster content digests (falls back to sha256)
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
 logger = logging.getLogger(__name__)
 
+# Image types scanned by find_suitable_images
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif'}
+_IMAGE_SUFFIXES = frozenset(ext[1:] for ext in IMAGE_EXTENSIONS)
+
+# Concurrent copies in copy_suitable_images (IO-bound, so more than cores)
+COPY_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+# Directories listed concurrently by scan_image_folders
+SCAN_WORKERS = 32
+
+# Set to 1 to classify backgrounds with the int8-quantized WD14 model
+QUANTIZED_ENV_VAR = 'BACKGROUND_CLASSIFIER_QUANTIZED'
+
 # Persistent cache for background tags (survives between sessions)
-CACHE_FILE = Path(__file__).parent / "data" / "background_tag_cache.json"
+CACHE_FILE = Path(__file__).parent / "data" / "background_tag_cache.db"
+
+# Read size when hashing image contents
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def content_digest(image_path: str) -> Optional[str]:
+    """
+    Hash a file's contents (xxh3-128 if available, else sha256).
+
+    Returns:
+        Hex digest, or None if the file can't be read
+    """
+    hasher = xxhash.xxh3_128() if HAS_XXHASH else hashlib.sha256()
+    try:
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+
+def _encode_scores(background_tags: List[str], tag_scores: Dict[str, float]) -> bytes:
+    """Pack scores as little-endian float32s aligned with background_tags."""
+    return np.array([tag_scores[tag] for tag in background_tags], dtype='<f4').tobytes()
+
+
+def _decode_entry(tags: str, scores) -> Dict:
+    """
+    Decode a cache row into {'tags': [...], 'scores': {tag: score}}.
+
+    Scores are a float32 blob aligned with the tag list; rows written before
+    that format store them as a JSON object instead.
+    """
+    tag_list = json.loads(tags)
+    if isinstance(scores, bytes):
+        tag_scores = dict(zip(tag_list, np.frombuffer(scores, dtype='<f4').tolist()))
+    else:
+        tag_scores = json.loads(scores)
+    return {'tags': tag_list, 'scores': tag_scores}
 
 
 class BackgroundTagCache:
-    """Persistent cache for WD14 background tag results."""
+    """
+    Persistent cache for WD14 background tag results.
 
-    def __init__(self):
-        self.cache = {}
-        self._load()
+    Backed by SQLite so lookups and inserts touch only the rows involved,
+    instead of loading and rewriting one large JSON file per session.
 
-    def _load(self):
-        """Load cache from disk."""
-        if CACHE_FILE.exists():
-            try:
-                with open(CACHE_FILE, 'r') as f:
-                    self.cache = json.load(f)
-                logger.info(f"Loaded background cache: {len(self.cache)} entries")
-            except Exception as e:
-                logger.warning(f"Failed to load cache: {e}")
-                self.cache = {}
-
-    def _save(self):
-        """Save cache to disk."""
+    Rows are keyed by path and mtime, and also store a digest of the file
+    contents: when a key misses, the file is hashed and a row for identical
+    contents (a moved, renamed or duplicated image) is reused instead of
+    running WD14 again.
+    """
+
+    # Uncommitted writes are flushed once this many accumulate
+    COMMIT_EVERY = 256
+
+    # Keys per IN (...) query, below SQLite's default bound-variable limit
+    QUERY_CHUNK = 500
+
+    # Content digests remembered between a miss and the set() that follows
+    DIGEST_CACHE_SIZE = 1024
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else CACHE_FILE
+        self.connection = None
+        self._pending_writes = 0
+        self._lock = threading.Lock()
+        # Recent digests computed for cache misses, by cache key (LRU)
+        self._digests = OrderedDict()
+        self._open()
+
+    def _open(self):
+        """Open (or create) the cache database."""
         try:
-            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(self.cache, f)
-        except Exception as e:
-            logger.warning(f"Failed to save cache: {e}")
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            # The global cache is shared by successive scan threads
+            self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Failed to open cache database, using memory only: {e}")
+            self.connection = sqlite3.connect(":memory:", check_same_thread=False)
+
+        self.connection.execute('''
+            CREATE TABLE IF NOT EXISTS background_tags (
+                key TEXT PRIMARY KEY,
+                tags TEXT,
+                scores TEXT,
+                digest TEXT
+            )
+        ''')
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(background_tags)")}
+        if 'digest' not in columns:
+            self.connection.execute("ALTER TABLE background_tags ADD COLUMN digest TEXT")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_background_tags_digest ON background_tags(digest)"
+        )
+        self.connection.commit()
+        self._import_legacy_json()
+
+    def _import_legacy_json(self):
+        """One-time import of the pre-SQLite JSON cache, if present."""
+        legacy_file = self.db_path.with_suffix('.json')
+        if not legacy_file.exists():
+            return
+        if self.connection.execute("SELECT 1 FROM background_tags LIMIT 1").fetchone():
+            return
 
-    def _get_key(self, image_path: str) -> str:
-        """Get cache key from file path and modification time."""
         try:
-            mtime = os.path.getmtime(image_path)
-            return f"{image_path}|{mtime}"
-        except:
-            return image_path
+            with open(legacy_file, 'r') as f:
+                legacy = json.load(f)
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO background_tags (key, tags, scores) VALUES (?, ?, ?)",
+                ((key, json.dumps(entry['tags']), json.dumps(entry['scores']))
+                 for key, entry in legacy.items())
+            )
+            self.connection.commit()
+            logger.info(f"Imported {len(legacy)} entries from legacy cache {legacy_file}")
+        except Exception as e:
+            logger.warning(f"Failed to import legacy cache: {e}")
+
+    def _get_key(self, image_path: str, mtime: Optional[float] = None) -> str:
+        """
+        Get cache key from file path and modification time.
+
+        Pass mtime when it is already known (e.g. from os.scandir) to skip
+        the stat call.
+        """
+        if mtime is None:
+            try:
+                mtime = os.path.getmtime(image_path)
+            except:
+                return image_path
+        return f"{image_path}|{mtime}"
+
+    def _digest(self, image_path: str, key: str) -> Optional[str]:
+        """
+        Content digest for image_path, remembered for recent cache keys.
+
+        Call without holding the lock: hashing reads the whole file.
+        """
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+                return digest
+
+        digest = content_digest(image_path)
+        if digest is not None:
+            with self._lock:
+                self._digests[key] = digest
+                if len(self._digests) > self.DIGEST_CACHE_SIZE:
+                    self._digests.popitem(last=False)
+        return digest
+
+    def _get_by_content(self, misses: Dict[str, Tuple[str, Optional[str]]]) -> Dict[str, Dict]:
+        """
+        Look up key misses by content digest (caller holds the lock).
+
+        Hits are stored under the new key so the next lookup is direct.
+
+        Args:
+            misses: Dict mapping cache key to (image path, content digest)
+
+        Returns:
+            Dict mapping image path to cached entry, for digest hits only
+        """
+        found = {}
+        for key, (image_path, digest) in misses.items():
+            if digest is None:
+                continue
+            row = self.connection.execute(
+                "SELECT tags, scores FROM background_tags WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if row is None:
+                continue
+            self.connection.execute(
+                "INSERT OR REPLACE INTO background_tags (key, tags, scores, digest) "
+                "VALUES (?, ?, ?, ?)",
+                (key, row[0], row[1], digest)
+            )
+            self._pending_writes += 1
+            self._digests.pop(key, None)
+            found[image_path] = _decode_entry(row[0], row[1])
+        return found
 
-    def get(self, image_path: str) -> Optional[Dict]:
+    def get(self, image_path: str, mtime: Optional[float] = None) -> Optional[Dict]:
         """Get cached background tags for image."""
-        key = self._get_key(image_path)
-        return self.cache.get(key)
-
-    def set(self, image_path: str, background_tags: List[str], tag_scores: Dict[str, float]):
-        """Cache background tags for image."""
-        key = self._get_key(image_path)
-        self.cache[key] = {
-            'tags': background_tags,
-            'scores': tag_scores
-        }
+        key = self._get_key(image_path, mtime)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT tags, scores FROM background_tags WHERE key = ?", (key,)
+            ).fetchone()
+        if row is not None:
+            return _decode_entry(row[0], row[1])
+
+        digest = self._digest(image_path, key)
+        with self._lock:
+            return self._get_by_content({key: (image_path, digest)}).get(image_path)
+
+    def get_many(self, image_paths: List[str],
+                 mtimes: Optional[Dict[str, float]] = None) -> Dict[str, Dict]:
+        """
+        Get cached background tags for many images at once.
+
+        Args:
+            image_paths: Images to look up
+            mtimes: Optional known modification times, keyed by path
+
+        Returns:
+            Dict mapping image path to cached entry, for cache hits only
+        """
+        mtimes = mtimes or {}
+        keys = {self._get_key(image_path, mtimes.get(image_path)): image_path
+                for image_path in image_paths}
+        key_list = list(keys)
+        found = {}
+
+        with self._lock:
+            for start in range(0, len(key_list), self.QUERY_CHUNK):
+                chunk = key_list[start:start + self.QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.connection.execute(
+                    f"SELECT key, tags, scores FROM background_tags WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, tags, scores in rows:
+                    found[keys[key]] = _decode_entry(tags, scores)
+
+        if len(found) < len(keys):
+            # Hash the misses before taking the lock again
+            misses = {key: (path, self._digest(path, key))
+                      for key, path in keys.items() if path not in found}
+            with self._lock:
+                found.update(self._get_by_content(misses))
+
+        return found
+
+    def set(self, image_path: str, background_tags: List[str], tag_scores: Dict[str, float],
+            mtime: Optional[float] = None):
+        """
+        Cache background tags for image.
+
+        Entries for earlier versions of the same file (same path, different
+        mtime) are removed, so edited images don't leave stale rows behind.
+        """
+        key = self._get_key(image_path, mtime)
+        # Usually hashed already by the lookup that missed
+        with self._lock:
+            digest = self._digests.pop(key, None)
+        if digest is None:
+            digest = content_digest(image_path)
+        with self._lock:
+            # Keys are "path|mtime": '}' sorts right after '|', bounding the range
+            self.connection.execute(
+                "DELETE FROM background_tags WHERE key > ? AND key < ? AND key != ?",
+                (image_path + '|', image_path + '}', key)
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO background_tags (key, tags, scores, digest) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(background_tags), _encode_scores(background_tags, tag_scores), digest)
+            )
+            self._pending_writes += 1
+            if self._pending_writes >= self.COMMIT_EVERY:
+                self._commit()
+
+    def _commit(self):
+        """Commit pending writes (caller holds the lock)."""
+        try:
+            self.connection.commit()
+            self._pending_writes = 0
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to save cache: {e}")
 
     def save(self):
-        """Persist cache to disk."""
-        self._save()
+        """
+        Persist cache to disk.
+
+        Only rows written since the last commit are flushed. If more than
+        half the database file is free pages (rows for edited images are
+        replaced as they are re-cached), it is vacuumed to reclaim the space.
+        """
+        with self._lock:
+            self._commit()
+            try:
+                free_pages = self.connection.execute("PRAGMA freelist_count").fetchone()[0]
+                total_pages = self.connection.execute("PRAGMA page_count").fetchone()[0]
+                if free_pages * 2 > total_pages:
+                    self.connection.execute("VACUUM")
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to vacuum cache: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM background_tags").fetchone()[0]
 
 
 # Global cache instance
@@ -96,6 +376,231 @@ def get_cache() -> BackgroundTagCache:
     return _cache
 
 
+def _list_directory(directory: str) -> Tuple[List[Tuple[str, float]], List[str]]:
+    """
+    List one directory for scan_image_folders.
+
+    Uses os.scandir so each image is stat'ed once, and the mtime can be
+    reused for the cache key. Symlinked directories are not followed,
+    matching Path.rglob.
+
+    Returns:
+        ([(image_path, mtime), ...], [subdirectory, ...])
+    """
+    images = []
+    subdirs = []
+    try:
+        entries = list(os.scandir(directory))
+    except OSError as e:
+        logger.warning(f"Cannot scan {directory}: {e}")
+        return images, subdirs
+
+    for entry in entries:
+        try:
+            name = entry.name
+            # Check the suffix on the bare name before building entry.path
+            dot = name.rfind('.')
+            if dot > 0 and name[dot + 1:].lower() in _IMAGE_SUFFIXES and entry.is_file():
+                images.append((entry.path, entry.stat().st_mtime))
+            elif entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+        except OSError as e:
+            logger.debug(f"Skipping {entry.path}: {e}")
+    return images, subdirs
+
+
+def scan_image_folders(folders: List[str], cancel_check=None,
+                       max_workers: int = SCAN_WORKERS) -> Dict[str, float]:
+    """
+    Recursively find image files under several folders.
+
+    Directories are listed by a pool of threads, so per-directory latency
+    (network drives, cold caches) overlaps. Pending directories are taken
+    LIFO, walking depth-first so the backlog stays small.
+
+    Args:
+        folders: Root folders to scan
+        cancel_check: Optional callable that returns True to stop early
+        max_workers: Directories listed concurrently
+
+    Returns:
+        Dict mapping image path to mtime, ordered by folder then path
+    """
+    found = [[] for _ in folders]
+    stack = []
+    for index, folder in enumerate(folders):
+        folder_path = Path(folder)
+        if not folder_path.exists():
+            logger.warning(f"Folder not found: {folder}")
+            continue
+        stack.append((index, str(folder_path)))
+    stack.reverse()  # first folder on top
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        in_flight = {}
+        while stack or in_flight:
+            if cancel_check and cancel_check():
+                for future in in_flight:
+                    future.cancel()
+                break
+
+            while stack and len(in_flight) < max_workers:
+                index, directory = stack.pop()
+                in_flight[pool.submit(_list_directory, directory)] = index
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = in_flight.pop(future)
+                images, subdirs = future.result()
+                found[index].extend(images)
+                stack.extend((index, subdir) for subdir in subdirs)
+
+    mtimes = {}
+    for images in found:
+        images.sort()
+        mtimes.update(images)
+    return mtimes
+
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _fast_transparent_check(image_path: str) -> bool:
+    """
+    Check from the file header whether an image can have transparency.
+
+    Reads only a few bytes: PNG color type (4/6 = has alpha) or a tRNS chunk
+    before the image data, and the WebP VP8X/VP8L alpha flags. Other
+    formats return False.
+    """
+    try:
+        with open(image_path, 'rb') as f:
+            header = f.read(30)
+            if header.startswith(_PNG_SIGNATURE):
+                if header[12:16] != b'IHDR':
+                    return False
+                if header[25] in (4, 6):
+                    return True
+                # Walk chunk headers looking for tRNS before IDAT
+                f.seek(8)
+                while True:
+                    chunk = f.read(8)
+                    if len(chunk) < 8:
+                        return False
+                    chunk_type = chunk[4:8]
+                    if chunk_type == b'tRNS':
+                        return True
+                    if chunk_type in (b'IDAT', b'IEND'):
+                        return False
+                    f.seek(int.from_bytes(chunk[:4], 'big') + 4, os.SEEK_CUR)
+
+            if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+                chunk_type = header[12:16]
+                if chunk_type == b'VP8X':
+                    return bool(header[20] & 0x10)
+                if chunk_type == b'VP8L':
+                    # alpha_is_used is bit 28 after the 0x2f signature byte
+                    return bool(int.from_bytes(header[21:25], 'little') >> 28 & 1)
+    except (OSError, IndexError):
+        pass
+    return False
+
+
+def _has_transparent_corners(image_path: str) -> bool:
+    """
+    Decode an image and check that all four corners are fully transparent.
+
+    Images with an alpha band are read directly; only palette/colour-key
+    images (transparency stored outside the pixels) are converted to RGBA.
+    """
+    try:
+        with Image.open(image_path) as image:
+            if image.getbands()[-1] != 'A':
+                image = image.convert('RGBA')
+            width, height = image.size
+            corners = ((0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1))
+            return all(image.getpixel(xy)[-1] == 0 for xy in corners)
+    except Exception as e:
+        logger.debug(f"Alpha check failed for {image_path}: {e}")
+        return False
+
+
+def _has_transparent_background(image_path: str) -> bool:
+    """
+    Whether an image has a transparent background (all four corners clear).
+
+    The header check rules out most images without decoding; images that can
+    have alpha are decoded to confirm, since many RGBA files are opaque.
+    """
+    return _fast_transparent_check(image_path) and _has_transparent_corners(image_path)
+
+
+# Results of _score_background: which rule decided the classification
+_SCORE_NONE, _SCORE_SUITABLE, _SCORE_UNSUITABLE = 0, 1, 2
+
+
+def _score_background_loop(scores, base, unsuitable_mask, threshold):
+    """
+    Apply the suitability rules to one background-tag score vector.
+
+    Written as plain loops so numba can compile it; see _score_background.
+
+    Returns:
+        (decision, index, confidence) where decision is one of _SCORE_*,
+        index points into the background-tag arrays and confidence is the
+        tag score (unsuitable) or base * score (suitable)
+    """
+    best_unsuitable = -1
+    best_unsuitable_score = -1.0
+    best_suitable = -1
+    best_effective = 0.0
+
+    for j in range(scores.shape[0]):
+        score = scores[j]
+        if score < threshold:
+            continue
+        if unsuitable_mask[j]:
+            if score > best_unsuitable_score:
+                best_unsuitable = j
+                best_unsuitable_score = score
+        else:
+            effective = score * base[j]
+            if effective > best_effective:
+                best_suitable = j
+                best_effective = effective
+
+    # Unsuitable tags override suitable ones
+    if best_unsuitable >= 0:
+        return _SCORE_UNSUITABLE, best_unsuitable, best_unsuitable_score
+    if best_suitable >= 0:
+        return _SCORE_SUITABLE, best_suitable, best_effective
+    return _SCORE_NONE, -1, 0.0
+
+
+def _score_background_numpy(scores, base, unsuitable_mask, threshold):
+    """numpy implementation of _score_background_loop, used without numba."""
+    hits = scores >= threshold
+
+    unsuitable = hits & unsuitable_mask
+    if unsuitable.any():
+        j = int(np.argmax(np.where(unsuitable, scores, -1.0)))
+        return _SCORE_UNSUITABLE, j, float(scores[j])
+
+    effective = np.where(hits, scores * base, 0.0)
+    if len(effective):
+        j = int(np.argmax(effective))
+        if effective[j] > 0.0:
+            return _SCORE_SUITABLE, j, float(effective[j])
+    return _SCORE_NONE, -1, 0.0
+
+
+if HAS_NUMBA:
+    # Compiled on first use; cache=True keeps the machine code between runs
+    _score_background = numba.njit(cache=True)(_score_background_loop)
+else:
+    _score_background = _score_background_numpy
+
+
 class BackgroundType(Enum):
     """Classification of background types."""
     SIMPLE = "simple"              # Plain solid backgrounds
@@ -110,6 +615,10 @@ class BackgroundType(Enum):
 @dataclass
 class BackgroundClassification:
     """Result of background classification for an image."""
+    # One result is kept per scanned image, so skip the per-instance __dict__
+    __slots__ = ('image_path', 'background_type', 'is_suitable',
+                 'detected_tags', 'confidence', 'reason')
+
     image_path: str
     background_type: BackgroundType
     is_suitable: bool
@@ -128,6 +637,19 @@ class BackgroundClassification:
         }
 
 
+def _unknown_result(image_path: str, detected_tags: List[str],
+                    reason: str = "No background tags detected") -> BackgroundClassification:
+    """Result for an image without a usable background tag."""
+    return BackgroundClassification(
+        image_path=image_path,
+        background_type=BackgroundType.UNKNOWN,
+        is_suitable=False,
+        detected_tags=detected_tags,
+        confidence=0.0,
+        reason=reason
+    )
+
+
 class BackgroundClassifier:
     """
     Classifier for identifying t-shirt-suitable image backgrounds.
@@ -201,16 +723,40 @@ class BackgroundClassifier:
         'greyscale_with_colored_background': BackgroundType.PATTERN,
     }
 
-    def __init__(self, wd14_tagger=None, skip_wd14_load=False):
+    # Single lookup table: tag -> (is_suitable, background_type, base_confidence)
+    _TAG_TABLE = {
+        **{tag: (True, bg_type, base_conf)
+           for tag, (bg_type, base_conf) in SUITABLE_TAGS.items()},
+        **{tag: (False, bg_type, 0.0) for tag, bg_type in UNSUITABLE_TAGS.items()},
+    }
+    _UNSUITABLE_SET = frozenset(UNSUITABLE_TAGS)
+
+    # Cache misses are sent to WD14 in groups of this size
+    BATCH_SIZE = 16
+
+    # Images per bulk cache lookup in classify_batch/find_suitable_images
+    CACHE_WINDOW = 512
+
+    def __init__(self, wd14_tagger=None, skip_wd14_load=False, use_mmap=False):
         """
         Initialize the background classifier.
 
         Args:
             wd14_tagger: Optional pre-loaded WD14Tagger instance
             skip_wd14_load: If True, don't load WD14 (for cache-only mode)
+            use_mmap: Have the loaded WD14Tagger decode images from
+                memory-mapped files
         """
         self.wd14_tagger = wd14_tagger
-        self.stats = {'cache_hits': 0, 'wd14_calls': 0, 'no_tags': 0}
+        self.use_mmap = use_mmap
+        self.stats = {'cache_hits': 0, 'wd14_calls': 0, 'no_tags': 0, 'transparent': 0}
+
+        # Vocabulary indices/names of tags containing 'background', plus
+        # per-tag arrays aligned with them (built lazily by _ensure_bg_vocab)
+        self._bg_tag_indices = None
+        self._bg_tag_names = ()
+        self._bg_base = None
+        self._bg_unsuitable = None
 
         if self.wd14_tagger is None and not skip_wd14_load:
             self._load_wd14()
@@ -219,7 +765,10 @@ class BackgroundClassifier:
         """Load WD14 tagger for background detection."""
         try:
             from wd14_tagger import WD14Tagger
-            self.wd14_tagger = WD14Tagger()
+            # Only a few dozen background tags at a 0.35 threshold are used,
+            # so int8 precision is enough when opted into
+            quantized = os.environ.get(QUANTIZED_ENV_VAR) == '1'
+            self.wd14_tagger = WD14Tagger(quantized=quantized, use_mmap=self.use_mmap)
             if self.wd14_tagger.loaded:
                 logger.info("WD14 tagger loaded for background classification")
             else:
@@ -228,6 +777,199 @@ class BackgroundClassifier:
             logger.error(f"Failed to import WD14Tagger: {e}")
             self.wd14_tagger = None
 
+    def _ensure_bg_vocab(self):
+        """
+        Find the 'background' tags in the WD14 vocabulary (once per tagger).
+
+        Alongside the indices, builds arrays aligned with them so fresh WD14
+        scores can be classified with numpy reductions: base confidence for
+        suitable tags (0 elsewhere) and a mask of unsuitable tags.
+        """
+        if self._bg_tag_indices is not None:
+            return
+        vocab = self.wd14_tagger.tag_names
+        indices = [i for i, tag in enumerate(vocab) if 'background' in tag.lower()]
+        self._bg_tag_indices = np.array(indices, dtype=np.intp)
+        self._bg_tag_names = tuple(vocab[i] for i in indices)
+
+        self._bg_base = np.zeros(len(indices), dtype=np.float64)
+        self._bg_unsuitable = np.zeros(len(indices), dtype=bool)
+        for j, tag in enumerate(self._bg_tag_names):
+            if tag in self.SUITABLE_TAGS:
+                self._bg_base[j] = self.SUITABLE_TAGS[tag][1]
+            elif tag in self._UNSUITABLE_SET:
+                self._bg_unsuitable[j] = True
+        logger.debug(f"{len(indices)} background tags in WD14 vocabulary")
+
+    def _background_tags_from_scores(self, scores,
+                                     threshold: float) -> Tuple[List[str], Dict[str, float]]:
+        """
+        Turn a background-tag score vector into (tags, scores) above threshold.
+
+        Tags are ordered by confidence descending, matching WD14Tagger.get_tags.
+        """
+        if scores is None:
+            return [], {}
+        hits = np.flatnonzero(scores >= threshold)
+        if not hits.size:
+            return [], {}
+        hits = hits[np.argsort(-scores[hits], kind='stable')]
+        background_tags = [self._bg_tag_names[j] for j in hits]
+        tag_scores = {self._bg_tag_names[j]: float(scores[j]) for j in hits}
+        return background_tags, tag_scores
+
+    def _classify_scores(self, image_path: str, scores, threshold: float,
+                         background_tags: List[str]) -> BackgroundClassification:
+        """
+        Decide suitability directly from a background-tag score vector.
+
+        Same rules as _classify_tags, evaluated by _score_background over the
+        arrays built by _ensure_bg_vocab instead of per-tag dict probes.
+        """
+        # Nothing crossed the threshold, so no rule can match
+        if scores is not None and background_tags:
+            decision, j, confidence = _score_background(
+                scores.astype(np.float64), self._bg_base, self._bg_unsuitable, threshold)
+
+            if decision == _SCORE_UNSUITABLE:
+                tag = self._bg_tag_names[j]
+                return BackgroundClassification(
+                    image_path=image_path,
+                    background_type=self.UNSUITABLE_TAGS[tag],
+                    is_suitable=False,
+                    detected_tags=background_tags,
+                    confidence=float(confidence),
+                    reason=f"Unsuitable background: {tag}"
+                )
+
+            if decision == _SCORE_SUITABLE:
+                tag = self._bg_tag_names[j]
+                return BackgroundClassification(
+                    image_path=image_path,
+                    background_type=self.SUITABLE_TAGS[tag][0],
+                    is_suitable=True,
+                    detected_tags=background_tags,
+                    confidence=float(confidence),
+                    reason=f"Suitable background: {tag}"
+                )
+
+        # No background tags detected - unknown
+        return _unknown_result(image_path, background_tags)
+
+    def _iter_uncached(self, image_paths: List[str], threshold: float,
+                       mtimes: Optional[Dict[str, float]] = None):
+        """
+        Run WD14 on images missing from the cache, BATCH_SIZE images per call.
+
+        Images whose alpha channel already shows a transparent background
+        skip WD14. Only images whose header allows alpha are decoded for that
+        check, in the background; the rest go straight to WD14. Results
+        stream out in input order while later batches are still being
+        decoded and inferred. mtimes optionally maps paths to
+        known modification times for the cache keys.
+
+        Yields:
+            (image_path, BackgroundClassification)
+        """
+        cache = get_cache()
+        # Header check only (a few bytes per file): images that can have alpha
+        # are decoded on a pool while WD14 starts on the rest
+        candidates = [p for p in image_paths if _fast_transparent_check(p)]
+        candidate_set = set(candidates)
+
+        use_wd14 = bool(self.wd14_tagger and self.wd14_tagger.loaded)
+        cache_scores = True
+        scored = None
+        opaque_scored = None
+        if use_wd14:
+            # int8 scores differ slightly from fp32 ones; keep them out of the
+            # shared cache, which fp32 runs read under the same keys
+            cache_scores = not self.wd14_tagger.quantized
+            self._ensure_bg_vocab()
+            scored = self.wd14_tagger.iter_scores(
+                [p for p in image_paths if p not in candidate_set],
+                tag_indices=self._bg_tag_indices, batch_size=self.BATCH_SIZE)
+
+        workers = max(1, min(len(candidates), os.cpu_count() or 4))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            probes = {p: pool.submit(_has_transparent_corners, p) for p in candidate_set}
+
+            for image_path in image_paths:
+                mtime = mtimes.get(image_path) if mtimes else None
+
+                if image_path in candidate_set and probes[image_path].result():
+                    self.stats['transparent'] += 1
+                    background_tags = ['transparent_background']
+                    tag_scores = {'transparent_background': 1.0}
+                    cache.set(image_path, background_tags, tag_scores, mtime=mtime)
+                    yield image_path, self._classify_tags(image_path, background_tags, tag_scores)
+
+                elif not use_wd14:
+                    self.stats['no_tags'] += 1
+                    yield image_path, self._classify_tags(image_path, [], {})
+
+                else:
+                    if image_path in candidate_set:
+                        # Opaque alpha images go through WD14 as a second stream
+                        if opaque_scored is None:
+                            opaque_scored = self.wd14_tagger.iter_scores(
+                                [p for p in candidates if not probes[p].result()],
+                                tag_indices=self._bg_tag_indices, batch_size=self.BATCH_SIZE)
+                        _, scores = next(opaque_scored)
+                    else:
+                        _, scores = next(scored)
+                    self.stats['wd14_calls'] += 1
+                    background_tags, tag_scores = self._background_tags_from_scores(scores, threshold)
+                    # Cache the result for next time
+                    if cache_scores:
+                        cache.set(image_path, background_tags, tag_scores, mtime=mtime)
+                    yield image_path, self._classify_scores(
+                        image_path, scores, threshold, background_tags)
+
+    def _classify_tags(self, image_path: str, background_tags: List[str],
+                       all_tag_scores: Dict[str, float]) -> BackgroundClassification:
+        """Decide suitability from an image's detected background tags."""
+        if not background_tags:
+            return _unknown_result(image_path, background_tags)
+
+        # Check for unsuitable tags first (they override suitable ones)
+        if not self._UNSUITABLE_SET.isdisjoint(background_tags):
+            tag = next(t for t in background_tags if t in self._UNSUITABLE_SET)
+            return BackgroundClassification(
+                image_path=image_path,
+                background_type=self.UNSUITABLE_TAGS[tag],
+                is_suitable=False,
+                detected_tags=background_tags,
+                confidence=all_tag_scores.get(tag, 0.5),
+                reason=f"Unsuitable background: {tag}"
+            )
+
+        # Check for suitable tags: one table probe per tag, best effective confidence wins
+        table = self._TAG_TABLE
+        candidates = [
+            (table[tag][2] * all_tag_scores.get(tag, 0.5), tag)
+            for tag in background_tags if tag in table
+        ]
+
+        if candidates:
+            best_confidence, best_suitable = max(candidates, key=lambda c: c[0])
+            if best_confidence > 0.0:
+                return BackgroundClassification(
+                    image_path=image_path,
+                    background_type=table[best_suitable][1],
+                    is_suitable=True,
+                    detected_tags=background_tags,
+                    confidence=best_confidence,
+                    reason=f"Suitable background: {best_suitable}"
+                )
+
+        # No background tags detected - unknown
+        return _unknown_result(image_path, background_tags)
+
+    def _missing_file_result(self, image_path: str) -> BackgroundClassification:
+        """Result for an image that no longer exists on disk."""
+        return _unknown_result(image_path, [], "File not found")
+
     def classify_image(self, image_path: str, threshold: float = 0.35,
                         use_cache: bool = True) -> BackgroundClassification:
         """
@@ -242,94 +984,60 @@ class BackgroundClassifier:
             BackgroundClassification with suitability determination
         """
         if not os.path.exists(image_path):
-            return BackgroundClassification(
-                image_path=image_path,
-                background_type=BackgroundType.UNKNOWN,
-                is_suitable=False,
-                detected_tags=[],
-                confidence=0.0,
-                reason="File not found"
-            )
-
-        background_tags = []
-        all_tag_scores = {}
-        used_cache = False
-        cache = get_cache()
+            return self._missing_file_result(image_path)
 
         # FAST PATH: Check persistent background tag cache first
         if use_cache:
-            cached = cache.get(image_path)
+            cached = get_cache().get(image_path)
             if cached:
-                used_cache = True
                 self.stats['cache_hits'] += 1
-                background_tags = cached['tags']
-                all_tag_scores = cached['scores']
+                return self._classify_tags(image_path, cached['tags'], cached['scores'])
 
         # SLOW PATH: Use WD14 if no cache found
-        if not used_cache:
-            if self.wd14_tagger and self.wd14_tagger.loaded:
-                self.stats['wd14_calls'] += 1
-                tag_results = self.wd14_tagger.get_tags(image_path, threshold=threshold)
-                all_tag_scores = {}
-
-                # Extract only background-related tags
-                for tag, conf in tag_results:
-                    if 'background' in tag.lower():
-                        background_tags.append(tag)
-                        all_tag_scores[tag] = float(conf)
-
-                # Cache the result for next time
-                cache.set(image_path, background_tags, all_tag_scores)
-            else:
-                self.stats['no_tags'] += 1
-
-        # Check for unsuitable tags first (they override suitable ones)
-        for tag in background_tags:
-            if tag in self.UNSUITABLE_TAGS:
-                return BackgroundClassification(
-                    image_path=image_path,
-                    background_type=self.UNSUITABLE_TAGS[tag],
-                    is_suitable=False,
-                    detected_tags=background_tags,
-                    confidence=all_tag_scores.get(tag, 0.5),
-                    reason=f"Unsuitable background: {tag}"
-                )
+        _, result = next(self._iter_uncached([image_path], threshold))
+        return result
 
-        # Check for suitable tags
-        best_suitable = None
-        best_confidence = 0.0
-        best_type = BackgroundType.UNKNOWN
+    def _iter_classifications(self, image_paths: List[str], threshold: float,
+                              mtimes: Optional[Dict[str, float]] = None):
+        """
+        Classify images in order, running WD14 once per BATCH_SIZE cache misses.
 
-        for tag in background_tags:
-            if tag in self.SUITABLE_TAGS:
-                bg_type, base_conf = self.SUITABLE_TAGS[tag]
-                tag_conf = all_tag_scores.get(tag, 0.5)
-                effective_conf = base_conf * tag_conf
+        The cache is probed with one query per CACHE_WINDOW images; misses in
+        the window are streamed through WD14, so results keep coming out
+        while later batches are decoded and inferred.
 
-                if effective_conf > best_confidence:
-                    best_confidence = effective_conf
-                    best_suitable = tag
-                    best_type = bg_type
+        When mtimes (path -> modification time, from a directory scan) is
+        given, those paths are known to exist and are not stat'ed again.
 
-        if best_suitable:
-            return BackgroundClassification(
-                image_path=image_path,
-                background_type=best_type,
-                is_suitable=True,
-                detected_tags=background_tags,
-                confidence=best_confidence,
-                reason=f"Suitable background: {best_suitable}"
-            )
+        Yields:
+            BackgroundClassification for each path, in input order
+        """
+        cache = get_cache()
 
-        # No background tags detected - unknown
-        return BackgroundClassification(
-            image_path=image_path,
-            background_type=BackgroundType.UNKNOWN,
-            is_suitable=False,
-            detected_tags=background_tags,
-            confidence=0.0,
-            reason="No background tags detected"
-        )
+        for start in range(0, len(image_paths), self.CACHE_WINDOW):
+            window = image_paths[start:start + self.CACHE_WINDOW]
+            existing = [p for p in dict.fromkeys(window)
+                        if (mtimes is not None and p in mtimes) or os.path.exists(p)]
+
+            found = {path: self._classify_tags(path, cached['tags'], cached['scores'])
+                     for path, cached in cache.get_many(existing, mtimes).items()}
+            cache_hits = set(found)
+            uncached = [p for p in existing if p not in cache_hits]
+            uncached_set = set(uncached)
+            inferred = self._iter_uncached(uncached, threshold, mtimes)
+
+            for image_path in window:
+                if image_path in uncached_set and image_path not in found:
+                    # Misses come out of the stream in window order
+                    path, result = next(inferred)
+                    found[path] = result
+
+                if image_path in found:
+                    if image_path in cache_hits:
+                        self.stats['cache_hits'] += 1
+                    yield found[image_path]
+                else:
+                    yield self._missing_file_result(image_path)
 
     def classify_batch(self, image_paths: List[str],
                        threshold: float = 0.35,
@@ -348,19 +1056,20 @@ class BackgroundClassifier:
         results = []
         total = len(image_paths)
 
-        for i, image_path in enumerate(image_paths):
-            result = self.classify_image(image_path, threshold)
+        for i, result in enumerate(self._iter_classifications(image_paths, threshold)):
             results.append(result)
 
             if progress_callback:
-                progress_callback(i + 1, total, os.path.basename(image_path))
+                progress_callback(i + 1, total, os.path.basename(result.image_path))
 
         return results
 
     def find_suitable_images(self, source_folders: List[str],
                              threshold: float = 0.35,
                              progress_callback=None,
-                             cancel_check=None) -> Tuple[List[str], List[BackgroundClassification]]:
+                             cancel_check=None,
+                             images: Optional[Dict[str, float]] = None
+                             ) -> Tuple[List[str], List[BackgroundClassification]]:
         """
         Find all images with suitable backgrounds in given folders.
 
@@ -369,24 +1078,18 @@ class BackgroundClassifier:
             threshold: WD14 confidence threshold
             progress_callback: Optional callback(current, total, filename, status)
             cancel_check: Optional callable that returns True if operation should cancel
+            images: Optional result of scan_image_folders(source_folders), when
+                the caller already walked the folders
 
         Returns:
             Tuple of (suitable_image_paths, all_classifications)
         """
-        # Gather all image files
-        image_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif'}
-        all_images = []
-
-        for folder in source_folders:
-            folder_path = Path(folder)
-            if not folder_path.exists():
-                logger.warning(f"Folder not found: {folder}")
-                continue
-
-            for file_path in folder_path.rglob('*'):
-                if file_path.suffix.lower() in image_extensions:
-                    all_images.append(str(file_path))
+        # Gather all image files, keeping each file's mtime for the cache key
+        if images is None:
+            images = scan_image_folders(source_folders, cancel_check)
+        mtimes = images
 
+        all_images = list(mtimes)
         logger.info(f"Found {len(all_images)} images to classify")
 
         # Classify all images
@@ -394,21 +1097,22 @@ class BackgroundClassifier:
         all_results = []
         total = len(all_images)
 
-        for i, image_path in enumerate(all_images):
+        # Cancellation is checked before each result is consumed, so at most
+        # one in-flight batch is wasted after the user cancels
+        for i, result in enumerate(self._iter_classifications(all_images, threshold, mtimes)):
             # Check for cancellation
             if cancel_check and cancel_check():
                 logger.info("Classification cancelled by user")
                 break
 
-            result = self.classify_image(image_path, threshold)
             all_results.append(result)
 
             if result.is_suitable:
-                suitable.append(image_path)
+                suitable.append(result.image_path)
 
             if progress_callback:
                 status = "suitable" if result.is_suitable else "not suitable"
-                progress_callback(i + 1, total, os.path.basename(image_path), status)
+                progress_callback(i + 1, total, os.path.basename(result.image_path), status)
 
         # Save cache to disk for next time
         get_cache().save()
@@ -461,39 +1165,61 @@ def copy_suitable_images(suitable_paths: List[str],
     total = len(suitable_paths)
     was_cancelled = False
 
-    for i, src_path in enumerate(suitable_paths):
-        # Check for cancellation
-        if cancel_check and cancel_check():
-            logger.info("Copy operation cancelled by user")
-            was_cancelled = True
-            break
-
-        try:
-            src = Path(src_path)
-            dst = output_path / src.name
-
-            # Handle duplicate filenames
-            if dst.exists():
-                stem = src.stem
-                suffix = src.suffix
-                counter = 1
-                while dst.exists():
-                    dst = output_path / f"{stem}_{counter}{suffix}"
-                    counter += 1
+    # Names already taken in the output folder (normcase: Windows is case-insensitive)
+    taken = {os.path.normcase(name) for name in os.listdir(output_path)}
+
+    def unique_destination(src_path: str) -> Path:
+        src = Path(src_path)
+        name = src.name
+        # Handle duplicate filenames
+        counter = 1
+        while os.path.normcase(name) in taken:
+            name = f"{src.stem}_{counter}{src.suffix}"
+            counter += 1
+        taken.add(os.path.normcase(name))
+        return output_path / name
+
+    # Names are assigned here in input order; only the copies run in workers.
+    # At most 2 * COPY_WORKERS copies are queued, so cancelling stops quickly.
+    sources = iter(suitable_paths)
+    in_flight = {}
+    done_count = 0
+
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+        while True:
+            while not was_cancelled and len(in_flight) < COPY_WORKERS * 2:
+                src_path = next(sources, None)
+                if src_path is None:
+                    break
+                # Check for cancellation
+                if cancel_check and cancel_check():
+                    logger.info("Copy operation cancelled by user")
+                    was_cancelled = True
+                    break
+                dst = unique_destination(src_path)
+                in_flight[pool.submit(fast_copy, src_path, str(dst))] = src_path
+
+            if not in_flight:
+                break
 
-            shutil.copy2(src, dst)
-            copied += 1
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                src_path = in_flight.pop(future)
+                try:
+                    future.result()
+                    copied += 1
 
-            # Track progress
-            if tracker:
-                tracker.mark_copied(src_path)
+                    # Track progress
+                    if tracker:
+                        tracker.mark_copied(src_path)
 
-        except Exception as e:
-            logger.error(f"Failed to copy {src_path}: {e}")
-            failed.append((src_path, str(e)))
+                except Exception as e:
+                    logger.error(f"Failed to copy {src_path}: {e}")
+                    failed.append((src_path, str(e)))
 
-        if progress_callback:
-            progress_callback(i + 1, total, os.path.basename(src_path))
+                done_count += 1
+                if progress_callback:
+                    progress_callback(done_count, total, os.path.basename(src_path))
 
     # Complete or leave for resume
     if tracker:
@@ -10,35 +10,65 @@ Version: 1.1 - Updated with modern styling
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
+import sys
+import queue
 import threading
+from collections import Counter
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from background_classifier import (
     BackgroundClassifier, BackgroundType, BackgroundClassification,
-    copy_suitable_images
+    copy_suitable_images, scan_image_folders
 )
 from ui_theme import Theme as ModernStyle
 
 
+@lru_cache(maxsize=256)
+def _shorten_path_cached(path, max_len):
+    """Shorten a path for display (memoized by path and length)."""
+    if len(path) <= max_len:
+        return path
+    parts = Path(path).parts
+    if len(parts) <= 2:
+        return "..." + path[-(max_len-3):]
+    return f"{parts[0]}\\...\\{parts[-1]}"
+
+
 class BackgroundSortDialog(tk.Toplevel):
     """Dialog for finding and copying t-shirt-suitable images."""
 
+    # Milliseconds between drains of the worker progress queue
+    PROGRESS_POLL_MS = 33
+
+    # Initial window size
+    WIDTH, HEIGHT = 1000, 850
+
     def __init__(self, parent, config_manager=None):
         super().__init__(parent)
+        # Stay hidden until centered by setup_modal (avoids a visible jump)
+        self.withdraw()
         self.parent = parent
         self.config_manager = config_manager
         self.classifier = None
         self.source_folders = []
+        self._folder_rows = {}  # folder path -> row frame in the folder list
+        self._empty_label = None
         self.suitable_images = []
         self.all_classifications = []
         self.is_scanning = False
         self.is_copying = False
         self.cancel_requested = False
 
+        # Worker threads post progress tuples and completion callables here;
+        # the Tk thread drains it every PROGRESS_POLL_MS while busy
+        self._progress_q = queue.Queue()
+
         # Window setup
         self.title("T-Shirt Ready Image Finder")
-        self.geometry("1000x850")
+        self.geometry(f"{self.WIDTH}x{self.HEIGHT}")
         self.minsize(900, 750)
         self.configure(bg=ModernStyle.BG_DARK)
 
@@ -218,6 +248,20 @@ class BackgroundSortDialog(tk.Toplevel):
         )
         gradient_cb.pack(anchor="w")
 
+        # Memory-mapped reads
+        self.use_mmap_var = tk.BooleanVar(value=sys.platform.startswith(('linux', 'win')))
+        mmap_cb = tk.Checkbutton(options_inner,
+            text="Use memory-mapped file reads",
+            variable=self.use_mmap_var,
+            font=ModernStyle.FONT_BODY,
+            fg=ModernStyle.TEXT_DIM,
+            bg=ModernStyle.BG_CARD,
+            activebackground=ModernStyle.BG_CARD,
+            activeforeground=ModernStyle.TEXT,
+            selectcolor=ModernStyle.BG_DARK
+        )
+        mmap_cb.pack(anchor="w")
+
         # Results card
         results_card = tk.Frame(left, bg=ModernStyle.BG_CARD,
             highlightthickness=1, highlightbackground=ModernStyle.BORDER)
@@ -260,6 +304,10 @@ class BackgroundSortDialog(tk.Toplevel):
         self.results_tree.column("count", width=70, anchor="center")
         self.results_tree.column("percent", width=70, anchor="center")
 
+        # Row colors are configured once; rows only reference the tag names
+        self.results_tree.tag_configure("suitable", foreground=ModernStyle.SUCCESS)
+        self.results_tree.tag_configure("unsuitable", foreground=ModernStyle.TEXT_DIM)
+
         scrollbar = ttk.Scrollbar(tree_frame, orient="vertical",
             command=self.results_tree.yview)
         self.results_tree.configure(yscrollcommand=scrollbar.set)
@@ -319,53 +367,76 @@ class BackgroundSortDialog(tk.Toplevel):
         self.threshold_label.config(text=f"{float(value):.2f}")
 
     def _refresh_folder_list(self):
-        """Refresh the folder list display."""
-        for widget in self.folder_list_frame.winfo_children():
-            widget.destroy()
+        """
+        Refresh the folder list display.
+
+        Rows are kept per folder in _folder_rows, so only added or removed
+        folders create or destroy widgets.
+        """
+        for folder in [f for f in self._folder_rows if f not in self.source_folders]:
+            self._folder_rows.pop(folder).destroy()
 
         if not self.source_folders:
-            tk.Label(self.folder_list_frame,
-                text="No folders selected",
-                font=ModernStyle.FONT_SMALL,
-                fg=ModernStyle.TEXT_MUTED,
-                bg=ModernStyle.BG_CARD
-            ).pack(anchor="w", pady=5)
+            if self._empty_label is None:
+                self._empty_label = tk.Label(self.folder_list_frame,
+                    text="No folders selected",
+                    font=ModernStyle.FONT_SMALL,
+                    fg=ModernStyle.TEXT_MUTED,
+                    bg=ModernStyle.BG_CARD
+                )
+            self._empty_label.pack(anchor="w", pady=5)
             return
 
+        if self._empty_label is not None:
+            self._empty_label.pack_forget()
+
         for folder in self.source_folders:
-            row = tk.Frame(self.folder_list_frame, bg=ModernStyle.BG_CARD)
-            row.pack(fill="x", pady=2)
+            if folder not in self._folder_rows:
+                self._folder_rows[folder] = self._create_folder_row(folder)
+
+        # New rows are packed at the end; re-pack only if the order differs
+        rows = [self._folder_rows[folder] for folder in self.source_folders]
+        if self.folder_list_frame.pack_slaves() != rows:
+            for row in rows:
+                row.pack_forget()
+            for row in rows:
+                row.pack(fill="x", pady=2)
+
+    def _create_folder_row(self, folder):
+        """Create (and pack) the list row for one source folder."""
+        bg = ModernStyle.BG_CARD
+        muted = ModernStyle.TEXT_MUTED
+        error = ModernStyle.ERROR
+
+        row = tk.Frame(self.folder_list_frame, bg=bg)
+        row.pack(fill="x", pady=2)
+
+        # Shortened path
+        display = self._shorten_path(folder, 50)
+        tk.Label(row,
+            text=f"📁 {display}",
+            font=ModernStyle.FONT_SMALL,
+            fg=ModernStyle.TEXT_DIM,
+            bg=bg
+        ).pack(side="left")
 
-            # Shortened path
-            display = self._shorten_path(folder, 50)
-            tk.Label(row,
-                text=f"📁 {display}",
-                font=ModernStyle.FONT_SMALL,
-                fg=ModernStyle.TEXT_DIM,
-                bg=ModernStyle.BG_CARD
-            ).pack(side="left")
-
-            # Remove button
-            remove_btn = tk.Label(row,
-                text="×",
-                font=("Segoe UI", 12),
-                fg=ModernStyle.TEXT_MUTED,
-                bg=ModernStyle.BG_CARD,
-                cursor="hand2"
-            )
-            remove_btn.pack(side="right")
-            remove_btn.bind("<Button-1>", lambda e, f=folder: self._remove_folder(f))
-            remove_btn.bind("<Enter>", lambda e, b=remove_btn: b.configure(fg=ModernStyle.ERROR))
-            remove_btn.bind("<Leave>", lambda e, b=remove_btn: b.configure(fg=ModernStyle.TEXT_MUTED))
+        # Remove button
+        remove_btn = tk.Label(row,
+            text="×",
+            font=("Segoe UI", 12),
+            fg=muted,
+            bg=bg,
+            cursor="hand2"
+        )
+        remove_btn.pack(side="right")
+        remove_btn.bind("<Button-1>", lambda e, f=folder: self._remove_folder(f))
+        remove_btn.bind("<Enter>", lambda e, b=remove_btn, c=error: b.configure(fg=c))
+        remove_btn.bind("<Leave>", lambda e, b=remove_btn, c=muted: b.configure(fg=c))
+        return row
 
     def _shorten_path(self, path, max_len=50):
         """Shorten a path for display."""
-        if len(path) <= max_len:
-            return path
-        parts = Path(path).parts
-        if len(parts) <= 2:
-            return "..." + path[-(max_len-3):]
-        return f"{parts[0]}\\...\\{parts[-1]}"
+        return _shorten_path_cached(path, max_len)
 
     def _add_folder(self):
         """Add a source folder."""
@@ -421,26 +492,29 @@ class BackgroundSortDialog(tk.Toplevel):
         self.copy_btn.config(state="disabled")
         self.cancel_btn.config(state="normal")
         self.progress_bar['value'] = 0
-        self.status_label.config(text="Initializing classifier...")
+        self.status_label.config(text="Initializing classifier and finding images...")
         self.update_idletasks()
 
+        # Tk variables are read here, on the Tk thread
+        use_mmap = self.use_mmap_var.get()
+
         def scan_thread():
             try:
-                # Load WD14 - results are cached to disk for fast subsequent runs
-                self.classifier = BackgroundClassifier()
+                # Walk the source folders while WD14 loads
+                with ThreadPoolExecutor(max_workers=1) as pool:
+                    images_future = pool.submit(self._enumerate_images, list(self.source_folders))
+
+                    # Load WD14 - results are cached to disk for fast subsequent runs
+                    self.classifier = BackgroundClassifier(use_mmap=use_mmap)
+                    images = images_future.result()
 
                 threshold = self.threshold_var.get()
 
                 def progress_callback(current, total, filename, status):
                     if self.cancel_requested:
                         return
-                    progress = current / total * 100
-                    stats = self.classifier.stats
-                    cache_pct = (stats['cache_hits'] / max(1, current)) * 100
-                    self.after(0, lambda: self._update_progress(
-                        progress, current, total, filename, status,
-                        f"Cache: {stats['cache_hits']}, WD14: {stats['wd14_calls']}"
-                    ))
+                    # Raw values only; stats are read and formatted on the Tk thread
+                    self._progress_q.put((self._update_progress, current, total, filename, status))
 
                 def cancel_check():
                     return self.cancel_requested
@@ -450,25 +524,71 @@ class BackgroundSortDialog(tk.Toplevel):
                         self.source_folders,
                         threshold=threshold,
                         progress_callback=progress_callback,
-                        cancel_check=cancel_check
+                        cancel_check=cancel_check,
+                        images=images
                     )
 
                 # Store stats for results display
                 self.scan_stats = self.classifier.stats
-                self.after(0, self._display_results)
+                self._progress_q.put(self._display_results)
 
             except Exception as e:
-                self.after(0, lambda: self._scan_error(str(e)))
+                self._progress_q.put(partial(self._scan_error, str(e)))
 
+        self._start_progress_polling()
         threading.Thread(target=scan_thread, daemon=True).start()
 
-    def _update_progress(self, progress, current, total, filename, status, stats_str=""):
+    def _enumerate_images(self, folders):
+        """
+        Find images under the source folders (path -> mtime).
+
+        Directories are listed concurrently by scan_image_folders, which
+        hides per-directory latency on network drives.
+        """
+        return scan_image_folders(folders, cancel_check=lambda: self.cancel_requested)
+
+    def _start_progress_polling(self):
+        """Start draining the progress queue (runs until the operation ends)."""
+        self.after(self.PROGRESS_POLL_MS, self._drain_progress_queue)
+
+    def _drain_progress_queue(self):
+        """
+        Apply queued worker updates on the Tk thread.
+
+        Progress items are (update_method, *args) tuples; only the newest is
+        shown. Callables (results, errors) run in the order they were posted,
+        after the progress that preceded them.
+        """
+        if not self.winfo_exists():
+            return  # dialog closed while a worker was running
+
+        latest = None
+        while True:
+            try:
+                item = self._progress_q.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, tuple):
+                latest = item
+                continue
+            if latest is not None:
+                latest[0](*latest[1:])
+                latest = None
+            item()
+
+        if latest is not None:
+            latest[0](*latest[1:])
+
+        if self.is_scanning or self.is_copying:
+            self.after(self.PROGRESS_POLL_MS, self._drain_progress_queue)
+
+    def _update_progress(self, current, total, filename, status):
         """Update progress display."""
-        self.progress_bar['value'] = progress
-        status_text = f"Scanning: {current}/{total} - {filename}"
-        if stats_str:
-            status_text += f" ({stats_str})"
-        self.status_label.config(text=status_text)
+        stats = self.classifier.stats
+        self.progress_bar['value'] = current / total * 100
+        self.status_label.config(
+            text=f"Scanning: {current}/{total} - {filename} "
+                 f"(Cache: {stats['cache_hits']}, WD14: {stats['wd14_calls']})")
 
     def _scan_error(self, message):
         """Handle scan error."""
@@ -508,38 +628,41 @@ class BackgroundSortDialog(tk.Toplevel):
         else:
             self.stats_label.config(text="No images found in selected folders.")
 
-        # Group by type
-        type_counts = {}
-        suitable_types = {}
+        # Group by type in one pass
+        type_counts = Counter()
+        suitable_types = Counter()
 
         for result in self.all_classifications:
             bg_type = result.background_type.value
-            type_counts[bg_type] = type_counts.get(bg_type, 0) + 1
+            type_counts[bg_type] += 1
             if result.is_suitable:
-                suitable_types[bg_type] = suitable_types.get(bg_type, 0) + 1
+                suitable_types[bg_type] += 1
 
-        # Display in tree
-        self.results_tree.delete(*self.results_tree.get_children())
-
-        for bg_type in sorted(suitable_types.keys()):
-            count = suitable_types[bg_type]
-            pct = count / total * 100 if total > 0 else 0
-            self.results_tree.insert("", "end",
-                values=(f"✓ {bg_type}", count, f"{pct:.1f}%"),
-                tags=("suitable",))
-
-        unsuitable = {k: v for k, v in type_counts.items() if k not in suitable_types}
-        for bg_type in sorted(unsuitable.keys()):
-            count = unsuitable[bg_type]
-            pct = count / total * 100 if total > 0 else 0
-            self.results_tree.insert("", "end",
-                values=(f"✗ {bg_type}", count, f"{pct:.1f}%"),
-                tags=("unsuitable",))
+        # Build all rows first, then replace the tree contents in one go
+        unsuitable = type_counts - suitable_types
+        rows = [(f"{mark} {bg_type}", counts[bg_type], tag)
+                for mark, counts, tag in (("✓", suitable_types, "suitable"),
+                                          ("✗", unsuitable, "unsuitable"))
+                for bg_type in sorted(counts)]
+        self._populate_results_tree(rows, total)
 
         # Enable copy if results
         if suitable_count > 0:
             self.copy_btn.config(state="normal")
 
+    def _populate_results_tree(self, rows, total):
+        """
+        Replace the results tree rows with (label, count, tag) tuples.
+
+        Done in a single callback with no other work in between, so Tk lays
+        out and redraws the tree once, at idle time.
+        """
+        tree = self.results_tree
+        tree.delete(*tree.get_children())
+        for label, count, tag in rows:
+            pct = count / total * 100 if total > 0 else 0
+            tree.insert("", "end", values=(label, count, f"{pct:.1f}%"), tags=(tag,))
+
     def _copy_images(self):
         """Copy suitable images."""
         if not self.suitable_images:
@@ -570,8 +693,7 @@ class BackgroundSortDialog(tk.Toplevel):
                 def progress_callback(current, total, filename):
                     if self.cancel_requested:
                         return
-                    progress = current / total * 100
-                    self.after(0, lambda: self._update_copy_progress(progress, current, total, filename))
+                    self._progress_q.put((self._update_copy_progress, current, total, filename))
 
                 def cancel_check():
                     return self.cancel_requested
@@ -583,16 +705,17 @@ class BackgroundSortDialog(tk.Toplevel):
                     cancel_check=cancel_check
                 )
 
-                self.after(0, lambda: self._display_copy_results(result))
+                self._progress_q.put(partial(self._display_copy_results, result))
 
             except Exception as e:
-                self.after(0, lambda: self._copy_error(str(e)))
+                self._progress_q.put(partial(self._copy_error, str(e)))
 
+        self._start_progress_polling()
         threading.Thread(target=copy_thread, daemon=True).start()
 
-    def _update_copy_progress(self, progress, current, total, filename):
+    def _update_copy_progress(self, current, total, filename):
         """Update copy progress."""
-        self.progress_bar['value'] = progress
+        self.progress_bar['value'] = current / total * 100
         self.status_label.config(text=f"Copying: {current}/{total} - {filename}")
 
     def _copy_error(self, message):
@@ -623,17 +746,22 @@ class BackgroundSortDialog(tk.Toplevel):
         messagebox.showinfo("Complete", msg, parent=self)
 
         if messagebox.askyesno("Open Folder", "Open the output folder?", parent=self):
-            os.startfile(output_folder)
+            # Explorer can take a moment to start; don't block the UI on it
+            threading.Thread(target=os.startfile, args=(output_folder,), daemon=True).start()
 
     def setup_modal(self):
         """Setup modal behavior."""
         self.transient(self.parent)
-        self.grab_set()
 
-        self.update_idletasks()
-        x = self.parent.winfo_x() + (self.parent.winfo_width() - self.winfo_width()) // 2
-        y = self.parent.winfo_y() + (self.parent.winfo_height() - self.winfo_height()) // 2
+        # Center on the parent before the first map, then show
+        x = self.parent.winfo_x() + (self.parent.winfo_width() - self.WIDTH) // 2
+        y = self.parent.winfo_y() + (self.parent.winfo_height() - self.HEIGHT) // 2
         self.geometry(f"+{x}+{y}")
+        self.deiconify()
+
+        # A grab needs a viewable window
+        self.wait_visibility()
+        self.grab_set()
 
 
 def show_background_sort_dialog(parent, config_manager=None):
@@ -7,21 +7,33 @@ Features:
 - Visual tag selection with click-to-toggle
 - Real-time result count updates
 - Preview matching images
-- Export with copy or symlink modes
+- Export with copy, hardlink or symlink modes
 - Progress tracking during export
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import threading
+import queue
 import os
 import logging
+from collections import OrderedDict
+from functools import partial
 from pathlib import Path
 from tag_database import TagDatabase
 from batch_exporter import BatchExporter
 
 logger = logging.getLogger(__name__)
 
+# Delay before a search runs, so a burst of keystrokes triggers one filter
+SEARCH_DEBOUNCE_MS = 150
+
+# Scroll distance (fraction of the list) between infinite-scroll checks
+SCROLL_CHECK_STEP = 0.05
+
+# Number of recent (OR, AND, NOT) query results kept for re-toggles
+RESULT_CACHE_SIZE = 32
+
 
 class BatchExportDialog(tk.Toplevel):
     """Dialog for querying tags and exporting image batches."""
@@ -43,11 +55,19 @@ class BatchExportDialog(tk.Toplevel):
         self.and_tags = set()     # Blue: Include with AND logic
         self.not_tags = set()     # Red: Exclude with NOT logic
         self.current_results = []
-        self.all_tags = []        # Store all tags for filtering
+        self._result_cache = OrderedDict()  # (OR, AND, NOT) frozensets -> images
+        self._query_cache = {}    # (separator, frozenset of tags) -> joined string
+        self._total_tags = 0      # Tags in the database (respecting show_hidden)
         self.tag_buttons = {}     # Store tag buttons for color updates
+        self._row_pool = []       # Reusable (frame, btn, fav_btn, hide_btn) rows
+        self._rows_shown = 0      # Pooled rows currently packed
+        self._row_height = None   # Packed height of one tag row, measured once
+        self._scrollregion_after_id = None  # Pending idle scroll region update
         self.show_hidden = False  # Toggle for showing hidden tags
         self.tags_displayed = 100  # Current number of tags displayed
         self.loading_more = False  # Flag to prevent multiple simultaneous loads
+        self._last_scroll_check = 0.0  # Scroll bottom at the last load check
+        self._filter_after_id = None  # Pending debounced search
 
         self.setup_ui()
         self.load_database()  # Load before modal behavior to allow event processing
@@ -60,6 +80,10 @@ class BatchExportDialog(tk.Toplevel):
         """Handle window close event."""
         # Unbind mousewheel to prevent memory leaks
         self.tag_canvas.unbind_all("<MouseWheel>")
+        if self._filter_after_id:
+            self.after_cancel(self._filter_after_id)
+        if self._scrollregion_after_id:
+            self.after_cancel(self._scrollregion_after_id)
         if self.tag_db:
             self.tag_db.close()
         self.destroy()
@@ -74,12 +98,16 @@ class BatchExportDialog(tk.Toplevel):
         self.tag_scrollbar.set(*args)
 
         # Check if we're near the bottom for infinite scroll
-        if len(args) == 2:
+        if len(args) == 2 and not self.loading_more:
             try:
                 top = float(args[0])
                 bottom = float(args[1])
+                # Only re-check after the view moved a step (or hit the end)
+                if abs(bottom - self._last_scroll_check) < SCROLL_CHECK_STEP and bottom < 1.0:
+                    return
+                self._last_scroll_check = bottom
                 # If we can see the bottom 20% (bottom value > 0.8), load more
-                if bottom > 0.8 and not self.loading_more:
+                if bottom > 0.8:
                     logger.debug(f"Scroll position: top={top}, bottom={bottom} - triggering load")
                     self.load_more_tags()
             except (ValueError, IndexError) as e:
@@ -140,7 +168,7 @@ class BatchExportDialog(tk.Toplevel):
         # Bind to KeyRelease event instead of trace (more reliable)
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=25)
         self.search_entry.pack(side="left", padx=5)
-        self.search_entry.bind('<KeyRelease>', lambda e: self.filter_tags())
+        self.search_entry.bind('<KeyRelease>', self._schedule_filter)
 
         # Clear search button
         ttk.Button(
@@ -170,6 +198,7 @@ class BatchExportDialog(tk.Toplevel):
         self.tag_canvas_window = self.tag_canvas.create_window(
             0, 0, window=self.tag_container, anchor="nw"
         )
+        self._empty_label = ttk.Label(self.tag_container)
 
         # RIGHT PANEL: Results and controls
         right_frame = ttk.Frame(paned, padding="10")
@@ -222,6 +251,12 @@ class BatchExportDialog(tk.Toplevel):
             variable=self.export_mode,
             value="copy"
         ).pack(side="left", padx=10)
+        ttk.Radiobutton(
+            mode_frame,
+            text="Hardlink (instant, same drive)",
+            variable=self.export_mode,
+            value="hardlink"
+        ).pack(side="left", padx=(0, 10))
         ttk.Radiobutton(
             mode_frame,
             text="Symlink (fast, for testing)",
@@ -275,13 +310,13 @@ class BatchExportDialog(tk.Toplevel):
         ttk.Button(
             button_frame,
             text="Close",
-            command=self.destroy
+            command=self.on_closing
         ).pack(side="right", padx=5)
 
         # Bind canvas scroll and scroll events
         self.tag_canvas.bind(
             "<Configure>",
-            lambda e: self.tag_canvas.configure(scrollregion=self.tag_canvas.bbox("all"))
+            lambda e: self._schedule_scrollregion()
         )
 
         # Bind mousewheel for scrolling
@@ -331,125 +366,159 @@ class BatchExportDialog(tk.Toplevel):
         """Populate tag buttons (initially showing top 100 by frequency)."""
         logger.info("populate_tags() called")
 
-        # Get all tags from database (tag, count, is_favorite, is_hidden)
-        self.all_tags = self.tag_db.list_tags(
-            favorites_first=True,
-            limit=None,
-            include_hidden=self.show_hidden
-        )
-        logger.info(f"Retrieved {len(self.all_tags)} tags from database")
+        # Tags stay in the database; only the count and the first page are read
+        self._total_tags = self.tag_db.count_tags(include_hidden=self.show_hidden)
+        logger.info(f"Database has {self._total_tags} tags")
 
         # Update title with actual tag count
         hidden_count = " (showing hidden)" if self.show_hidden else ""
-        self.left_title.config(text=f"Available Tags ({len(self.all_tags)} total){hidden_count}")
+        self.left_title.config(text=f"Available Tags ({self._total_tags} total){hidden_count}")
 
-        if not self.all_tags:
+        if not self._total_tags:
             # Show error message if no tags loaded
             logger.warning("No tags to display")
-            error_label = ttk.Label(
-                self.tag_container,
-                text="No tags found. Database may be empty.\nPlease rebuild the tag database.",
+            self._show_empty_message(
+                "No tags found. Database may be empty.\nPlease rebuild the tag database.",
                 foreground="red"
             )
-            error_label.pack(pady=20)
             return
 
         # Show only top tags initially (use search to find others)
-        self.tags_displayed = min(100, len(self.all_tags))
+        tags = self.tag_db.list_tags(favorites_first=True, limit=100, include_hidden=self.show_hidden)
+        self.tags_displayed = len(tags)
         logger.info(f"Displaying top {self.tags_displayed} tags initially")
-        self.display_filtered_tags(self.all_tags[:self.tags_displayed])
+        self.display_filtered_tags(tags)
         logger.info("Initial tag display complete")
 
-    def display_filtered_tags(self, tags_to_show):
-        """Display a filtered list of tags."""
-        # Save current selection states before clearing
-        current_or = self.or_tags.copy()
-        current_and = self.and_tags.copy()
-        current_not = self.not_tags.copy()
-
-        # Clear existing tags
-        for widget in self.tag_container.winfo_children():
-            widget.destroy()
+    def _tag_colors(self, tag, is_hidden):
+        """Return (bg, activebackground) for a tag button's selection state."""
+        if tag in self.or_tags:
+            return "#90EE90", "#70CE70"  # Light green: OR
+        if tag in self.and_tags:
+            return "#87CEEB", "#67AEDB"  # Light blue: AND
+        if tag in self.not_tags:
+            return "#FFB6C1", "#FF96B1"  # Light red: NOT
+        if is_hidden:
+            return "#D3D3D3", "#C0C0C0"  # Gray: hidden
+        return "white", "#F0F0F0"        # White: none
+
+    def _create_tag_row(self):
+        """Create an empty tag row (frame, tag button, favorite, hide) for the pool."""
+        frame = ttk.Frame(self.tag_container)
+
+        # Tag button
+        btn = tk.Button(frame, width=32, justify="left", anchor="w")
+        btn.pack(side="left", fill="x", expand=True)
+
+        # Hide toggle button (X)
+        hide_btn = tk.Button(frame, text="X", width=2, font=("Arial", 8, "bold"))
+        hide_btn.pack(side="right", padx=(2, 0))
+
+        # Favorite toggle button (*)
+        fav_btn = tk.Button(frame, text="*", width=2, font=("Arial", 10, "bold"))
+        fav_btn.pack(side="right", padx=(2, 0))
+
+        # Commands are bound once per pooled widget and read the row's current
+        # tag, so refilling a row doesn't register new Tcl callbacks
+        btn.config(command=partial(self._on_row_button, btn, self.toggle_tag))
+        hide_btn.config(command=partial(self._on_row_button, hide_btn, self.toggle_hidden))
+        fav_btn.config(command=partial(self._on_row_button, fav_btn, self.toggle_favorite))
+
+        row = (frame, btn, fav_btn, hide_btn)
+        self._row_pool.append(row)
+        return row
+
+    @staticmethod
+    def _on_row_button(button, handler):
+        """Dispatch a pooled row button click to handler(tag)."""
+        handler(button.tag_name)
+
+    def _show_tag_row(self, index, tag, count, is_favorite, is_hidden):
+        """Show a tag in pooled row `index`, creating the row on first use."""
+        if index < len(self._row_pool):
+            frame, btn, fav_btn, hide_btn = self._row_pool[index]
+        else:
+            frame, btn, fav_btn, hide_btn = self._create_tag_row()
+
+        fav_marker = "* " if is_favorite else ""
+        hidden_marker = "[HIDDEN] " if is_hidden else ""
+        bg, active_bg = self._tag_colors(tag, is_hidden)
+        btn.tag_name = fav_btn.tag_name = hide_btn.tag_name = tag
+        btn.config(
+            text=f"{fav_marker}{hidden_marker}{tag} ({count})",
+            bg=bg,
+            activebackground=active_bg
+        )
+        hide_btn.config(bg="#FFB6C1" if is_hidden else "white")  # Pink if hidden
+        fav_btn.config(bg="#FFD700" if is_favorite else "white")
+        # Already-packed rows keep their place; re-shown rows append in pool order
+        frame.pack(fill="x", pady=2)
+
+        # Store button references (btn, fav_btn, hide_btn, is_favorite, is_hidden)
+        self.tag_buttons[tag] = (btn, fav_btn, hide_btn, is_favorite, is_hidden)
+
+    def _show_empty_message(self, text, foreground="gray"):
+        """Hide all tag rows and show a message in the tag list instead."""
+        for frame, _, _, _ in self._row_pool[:self._rows_shown]:
+            frame.pack_forget()
+        self._rows_shown = 0
         self.tag_buttons.clear()
+        self._empty_label.config(text=text, foreground=foreground)
+        self._empty_label.pack(pady=20)
 
+    def display_filtered_tags(self, tags_to_show):
+        """Display a filtered list of tags, reusing pooled row widgets."""
         if not tags_to_show:
-            no_results = ttk.Label(
-                self.tag_container,
-                text="No tags match your search",
-                foreground="gray"
-            )
-            no_results.pack(pady=20)
+            self._show_empty_message("No tags match your search")
             return
 
-        # Create buttons for filtered tags
-        for tag, count, is_favorite, is_hidden in tags_to_show:
-            frame = ttk.Frame(self.tag_container)
-            frame.pack(fill="x", pady=2)
-
-            # Tag button
-            fav_marker = "* " if is_favorite else ""
-            hidden_marker = "[HIDDEN] " if is_hidden else ""
-            btn = tk.Button(
-                frame,
-                text=f"{fav_marker}{hidden_marker}{tag} ({count})",
-                command=lambda t=tag: self.toggle_tag(t),
-                width=32,
-                bg="#D3D3D3" if is_hidden else "white",  # Gray if hidden
-                justify="left",
-                anchor="w"
-            )
-            btn.pack(side="left", fill="x", expand=True)
-
-            # Hide toggle button (X)
-            hide_btn = tk.Button(
-                frame,
-                text="X",
-                command=lambda t=tag: self.toggle_hidden(t),
-                width=2,
-                bg="#FFB6C1" if is_hidden else "white",  # Pink if hidden
-                font=("Arial", 8, "bold")
-            )
-            hide_btn.pack(side="right", padx=(2, 0))
-
-            # Favorite toggle button (*)
-            fav_btn = tk.Button(
-                frame,
-                text="*",
-                command=lambda t=tag: self.toggle_favorite(t),
-                width=2,
-                bg="#FFD700" if is_favorite else "white",
-                font=("Arial", 10, "bold")
-            )
-            fav_btn.pack(side="right", padx=(2, 0))
-
-            # Store button references (btn, fav_btn, hide_btn, is_favorite, is_hidden)
-            self.tag_buttons[tag] = (btn, fav_btn, hide_btn, is_favorite, is_hidden)
-
-            # Restore selection state if this tag was selected
-            if tag in current_or:
-                self.or_tags.add(tag)
-            if tag in current_and:
-                self.and_tags.add(tag)
-            if tag in current_not:
-                self.not_tags.add(tag)
-
-            # Apply current color state to main button
-            if tag in self.or_tags:
-                btn.config(bg="#90EE90", activebackground="#70CE70")
-            elif tag in self.and_tags:
-                btn.config(bg="#87CEEB", activebackground="#67AEDB")
-            elif tag in self.not_tags:
-                btn.config(bg="#FFB6C1", activebackground="#FF96B1")
-
-        # Force canvas to update scroll region
-        self.tag_container.update_idletasks()
-        self.tag_canvas.configure(scrollregion=self.tag_canvas.bbox("all"))
+        self._empty_label.pack_forget()
+        self.tag_buttons.clear()
+        for index, row in enumerate(tags_to_show):
+            self._show_tag_row(index, *row)
+
+        # Hide pooled rows beyond the new list
+        for frame, _, _, _ in self._row_pool[len(tags_to_show):self._rows_shown]:
+            frame.pack_forget()
+        self._rows_shown = len(tags_to_show)
+
+        # Size the scroll region once Tk has laid out the rows
+        self._schedule_scrollregion()
+
+    def _schedule_scrollregion(self):
+        """Update the scroll region at idle time, once per burst of changes."""
+        if self._scrollregion_after_id is None:
+            self._scrollregion_after_id = self.after_idle(self._update_scrollregion)
+
+    def _update_scrollregion(self):
+        """Set the tag canvas scroll region from the row count, without a bbox scan."""
+        self._scrollregion_after_id = None
+        if self._row_height is None and self._rows_shown:
+            height = self._row_pool[0][0].winfo_reqheight()
+            if height > 1:  # 1 until the row has been laid out
+                self._row_height = height + 4  # pady=2 above and below
+        if self._row_height is None:
+            self.tag_canvas.configure(scrollregion=self.tag_canvas.bbox("all"))
+            return
+        self.tag_canvas.configure(scrollregion=(
+            0, 0, self.tag_container.winfo_reqwidth(), self._rows_shown * self._row_height))
+
+    def _schedule_filter(self, event=None):
+        """Debounce search keystrokes: filter once typing pauses."""
+        if self._filter_after_id:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(SEARCH_DEBOUNCE_MS, self._run_filter)
+
+    def _run_filter(self):
+        """Run the debounced search."""
+        self._filter_after_id = None
+        self.filter_tags()
 
     def filter_tags(self):
         """Filter tags based on search text."""
         try:
-            if not self.all_tags:
-                print("ERROR: filter_tags called but all_tags is empty")
+            if not self._total_tags:
+                print("ERROR: filter_tags called but the tag database is empty")
                 return
 
             # Read directly from Entry widget (more reliable than StringVar)
@@ -458,20 +527,22 @@ class BatchExportDialog(tk.Toplevel):
 
             if not search_text:
                 # Show current display limit when search is empty
-                self.display_filtered_tags(self.all_tags[:self.tags_displayed])
+                self.display_filtered_tags(self.tag_db.list_tags(
+                    favorites_first=True,
+                    limit=self.tags_displayed,
+                    include_hidden=self.show_hidden
+                ))
                 print(f"Empty search, showing {self.tags_displayed} tags")
                 return
 
-            # Filter tags that contain the search text (substring match)
-            filtered = [(tag, count, is_fav, is_hidden) for tag, count, is_fav, is_hidden in self.all_tags
-                       if search_text in tag.lower()]
+            # Substring match in SQLite (up to 200 results, favorites first)
+            filtered = self.tag_db.search_tags(search_text, 200, self.show_hidden)
 
             print(f"Found {len(filtered)} tags matching '{search_text}'")
             if len(filtered) > 0:
                 print(f"First 5 matches: {[tag for tag, _, _, _ in filtered[:5]]}")
 
-            # Show up to 200 search results
-            self.display_filtered_tags(filtered[:200])
+            self.display_filtered_tags(filtered)
 
         except Exception as e:
             print(f"ERROR in filter_tags: {e}")
@@ -501,13 +572,7 @@ class BatchExportDialog(tk.Toplevel):
             count_text = btn.cget("text").split("(")[1].strip(")")
             btn.config(text=f"{fav_marker}{hidden_marker}{tag} ({count_text})")
 
-            # Reload all_tags to reflect favorite change
-            self.all_tags = self.tag_db.list_tags(
-                favorites_first=True,
-                limit=None,
-                include_hidden=self.show_hidden
-            )
-
+            # Rows keep their place; the list is re-sorted on the next refresh
             logger.info(f"Tag '{tag}' {'favorited' if new_favorite_status else 'unfavorited'}")
 
     def toggle_hidden(self, tag):
@@ -536,10 +601,31 @@ class BatchExportDialog(tk.Toplevel):
 
             logger.info(f"Tag '{tag}' {'hidden' if new_hidden_status else 'unhidden'}")
 
-            # If we just hid a tag and aren't showing hidden tags, refresh the list
+            # If we just hid a tag and aren't showing hidden tags, drop its row
             if new_hidden_status and not self.show_hidden:
-                self.populate_tags()
-                self.filter_tags()
+                self._remove_tag_row(tag)
+
+    def _remove_tag_row(self, tag):
+        """Remove one tag's row from the list without re-querying or rebuilding."""
+        btn = self.tag_buttons.pop(tag)[0]
+        frame = btn.master
+        index = next(i for i, row in enumerate(self._row_pool) if row[0] is frame)
+        frame.pack_forget()
+
+        # Keep packed rows at the front of the pool
+        self._row_pool.append(self._row_pool.pop(index))
+        self._rows_shown -= 1
+
+        # The tag left the unfiltered listing too, so the next page starts one earlier
+        self._total_tags -= 1
+        if not self.search_entry.get().strip():
+            self.tags_displayed -= 1
+        hidden_count = " (showing hidden)" if self.show_hidden else ""
+        self.left_title.config(text=f"Available Tags ({self._total_tags} total){hidden_count}")
+
+        if not self._rows_shown:
+            self._show_empty_message("No tags match your search")
+        self._schedule_scrollregion()
 
     def toggle_show_hidden(self):
         """Toggle showing/hiding blocked tags."""
@@ -561,90 +647,50 @@ class BatchExportDialog(tk.Toplevel):
             return
 
         # Check if there are more tags to load
-        if self.tags_displayed >= len(self.all_tags):
+        if self.tags_displayed >= self._total_tags:
             logger.debug("All tags already displayed")
             return
 
         self.loading_more = True
-        logger.info(f"Loading more tags (current: {self.tags_displayed}/{len(self.all_tags)})")
+        logger.info(f"Loading more tags (current: {self.tags_displayed}/{self._total_tags})")
 
         # Save current scroll position
         scroll_pos = self.tag_canvas.yview()[0]
 
         # Update title to show loading
         hidden_count = " (showing hidden)" if self.show_hidden else ""
-        self.left_title.config(text=f"Available Tags ({len(self.all_tags)} total){hidden_count} - Loading...")
-
-        # Load 50 more tags
-        old_count = self.tags_displayed
-        self.tags_displayed = min(self.tags_displayed + 50, len(self.all_tags))
-
-        # Add new tags to display
-        new_tags = self.all_tags[old_count:self.tags_displayed]
+        self.left_title.config(text=f"Available Tags ({self._total_tags} total){hidden_count} - Loading...")
 
-        for tag, count, is_favorite, is_hidden in new_tags:
-            frame = ttk.Frame(self.tag_container)
-            frame.pack(fill="x", pady=2)
-
-            # Tag button
-            fav_marker = "* " if is_favorite else ""
-            hidden_marker = "[HIDDEN] " if is_hidden else ""
-            btn = tk.Button(
-                frame,
-                text=f"{fav_marker}{hidden_marker}{tag} ({count})",
-                command=lambda t=tag: self.toggle_tag(t),
-                width=32,
-                bg="#D3D3D3" if is_hidden else "white",
-                justify="left",
-                anchor="w"
-            )
-            btn.pack(side="left", fill="x", expand=True)
-
-            # Hide toggle button (X)
-            hide_btn = tk.Button(
-                frame,
-                text="X",
-                command=lambda t=tag: self.toggle_hidden(t),
-                width=2,
-                bg="#FFB6C1" if is_hidden else "white",
-                font=("Arial", 8, "bold")
-            )
-            hide_btn.pack(side="right", padx=(2, 0))
-
-            # Favorite toggle button (*)
-            fav_btn = tk.Button(
-                frame,
-                text="*",
-                command=lambda t=tag: self.toggle_favorite(t),
-                width=2,
-                bg="#FFD700" if is_favorite else "white",
-                font=("Arial", 10, "bold")
-            )
-            fav_btn.pack(side="right", padx=(2, 0))
-
-            # Store button references
-            self.tag_buttons[tag] = (btn, fav_btn, hide_btn, is_favorite, is_hidden)
-
-            # Apply current color state
-            if tag in self.or_tags:
-                btn.config(bg="#90EE90", activebackground="#70CE70")
-            elif tag in self.and_tags:
-                btn.config(bg="#87CEEB", activebackground="#67AEDB")
-            elif tag in self.not_tags:
-                btn.config(bg="#FFB6C1", activebackground="#FF96B1")
+        # Load the next 50 tags from the database
+        new_tags = self.tag_db.list_tags(
+            favorites_first=True,
+            limit=50,
+            offset=self.tags_displayed,
+            include_hidden=self.show_hidden
+        )
+        self.tags_displayed += len(new_tags)
+        # A favorite toggled since the last page can shift one tag across pages
+        new_tags = [row for row in new_tags if row[0] not in self.tag_buttons]
 
-        # Force canvas to update scroll region
-        self.tag_container.update_idletasks()
-        self.tag_canvas.configure(scrollregion=self.tag_canvas.bbox("all"))
+        for index, row in enumerate(new_tags, start=self._rows_shown):
+            self._show_tag_row(index, *row)
+        self._rows_shown += len(new_tags)
 
-        # Restore scroll position (prevent jumping)
-        self.tag_canvas.yview_moveto(scroll_pos)
+        # Size the scroll region once Tk has laid out the rows
+        self._schedule_scrollregion()
 
         # Update title to show current count
         hidden_count = " (showing hidden)" if self.show_hidden else ""
-        self.left_title.config(text=f"Available Tags ({len(self.all_tags)} total){hidden_count}")
+        self.left_title.config(text=f"Available Tags ({self._total_tags} total){hidden_count}")
 
         logger.info(f"Loaded {len(new_tags)} more tags (now showing {self.tags_displayed})")
+        # Restore the scroll position after the scroll region update, and stay
+        # busy until the scroll events from this batch's layout have run
+        self.after_idle(self._finish_loading_more, scroll_pos)
+
+    def _finish_loading_more(self, scroll_pos):
+        """Restore the scroll position (prevent jumping) and allow the next load."""
+        self.tag_canvas.yview_moveto(scroll_pos)
         self.loading_more = False
 
     def toggle_tag(self, tag):
@@ -661,24 +707,24 @@ class BatchExportDialog(tk.Toplevel):
         else:
             self.or_tags.add(tag)
 
-        # Update colors
-        self.update_tag_colors()
+        # Only this tag's state changed
+        self.update_tag_colors([tag])
         # Update results
         self.update_results()
 
-    def update_tag_colors(self):
-        """Update tag button colors based on selection state."""
-        for tag, (btn, fav_btn, hide_btn, is_fav, is_hidden) in self.tag_buttons.items():
-            if tag in self.or_tags:
-                btn.config(bg="#90EE90", activebackground="#70CE70")  # Light green: OR
-            elif tag in self.and_tags:
-                btn.config(bg="#87CEEB", activebackground="#67AEDB")  # Light blue: AND
-            elif tag in self.not_tags:
-                btn.config(bg="#FFB6C1", activebackground="#FF96B1")  # Light red: NOT
-            elif is_hidden:
-                btn.config(bg="#D3D3D3", activebackground="#C0C0C0")  # Gray: hidden
-            else:
-                btn.config(bg="white", activebackground="#F0F0F0")    # White: none
+    def update_tag_colors(self, tags=None):
+        """
+        Update tag button colors based on selection state.
+
+        Args:
+            tags: Tags whose state changed (default: every displayed tag)
+        """
+        for tag in (self.tag_buttons if tags is None else tags):
+            entry = self.tag_buttons.get(tag)
+            if entry is None:
+                continue  # Not currently displayed
+            bg, active_bg = self._tag_colors(tag, entry[4])
+            entry[0].config(bg=bg, activebackground=active_bg)
 
     def update_results(self):
         """Update query results and show preview."""
@@ -689,33 +735,16 @@ class BatchExportDialog(tk.Toplevel):
             return
 
         try:
-            # Combine OR and AND tags for include list
-            include_tags = list(self.or_tags) + list(self.and_tags)
-            exclude_tags = list(self.not_tags)
-
-            # Determine operator: if we have both OR and AND tags, we need to handle specially
-            if self.or_tags and self.and_tags:
-                # Get images with OR tags first
-                or_images = set(self.tag_db.query_images(list(self.or_tags), [], 'OR'))
-                # Get images with AND tags
-                and_images = set(self.tag_db.query_images(list(self.and_tags), [], 'AND'))
-                # Intersection (images must have OR match AND AND match)
-                images = list(or_images & and_images)
-            elif self.or_tags:
-                # Just OR query
-                images = self.tag_db.query_images(list(self.or_tags), [], 'OR')
-            elif self.and_tags:
-                # Just AND query
-                images = self.tag_db.query_images(list(self.and_tags), [], 'AND')
+            key = (frozenset(self.or_tags), frozenset(self.and_tags), frozenset(self.not_tags))
+            images = self._result_cache.get(key)
+            if images is None:
+                images = self.tag_db.query_bitmap(
+                    list(self.or_tags), list(self.and_tags), list(self.not_tags))
+                self._result_cache[key] = images
+                if len(self._result_cache) > RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
             else:
-                images = []
-
-            # Apply exclusions
-            if exclude_tags and images:
-                excluded_set = set()
-                for exclude_tag in exclude_tags:
-                    excluded_set.update(self.tag_db.get_images_for_tag(exclude_tag))
-                images = [img for img in images if img not in excluded_set]
+                self._result_cache.move_to_end(key)
 
             # Update results
             self.current_results = images
@@ -724,14 +753,12 @@ class BatchExportDialog(tk.Toplevel):
                 foreground="green"
             )
 
-            # Show preview (first 50)
-            self.results_listbox.delete(0, tk.END)
-            for img in images[:50]:
-                filename = Path(img).name
-                self.results_listbox.insert(tk.END, filename)
-
+            # Show preview (first 50) with a single insert call
+            names = [os.path.basename(img) for img in images[:50]]
             if len(images) > 50:
-                self.results_listbox.insert(tk.END, f"... and {len(images)-50:,} more images")
+                names.append(f"... and {len(images)-50:,} more images")
+            self.results_listbox.delete(0, tk.END)
+            self.results_listbox.insert(tk.END, *names)
 
         except Exception as e:
             logger.error(f"Error updating results: {e}")
@@ -744,10 +771,11 @@ class BatchExportDialog(tk.Toplevel):
 
     def clear_selection(self):
         """Clear all tag selections."""
+        selected = self.or_tags | self.and_tags | self.not_tags
         self.or_tags.clear()
         self.and_tags.clear()
         self.not_tags.clear()
-        self.update_tag_colors()
+        self.update_tag_colors(selected)
         self.update_results()
 
     def clear_search(self):
@@ -755,6 +783,14 @@ class BatchExportDialog(tk.Toplevel):
         self.search_entry.delete(0, tk.END)
         self.filter_tags()
 
+    def _join_sorted(self, tags, sep):
+        """Join tags in sorted order, memoized by tag set (keys are immutable copies)."""
+        key = (sep, frozenset(tags))
+        joined = self._query_cache.get(key)
+        if joined is None:
+            joined = self._query_cache[key] = sep.join(sorted(tags))
+        return joined
+
     def browse_output_dir(self):
         """Browse for output directory."""
         directory = filedialog.askdirectory(
@@ -797,11 +833,11 @@ class BatchExportDialog(tk.Toplevel):
         # Build query string for manifest
         query_parts = []
         if self.or_tags:
-            query_parts.append("|".join(sorted(self.or_tags)))
+            query_parts.append(self._join_sorted(self.or_tags, "|"))
         if self.and_tags:
-            query_parts.append(",".join(sorted(self.and_tags)))
+            query_parts.append(self._join_sorted(self.and_tags, ","))
         if self.not_tags:
-            query_parts.append("!" + ",!".join(sorted(self.not_tags)))
+            query_parts.append("!" + self._join_sorted(self.not_tags, ",!"))
         query_string = ",".join(query_parts)
 
         # Create new exporter with user-selected output directory
@@ -833,15 +869,10 @@ class BatchExportProgressDialog(tk.Toplevel):
         self.output_dir = output_dir
         self.mode = mode
 
-        # Thread communication
-        self.progress_state = {
-            'current': 0,
-            'total': len(images),
-            'message': 'Preparing...',
-            'complete': False,
-            'result': None
-        }
-        self.cancel_requested = False
+        # Thread communication: the worker posts (current, total, message)
+        # updates and finally ('DONE', result); the UI thread drains the queue
+        self.progress_queue = queue.Queue()
+        self.cancel_requested = threading.Event()
 
         self.title("Exporting Batch...")
         self.geometry("500x250")
@@ -910,24 +941,35 @@ class BatchExportProgressDialog(tk.Toplevel):
 
     def request_cancel(self):
         """Request cancellation of export."""
-        self.cancel_requested = True
+        self.cancel_requested.set()
         self.cancel_button.config(state='disabled')
         self.status_label.config(text="Cancelling...")
 
     def poll_progress(self):
-        """Poll progress state from main thread and update UI."""
+        """Drain worker updates on the main thread; redraw only if something arrived."""
         if not self.winfo_exists():
             return
 
-        # Update UI from progress state
-        state = self.progress_state
-        pct = int((state['current'] / state['total']) * 100) if state['total'] > 0 else 0
-        self.progress["value"] = pct
-        self.status_label.config(text=state['message'])
+        latest = None
+        done = None
+        while True:
+            try:
+                item = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == 'DONE':
+                done = item[1]
+            else:
+                latest = item  # Only the newest progress is shown
+
+        if latest is not None:
+            current, total, message = latest
+            self.progress["value"] = int((current / total) * 100) if total > 0 else 0
+            self.status_label.config(text=message)
 
         # Check if complete
-        if state['complete']:
-            self.show_result(state['result'])
+        if done is not None:
+            self.show_result(done)
             return
 
         # Continue polling every 100ms
@@ -936,16 +978,10 @@ class BatchExportProgressDialog(tk.Toplevel):
     def run_export(self):
         """Execute export with progress updates (runs in background thread)."""
         def progress_callback(current, total, message):
-            # Update shared state (thread-safe for simple assignments)
-            self.progress_state['current'] = current
-            self.progress_state['total'] = total
-            self.progress_state['message'] = message
+            self.progress_queue.put((current, total, message))
 
-            # Check for cancellation
-            if self.cancel_requested:
-                # Signal exporter to stop (if it supports it)
-                return False  # Return False to signal cancellation
-            return True
+            # Return False to signal cancellation (if the exporter supports it)
+            return not self.cancel_requested.is_set()
 
         try:
             result = self.exporter.export_images(
@@ -953,20 +989,19 @@ class BatchExportProgressDialog(tk.Toplevel):
                 self.batch_name,
                 query=self.query,
                 mode=self.mode,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                background_manifest=True
             )
 
             # Mark complete
-            self.progress_state['complete'] = True
-            self.progress_state['result'] = result
+            self.progress_queue.put(('DONE', result))
 
         except Exception as e:
             logger.error(f"Export failed: {e}")
-            self.progress_state['complete'] = True
-            self.progress_state['result'] = {
+            self.progress_queue.put(('DONE', {
                 'success': False,
                 'error': str(e)
-            }
+            }))
 
     def show_result(self, result):
         """Show export result."""
@@ -976,13 +1011,17 @@ class BatchExportProgressDialog(tk.Toplevel):
         if result['success']:
             self.progress["value"] = 100
             self.status_label.config(text="Export complete!")
+            self.summary = (
+                f"Batch: {Path(result['batch_path']).name}\n"
+                f"Copied: {result['copied']:,} images\n"
+                f"Size: {self.exporter.format_size(result['total_size'])}\n"
+                f"Time: {result['time_taken']:.1f}s"
+            )
             self.result_label.config(
-                text=f"Batch: {Path(result['batch_path']).name}\n"
-                     f"Copied: {result['copied']:,} images\n"
-                     f"Size: {self.exporter.format_size(result['total_size'])}\n"
-                     f"Time: {result['time_taken']:.1f}s",
+                text=f"{self.summary}\nManifest: generating in background...",
                 foreground="green"
             )
+            self.poll_manifest(result['manifest_path'])
 
             # Auto-close after 3 seconds
             self.after(3000, self.destroy)
@@ -991,6 +1030,16 @@ class BatchExportProgressDialog(tk.Toplevel):
             self.result_label.config(text=result.get('error', 'Unknown error'), foreground="red")
 
 
+    def poll_manifest(self, manifest_path):
+        """Swap the manifest note to 'ready' once the background write lands."""
+        if not self.winfo_exists():
+            return
+        if os.path.exists(manifest_path):
+            self.result_label.config(text=f"{self.summary}\nManifest: ready")
+        else:
+            self.after(200, self.poll_manifest, manifest_path)
+
+
 # Convenience function for integration into main app
 def show_batch_export_dialog(parent):
     """Show batch export dialog."""
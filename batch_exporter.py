@@ -2,7 +2,7 @@
 Batch Exporter - Copy or symlink matching images to batch folders with manifests.
 
 Features:
-  - Copy or symlink export modes
+  - Copy, hardlink or symlink export modes
   - Automatic batch folder creation with timestamps
   - Manifest generation (JSON with image metadata)
   - Statistics reporting
@@ -10,31 +10,59 @@ Features:
   - Disk space validation
 """
 
+import errno
 import json
 import logging
 import shutil
 import os
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Callable, Optional, Dict
+from typing import List, Callable, Optional, Dict, Tuple
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+from itertools import groupby
 
-from file_ops import copy_with_companions, get_companion_files
+from file_ops import check_disk_space, copy_with_companions, fast_copy, get_companion_files
+
+# Try to import orjson for faster manifest encoding (falls back to json)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
+# Parallel exports: threads release the GIL during file I/O syscalls
+EXPORT_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Minimum seconds between progress callbacks, whatever the batch size
+PROGRESS_INTERVAL = 0.05
+
+# On Windows, scandir() entries carry size and mtime from the directory
+# listing itself, so one scan per folder replaces a stat() per image. On
+# POSIX DirEntry.stat() is still a syscall each, so workers just stat.
+PREFETCH_STATS = os.name == 'nt'
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
 
 class BatchExporter:
     """Export images to batch folders with manifests and metadata."""
 
-    def __init__(self, output_dir: str = './batch_exports'):
+    def __init__(self, output_dir: str = './batch_exports', prefer_reflink: bool = True):
         """Initialize batch exporter.
 
         Args:
             output_dir: Directory to create batch folders in
+            prefer_reflink: Try copy-on-write clones first in copy mode (instant
+                on Btrfs/XFS/APFS); False skips the attempt, e.g. on ext4/NTFS
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.copy_function = fast_copy if prefer_reflink else partial(fast_copy, clone=False)
 
     def export_images(
         self,
@@ -42,7 +70,9 @@ class BatchExporter:
         batch_name: str,
         query: str = "",
         mode: str = 'copy',
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        pretty_manifest: bool = True,
+        background_manifest: bool = False
     ) -> Dict:
         """Export images to a batch folder.
 
@@ -50,8 +80,15 @@ class BatchExporter:
             image_paths: List of image file paths to export
             batch_name: Name for the batch (will be timestamped)
             query: Original query string (for manifest)
-            mode: 'copy' or 'symlink'
+            mode: 'copy', 'hardlink' (same filesystem only; falls back to
+                copying across devices) or 'symlink'
             progress_callback: Function to call with (current, total, message)
+            pretty_manifest: Indent manifest.json (False writes compact JSON,
+                faster and smaller for very large batches)
+            background_manifest: Write manifest.json from a separate thread
+                and return as soon as the files are exported. The manifest
+                appears at 'manifest_path' when done; callers that read it
+                right away should leave this False
 
         Returns:
             Dict with export results:
@@ -87,10 +124,25 @@ class BatchExporter:
             result['error'] = "No images to export"
             return result
 
-        if mode not in ['copy', 'symlink']:
+        if mode not in ['copy', 'hardlink', 'symlink']:
             result['error'] = f"Invalid mode: {mode}"
             return result
 
+        # Drop duplicates (they'd only produce useless name_1 copies) and
+        # export folder by folder, so reads stay within one directory at a time
+        image_paths = sorted(set(image_paths),
+                             key=lambda p: (os.path.dirname(p), os.path.basename(p)))
+        result['total_images'] = len(image_paths)
+
+        # Fail before copying anything rather than on ENOSPC halfway through
+        # (symlinks take next to no space, so only copies are checked)
+        if mode == 'copy':
+            ok, error_msg = check_disk_space(image_paths, str(self.output_dir))
+            if not ok:
+                logger.error(error_msg)
+                result['error'] = error_msg
+                return result
+
         try:
             # Create batch folder
             batch_path = self._create_batch_folder(batch_name)
@@ -99,71 +151,111 @@ class BatchExporter:
             if progress_callback:
                 progress_callback(0, len(image_paths), f"Creating batch folder: {batch_path.name}")
 
-            # Export images
-            for idx, image_path in enumerate(image_paths):
-                if progress_callback and idx % 10 == 0:
-                    pct = int((idx / len(image_paths)) * 100)
-                    progress_callback(
-                        idx,
-                        len(image_paths),
-                        f"Exporting images: {pct}%"
-                    )
-
-                try:
-                    src = Path(image_path)
-                    if not src.exists():
-                        logger.warning(f"Source not found: {image_path}")
-                        result['skipped'] += 1
-                        continue
-
-                    dst = batch_path / src.name
-
-                    # Handle duplicate filenames
-                    if dst.exists():
-                        dst = self._get_unique_path(dst)
-
-                    if mode == 'copy':
-                        # Use copy_with_companions to include .txt tag files etc.
-                        copy_with_companions(str(src), str(dst), handle_conflicts=False)
-                    else:  # symlink
-                        # Create relative symlink on Windows
+            # Names already taken in the batch folder (normcase: Windows is case-insensitive)
+            taken = {os.path.normcase(name) for name in os.listdir(batch_path)}
+
+            batch_dir = str(batch_path)
+            # Next counter to try per clashing name, so the k-th copy of
+            # image.png doesn't re-probe image_1 .. image_{k-1}
+            next_counter = {}
+
+            def unique_destination(src: str) -> str:
+                # Handle duplicate filenames (plain strings: no Path objects per image)
+                name = os.path.basename(src)
+                key = os.path.normcase(name)
+                if key in taken:
+                    stem, suffix = os.path.splitext(name)
+                    counter = next_counter.get(key, 1)
+                    while os.path.normcase(name) in taken:
+                        name = f"{stem}_{counter}{suffix}"
+                        counter += 1
+                    next_counter[key] = counter
+                taken.add(os.path.normcase(name))
+                return os.path.join(batch_dir, name)
+
+            # Names are assigned here in input order; only the file operations
+            # run in workers. At most 2 * EXPORT_WORKERS exports are queued.
+            sources = enumerate(image_paths)
+            in_flight = {}
+            done_count = 0
+            last_progress = time.monotonic()
+            # Manifest entries in input order, built from the workers' stat() results.
+            # They are written once the export ends rather than as workers
+            # finish: one slow file would otherwise hold back every later
+            # entry, and the manifest may be written on a background thread.
+            entries = [None] * len(image_paths)
+            stats = self._scan_stats(image_paths) if PREFETCH_STATS else {}
+
+            with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as pool:
+                while True:
+                    while len(in_flight) < EXPORT_WORKERS * 2:
+                        idx, image_path = next(sources, (None, None))
+                        if image_path is None:
+                            break
+                        future = pool.submit(self._export_one, image_path,
+                                             unique_destination(image_path), mode,
+                                             stats.get(image_path))
+                        in_flight[future] = (idx, image_path)
+
+                    if not in_flight:
+                        break
+
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        idx, image_path = in_flight.pop(future)
                         try:
-                            os.symlink(src, dst)
-                            # Also symlink companion files
-                            for companion in get_companion_files(str(src)):
-                                comp_ext = os.path.splitext(companion)[1]
-                                os.symlink(companion, str(dst) + comp_ext)
-                        except OSError:
-                            # Fallback: try absolute symlink
-                            try:
-                                os.symlink(src.absolute(), dst)
-                            except OSError as e:
-                                logger.warning(f"Symlink failed for {src}: {e}, copying instead")
-                                copy_with_companions(str(src), str(dst), handle_conflicts=False)
-
-                    if src.exists():
-                        result['total_size'] += src.stat().st_size
-                    result['copied'] += 1
-
-                except Exception as e:
-                    logger.error(f"Failed to export {image_path}: {e}")
-                    result['failed'] += 1
-                    result['errors'].append(f"{image_path}: {str(e)}")
-
-            if progress_callback:
-                progress_callback(
-                    len(image_paths),
-                    len(image_paths),
-                    "Generating manifest..."
-                )
+                            st = future.result()
+                            if st is None:
+                                logger.warning(f"Source not found: {image_path}")
+                                result['skipped'] += 1
+                            else:
+                                result['total_size'] += st.st_size
+                                result['copied'] += 1
+                                entries[idx] = {
+                                    'original_path': str(image_path),
+                                    'filename': os.path.basename(image_path),
+                                    'size': st.st_size,
+                                    'modified': datetime.fromtimestamp(st.st_mtime).isoformat()
+                                }
+                        except Exception as e:
+                            logger.error(f"Failed to export {image_path}: {e}")
+                            result['failed'] += 1
+                            result['errors'].append(f"{image_path}: {str(e)}")
+
+                        done_count += 1
+                        now = time.monotonic()
+                        if progress_callback and now - last_progress >= PROGRESS_INTERVAL:
+                            last_progress = now
+                            pct = int((done_count / len(image_paths)) * 100)
+                            progress_callback(
+                                done_count,
+                                len(image_paths),
+                                f"Exporting images: {pct}%"
+                            )
 
             # Generate manifest
-            manifest_path = self._generate_manifest(
+            generate = partial(
+                self._generate_manifest,
                 batch_path,
-                image_paths,
-                query
+                [entry for entry in entries if entry is not None],
+                query,
+                total_images=len(image_paths),
+                mode=mode,
+                pretty=pretty_manifest
             )
-            result['manifest_path'] = str(manifest_path)
+            if background_manifest:
+                # Not a daemon: exiting the app still waits for the manifest
+                threading.Thread(target=self._generate_manifest_logged,
+                                 args=(generate,), name='manifest-writer').start()
+                result['manifest_path'] = str(batch_path / 'manifest.json')
+            else:
+                if progress_callback:
+                    progress_callback(
+                        len(image_paths),
+                        len(image_paths),
+                        "Generating manifest..."
+                    )
+                result['manifest_path'] = str(generate())
 
             result['time_taken'] = time.time() - start_time
             result['success'] = result['copied'] > 0
@@ -188,6 +280,116 @@ class BatchExporter:
             result['time_taken'] = time.time() - start_time
             return result
 
+    @staticmethod
+    def _scan_stats(image_paths: List[str]) -> Dict[str, os.stat_result]:
+        """Collect stat() results with one scandir() per source folder.
+
+        Args:
+            image_paths: Paths sorted by folder
+
+        Returns:
+            Dict of path -> stat result; paths not found in their folder's
+            listing (e.g. different letter case) are left out
+        """
+        stats = {}
+        for folder, group in groupby(image_paths, key=os.path.dirname):
+            wanted = {os.path.basename(path): path for path in group}
+            try:
+                with os.scandir(folder or '.') as it:
+                    for entry in it:
+                        path = wanted.get(entry.name)
+                        if path is not None:
+                            stats[path] = entry.stat()
+            except OSError:
+                continue
+        return stats
+
+    def _export_one(
+        self,
+        src: str,
+        dst: str,
+        mode: str,
+        st: Optional[os.stat_result] = None
+    ) -> Optional[os.stat_result]:
+        """Copy or link one image and its companion files (runs in a worker thread).
+
+        Args:
+            st: stat() of src if already known (skips the syscall)
+
+        Returns:
+            stat() of the source image (for totals and the manifest), or None
+            if it doesn't exist
+        """
+        if st is None:
+            try:
+                st = os.stat(src)
+            except OSError:
+                return None
+
+        if mode == 'copy':
+            # Use copy_with_companions to include .txt tag files etc.;
+            # fast_copy keeps the bytes in the kernel (clone or
+            # copy_file_range) where the filesystem allows
+            copy_with_companions(src, dst, handle_conflicts=False,
+                                 copy_function=self.copy_function)
+        elif mode == 'hardlink':
+            # A second directory entry for the same inode: O(1), and unlike a
+            # symlink it survives the source folder being moved
+            try:
+                os.link(src, dst)
+                for companion, companion_dst in self._companion_targets(src, dst):
+                    os.link(companion, companion_dst)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Batch folder is on another drive: hardlinks can't cross devices
+                self._remove_partial_links(src, dst)
+                copy_with_companions(src, dst, handle_conflicts=False,
+                                     copy_function=self.copy_function)
+        else:  # symlink
+            try:
+                self._symlink_with_fallback(src, dst)
+                # Also symlink companion files
+                for companion, companion_dst in self._companion_targets(src, dst):
+                    self._symlink_with_fallback(companion, companion_dst)
+            except OSError as e:
+                logger.warning(f"Symlink failed for {src}: {e}, copying instead")
+                # Copying onto a link already made to src would truncate src
+                self._remove_partial_links(src, dst)
+                copy_with_companions(src, dst, handle_conflicts=False,
+                                     copy_function=self.copy_function)
+
+        return st
+
+    @staticmethod
+    def _companion_targets(src: str, dst: str) -> List[Tuple[str, str]]:
+        """Pair each companion of src with its path next to dst.
+
+        Companions are named image + extension (image.png.txt), so the
+        suffix is just what follows the image path; no splitext needed.
+        """
+        return [(companion, dst + companion[len(src):])
+                for companion in get_companion_files(src)]
+
+    @classmethod
+    def _remove_partial_links(cls, src: str, dst: str) -> None:
+        """Remove links made for src at dst (and its companions) before a copy."""
+        for path in [dst] + [target for _, target in cls._companion_targets(src, dst)]:
+            if os.path.lexists(path):
+                os.unlink(path)
+
+    @staticmethod
+    def _symlink_with_fallback(src: str, dst: str) -> None:
+        """Symlink dst -> src, retrying with an absolute target.
+
+        Raises:
+            OSError: if neither symlink can be created
+        """
+        try:
+            os.symlink(src, dst)
+        except OSError:
+            os.symlink(os.path.abspath(src), dst)
+
     def _create_batch_folder(self, batch_name: str) -> Path:
         """Create a timestamped batch folder.
 
@@ -204,64 +406,81 @@ class BatchExporter:
         logger.info(f"Created batch folder: {batch_path}")
         return batch_path
 
-    def _get_unique_path(self, path: Path) -> Path:
-        """Get unique path by adding suffix if file exists."""
-        if not path.exists():
-            return path
-
-        stem = path.stem
-        suffix = path.suffix
-        parent = path.parent
-        counter = 1
-
-        while True:
-            new_name = f"{stem}_{counter}{suffix}"
-            new_path = parent / new_name
-            if not new_path.exists():
-                return new_path
-            counter += 1
+    @staticmethod
+    def _generate_manifest_logged(generate: Callable[[], Path]) -> None:
+        """Run a manifest write off the export thread, logging failures."""
+        try:
+            generate()
+        except Exception as e:
+            logger.error(f"Failed to write manifest: {e}")
 
     def _generate_manifest(
         self,
         batch_path: Path,
-        image_paths: List[str],
-        query: str = ""
+        entries: List[Dict],
+        query: str = "",
+        total_images: Optional[int] = None,
+        mode: str = 'copy',
+        pretty: bool = True
     ) -> Path:
         """Generate manifest JSON for batch.
 
+        Args:
+            batch_path: Batch folder
+            entries: Image entries built during export (no files are re-read)
+            query: Original query string
+            total_images: Number of images requested (default: len(entries))
+            mode: Export mode, recorded so readers know whether files are
+                independent copies, shared inodes (hardlink) or links
+            pretty: Indent with 2 spaces (False writes compact JSON, no spaces)
+
         Returns:
             Path to manifest file
         """
-        manifest = {
+        manifest_path = batch_path / 'manifest.json'
+        total_images = len(entries) if total_images is None else total_images
+
+        header = {
             'batch_name': batch_path.name,
             'created': datetime.now().isoformat(),
             'query': query,
-            'total_images': len(image_paths),
-            'manifest': {
-                'images': []
-            }
+            'total_images': total_images,
+            'mode': mode,
         }
 
-        # Add image entries
-        for img_path in image_paths:
-            src = Path(img_path)
-            if src.exists():
-                manifest['manifest']['images'].append({
-                    'original_path': str(img_path),
-                    'filename': src.name,
-                    'size': src.stat().st_size,
-                    'modified': datetime.fromtimestamp(
-                        src.stat().st_mtime
-                    ).isoformat()
-                })
-
-        manifest_path = batch_path / 'manifest.json'
-        with open(manifest_path, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2)
+        # Stream the document: header, then one encoded entry at a time, so
+        # the whole manifest never exists as one string in memory
+        if pretty:
+            head = self._encode_json(header, True)[:-2] + b',\n  "manifest": {\n    "images": ['
+            sep, indent, tail = b',', b'\n      ', b'\n    ]\n  }\n}'
+        else:
+            head = self._encode_json(header, False)[:-1] + b',"manifest":{"images":['
+            sep, indent, tail = b',', None, b']}}'
+
+        # Write then rename, so manifest.json only ever appears complete
+        tmp_path = batch_path / 'manifest.json.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(head)
+            for i, entry in enumerate(entries):
+                data = self._encode_json(entry, pretty)
+                if indent is not None:
+                    data = indent + data.replace(b'\n', indent)
+                f.write(sep + data if i else data)
+            f.write(tail if entries or not pretty else b']\n  }\n}')
+        os.replace(tmp_path, manifest_path)
 
         logger.info(f"Created manifest: {manifest_path}")
         return manifest_path
 
+    @staticmethod
+    def _encode_json(obj, pretty: bool) -> bytes:
+        """Encode one JSON value (orjson if available), 2-space indented if pretty."""
+        if HAS_ORJSON:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        if pretty:
+            return json.dumps(obj, indent=2).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
     def report_statistics(self, batch_path: str) -> Optional[Dict]:
         """Generate statistics report for a batch.
 
@@ -314,11 +533,11 @@ class BatchExporter:
 
     def format_size(self, size_bytes: int) -> str:
         """Format bytes as human-readable size."""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.1f} PB"
+        if size_bytes < 1024:
+            return f"{size_bytes} B"
+        # Each unit is 2**10 of the previous one: pick it from the bit length
+        idx = min(len(_SIZE_UNITS) - 1, (int(size_bytes).bit_length() - 1) // 10)
+        return f"{size_bytes / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
 
     def print_report(self, batch_path: str) -> None:
         """Print a formatted statistics report."""
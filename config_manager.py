@@ -19,15 +19,97 @@ Version: 2.1 (Added all_combinations mode and re-sort functionality)
 """
 
 import os
+import re
 import json
-import shutil
-import glob
 import copy
+import heapq
 import threading
-from datetime import datetime
-from configparser import ConfigParser
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
 import logging
 
+# Try to import orjson for faster config reads/writes (falls back to json)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Allowed values checked by validate_term_config (built once, not per call)
+_VALID_MATCH_TYPES = ('word_boundary', 'contains', 'exact', 'regex')
+_VALID_SEARCH_SCOPES = ('prompt_only', 'tags_only', 'either', 'both')
+_REQUIRED_TERM_FIELDS = ('term', 'enabled', 'priority')
+
+# Fields added to auto-sort terms after 2.0, filled in when missing
+_TERM_DEFAULTS = {
+    'search_scope': 'either',
+    'include_negative_prompt': False,
+    'allow_multi_copy': True,
+    'exclusion_terms': [],
+    'combination_priority': 0,
+}
+_TERM_DEFAULT_KEYS = frozenset(_TERM_DEFAULTS)
+
+# Default home of output folders (this file's directory)
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Characters not allowed in Windows folder names
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+@lru_cache(maxsize=1024)
+def _sanitize_folder_name(name):
+    """Sanitize a folder name (memoized: the same names recur constantly)."""
+    # Remove invalid characters and replace with underscores
+    sanitized = _SANITIZE_RE.sub('_', name)
+    # Remove leading/trailing spaces and dots
+    sanitized = sanitized.strip('. ')
+    # Ensure not empty
+    if not sanitized:
+        sanitized = 'unnamed'
+    return sanitized
+
+
+@lru_cache(maxsize=256)
+def _organized_dir(source_folder):
+    """Organized "sorted_<source name>" folder in the script directory."""
+    source_name = _sanitize_folder_name(os.path.basename(source_folder))
+    return os.path.join(_SCRIPT_DIR, f"sorted_{source_name}")
+
+
+def _deep_merge(base, override):
+    """Recursively update base with override; nested dicts are merged, not replaced."""
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(base.get(key), dict):
+            _deep_merge(base[key], value)
+        else:
+            base[key] = value
+    return base
+
+
+def _load_json(path):
+    """Read a UTF-8 JSON file (orjson when available).
+
+    Raises:
+        json.JSONDecodeError: if the file isn't valid JSON (orjson's error
+            is a subclass)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_json(obj):
+    """Encode obj as 2-space indented UTF-8 JSON (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
 class ConfigManager:
     """
     Enhanced configuration manager for the Image Grid Sorter application.
@@ -53,6 +135,10 @@ class ConfigManager:
         # Use RLock to allow nested locking (same thread can acquire multiple times)
         self._lock = threading.RLock()
 
+        # Inside batch(), save_config() only marks the config dirty
+        self._batch_depth = 0
+        self._save_pending = False
+
         self.default_config = {
             'config_version': self.CURRENT_VERSION,
             'source_folders': [],
@@ -119,6 +205,14 @@ class ConfigManager:
         
         self.config = self.load_config()
         self.sorted_folders = {}
+        # Directories already created this session (skip repeat makedirs calls)
+        self._ensured_dirs = set()
+        # Resolved term folder paths, cleared with the index / folder setup
+        self._term_folder_paths = {}
+        # auto_sort_terms indexed by term name (see _terms_by_name)
+        self._term_index = {}
+        self._term_index_list = None
+        self._term_index_len = 0
         self.setup_folders()
     
     def load_config(self):
@@ -126,17 +220,17 @@ class ConfigManager:
         # First try to load the new JSON config
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    loaded_config = json.load(f)
+                # Binary: the file is UTF-8 whatever the platform's locale is
+                loaded_config = _load_json(self.config_file)
                 
                 # Check version and migrate if needed
                 config_version = loaded_config.get('config_version', '1.0')
                 if config_version != self.CURRENT_VERSION:
                     loaded_config = self.migrate_config(loaded_config, config_version)
                 
-                # Merge with defaults to ensure all keys exist
-                config = self.default_config.copy()
-                config.update(loaded_config)
+                # Merge with defaults to ensure all keys exist, including
+                # keys added to nested sections (e.g. auto_sort_settings)
+                config = _deep_merge(copy.deepcopy(self.default_config), loaded_config)
                 
                 # Migrate existing terms to include new search scope fields
                 self._migrate_term_configs(config)
@@ -151,11 +245,14 @@ class ConfigManager:
             return self.load_legacy_config()
         
         # Return default config
-        return self.default_config.copy()
+        return copy.deepcopy(self.default_config)
     
     def load_legacy_config(self):
         """Load legacy INI configuration and convert to new format."""
-        config = self.default_config.copy()
+        # Only needed for a one-time migration, so not imported at startup
+        from configparser import ConfigParser
+        
+        config = copy.deepcopy(self.default_config)
         
         try:
             legacy_config = ConfigParser()
@@ -213,34 +310,28 @@ class ConfigManager:
         
         migrated = False
         for term_config in config['auto_sort_terms']:
-            # Add search scope defaults
-            if 'search_scope' not in term_config:
-                term_config['search_scope'] = 'either'
-                migrated = True
-            
-            if 'include_negative_prompt' not in term_config:
-                term_config['include_negative_prompt'] = False
-                migrated = True
-            
-            # Add other new fields with defaults if missing
-            if 'allow_multi_copy' not in term_config:
-                term_config['allow_multi_copy'] = True
-                migrated = True
-            
-            if 'exclusion_terms' not in term_config:
-                term_config['exclusion_terms'] = []
-                migrated = True
-            
-            if 'combination_priority' not in term_config:
-                term_config['combination_priority'] = 0
-                migrated = True
+            # Up-to-date terms cost one subset check
+            if _TERM_DEFAULT_KEYS <= term_config.keys():
+                continue
+            for key, default in _TERM_DEFAULTS.items():
+                if key not in term_config:
+                    term_config[key] = copy.copy(default)
+            migrated = True
         
         if migrated:
             self.logger.info("Migrated existing terms to include new search scope fields")
     
     def save_config(self):
-        """Save configuration with automatic backup (thread-safe)."""
+        """Save configuration with automatic backup (thread-safe).
+
+        Inside a batch() block the save is deferred to the end of the block.
+        """
         with self._lock:
+            if self._batch_depth:
+                self._save_pending = True
+                return
+            # Term dicts may have been edited in place before this save
+            self._invalidate_terms()
             try:
                 # Create backup if config exists
                 if os.path.exists(self.config_file):
@@ -248,133 +339,185 @@ class ConfigManager:
 
                 # Add version and timestamp
                 self.config['config_version'] = self.CURRENT_VERSION
-                self.config['last_saved'] = datetime.now().isoformat()
+                self.config['last_saved'] = time.strftime('%Y-%m-%dT%H:%M:%S')
 
                 # Save configuration
-                with open(self.config_file, 'w') as f:
-                    json.dump(self.config, f, indent=2)
+                with open(self.config_file, 'wb') as f:
+                    f.write(_dump_json(self.config))
 
             except Exception as e:
                 self.logger.error(f"Error saving config: {e}")
                 raise
     
+    @contextmanager
+    def batch(self):
+        """Group several changes into a single save (and backup).
+
+        Usage:
+            with config_manager.batch():
+                config_manager.update_basic_settings(...)
+                config_manager.update_auto_sort_settings(...)
+
+        Blocks may nest; the save happens when the outermost one exits, and
+        only if something inside asked for it.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._save_pending:
+                    self._save_pending = False
+                    self.save_config()
+    
     def backup_config(self):
         """Create a backup of the current configuration."""
+        import shutil
+        
         try:
             backup_dir = os.path.join(os.path.dirname(self.config_file), 'backups')
             os.makedirs(backup_dir, exist_ok=True)
             
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = time.strftime('%Y%m%d_%H%M%S')
             backup_file = os.path.join(backup_dir, f'config_backup_{timestamp}.json')
             
             shutil.copy2(self.config_file, backup_file)
             
-            # Clean old backups (keep last 10)
-            backup_files = sorted(glob.glob(os.path.join(backup_dir, 'config_backup_*.json')))
-            if len(backup_files) > 10:
-                for old_backup in backup_files[:-10]:
-                    os.remove(old_backup)
+            # Clean old backups (keep last 10). Timestamped names sort
+            # chronologically; scandir lists them without stat() calls
+            with os.scandir(backup_dir) as it:
+                backup_files = [
+                    entry for entry in it
+                    if entry.name.startswith('config_backup_') and entry.name.endswith('.json')
+                ]
+            excess = len(backup_files) - 10
+            if excess > 0:
+                # Only the oldest `excess` are needed, not a full sort
+                for old_backup in heapq.nsmallest(excess, backup_files, key=lambda entry: entry.name):
+                    os.remove(old_backup.path)
                     
         except Exception as e:
             self.logger.error(f"Error creating config backup: {e}")
     
     def setup_folders(self):
         """Create output folders including auto-sort destinations."""
-        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # Re-check every folder: some may have been deleted since the last setup
+        self._ensured_dirs = set()
         
         # Get active source folders and destination preference
         active_sources = self.get_active_source_folders()
         dest_location = self.config.get('destination_location', 'script_dir')
+        output_folders = self.config['output_folders']
         
+        # Pick the base directories that get a full set of output folders;
+        # the primary source's base provides self.sorted_folders
         if active_sources and dest_location == 'script_dir':
-            # Create organized folders in script directory for each active source
-            self.sorted_folders = {}
-            for source_folder in active_sources:
-                source_name = self.sanitize_folder_name(os.path.basename(source_folder))
-                source_dest_dir = os.path.join(script_dir, f"sorted_{source_name}")
-                
-                # Create organized folders for this source
-                source_folders = {
-                    k: os.path.join(source_dest_dir, v) 
-                    for k, v in self.config['output_folders'].items()
-                }
-                
-                # Store with source-specific keys for the primary source
-                if source_folder == active_sources[0]:
-                    self.sorted_folders.update(source_folders)
-                
-                # Create folders
-                for folder in source_folders.values():
-                    os.makedirs(folder, exist_ok=True)
+            bases = [_organized_dir(source) for source in active_sources]
+            primary_base = bases[0]
         elif active_sources and dest_location == 'source_dirs':
-            # Create folders directly in source directories
-            primary_source = active_sources[0]
-            self.sorted_folders = {
-                k: os.path.join(primary_source, v) 
-                for k, v in self.config['output_folders'].items()
-            }
-            
-            # Create folders in all active sources
-            for source_folder in active_sources:
-                for folder_name in self.config['output_folders'].values():
-                    folder_path = os.path.join(source_folder, folder_name)
-                    os.makedirs(folder_path, exist_ok=True)
+            # Folders directly in source directories
+            bases = list(active_sources)
+            primary_base = bases[0]
         elif active_sources and dest_location == 'both':
-            # Primary uses script directory organized structure
-            primary_source = active_sources[0]
-            source_name = self.sanitize_folder_name(os.path.basename(primary_source))
-            source_dest_dir = os.path.join(script_dir, f"sorted_{source_name}")
-            
-            self.sorted_folders = {
-                k: os.path.join(source_dest_dir, v) 
-                for k, v in self.config['output_folders'].items()
-            }
-            
-            # Create both organized and in-source folders
-            for source_folder in active_sources:
-                # Organized folders in script directory
-                source_name = self.sanitize_folder_name(os.path.basename(source_folder))
-                source_dest_dir = os.path.join(script_dir, f"sorted_{source_name}")
-                for folder_name in self.config['output_folders'].values():
-                    folder_path = os.path.join(source_dest_dir, folder_name)
-                    os.makedirs(folder_path, exist_ok=True)
-                
-                # Direct folders in source directory
-                for folder_name in self.config['output_folders'].values():
-                    folder_path = os.path.join(source_folder, folder_name)
-                    os.makedirs(folder_path, exist_ok=True)
+            # Primary uses script directory organized structure; every source
+            # also gets folders of its own
+            bases = [_organized_dir(source) for source in active_sources] + list(active_sources)
+            primary_base = bases[0]
         else:
             # Fallback to standard behavior if no sources configured
-            self.sorted_folders = {
-                k: os.path.join(script_dir, v) 
-                for k, v in self.config['output_folders'].items()
-            }
-            
-            # Create standard folders
-            for folder in self.sorted_folders.values():
-                os.makedirs(folder, exist_ok=True)
+            bases = [_SCRIPT_DIR]
+            primary_base = _SCRIPT_DIR
         
-        # Create auto-sort subfolders
-        if self.config['auto_sort_settings'].get('create_subfolders', True):
-            self.setup_auto_sort_folders()
+        self.sorted_folders = {
+            k: os.path.join(primary_base, v)
+            for k, v in output_folders.items()
+        }
+        self._term_folder_paths = {}
+        
+        # One makedirs per distinct folder (sources may share a name/base)
+        targets = {
+            os.path.join(base, folder_name)
+            for base in bases
+            for folder_name in output_folders.values()
+        }
+        self._ensure_dirs(targets)
+        
+        # Auto-sort term folders are created on first use (get_term_folder_path)
+    
+    def _ensure_dir(self, path):
+        """Create a directory once per session; later calls are a set lookup."""
+        ensured = self._ensured_dirs
+        if path not in ensured:
+            os.makedirs(path, exist_ok=True)
+            # makedirs created every missing parent too
+            while path not in ensured:
+                ensured.add(path)
+                parent = os.path.dirname(path)
+                if parent == path:
+                    break
+                path = parent
+        return path
+    
+    def _ensure_dirs(self, paths):
+        """Create a set of directories, deepest first so parents come for free."""
+        for path in sorted(paths, key=len, reverse=True):
+            self._ensure_dir(path)
     
     def setup_auto_sort_folders(self):
-        """Create folders for auto-sort terms."""
+        """Create folders for all auto-sort terms now (normally created on first use)."""
         auto_sort_base = self.sorted_folders.get('auto_sorted')
         if not auto_sort_base:
             return
         
+        targets = set()
         for term_config in self.config['auto_sort_terms']:
             if term_config.get('enabled', True):
                 folder_name = term_config.get('folder_name', term_config['term'])
                 folder_name = self.sanitize_folder_name(folder_name)
-                term_folder = os.path.join(auto_sort_base, folder_name)
-                os.makedirs(term_folder, exist_ok=True)
+                targets.add(os.path.join(auto_sort_base, folder_name))
         
         # Create unmatched folder if configured
         if self.config['auto_sort_settings'].get('handle_no_matches') == 'move_to_unmatched':
-            unmatched_folder = os.path.join(auto_sort_base, 'unmatched')
-            os.makedirs(unmatched_folder, exist_ok=True)
+            targets.add(os.path.join(auto_sort_base, 'unmatched'))
+        
+        self._ensure_dirs(targets)
+    
+    def _terms_by_name(self):
+        """Index of auto_sort_terms by term name (first entry wins).
+
+        The index is rebuilt whenever the list object or its length changes
+        and after every save. The term manager also edits term dicts in
+        place, so look terms up through _find_term(), which checks the hit.
+        """
+        terms = self.config['auto_sort_terms']
+        if terms is not self._term_index_list or len(terms) != self._term_index_len:
+            index = {}
+            for term_config in terms:
+                index.setdefault(term_config['term'], term_config)
+            self._term_index = index
+            self._term_index_list = terms
+            self._term_index_len = len(terms)
+            self._term_folder_paths = {}
+        return self._term_index
+    
+    def _invalidate_terms(self):
+        """Rebuild the term index and folder path cache on next use."""
+        self._term_index_list = None
+        self._term_folder_paths = {}
+    
+    def _find_term(self, term):
+        """Return the config of the named term, or None.
+
+        A miss or a hit whose name no longer matches (renamed in place)
+        rebuilds the index once, which costs what a plain scan would.
+        """
+        term_config = self._terms_by_name().get(term)
+        if term_config is None or term_config.get('term') != term:
+            self._invalidate_terms()
+            term_config = self._terms_by_name().get(term)
+        return term_config
     
     def get_auto_sort_terms(self):
         """Get list of auto-sort terms with their settings (thread-safe)."""
@@ -385,8 +528,7 @@ class ConfigManager:
     def add_auto_sort_term(self, term, **kwargs):
         """Add a new auto-sort term."""
         # Check if term already exists
-        existing_terms = [t['term'] for t in self.config['auto_sort_terms']]
-        if term in existing_terms:
+        if self._find_term(term) is not None:
             raise ValueError(f"Term '{term}' already exists")
         
         new_term = {
@@ -406,12 +548,11 @@ class ConfigManager:
         self.validate_term_config(new_term)
         self.config['auto_sort_terms'].append(new_term)
         self.save_config()
-        
-        # Create the folder
-        self.setup_auto_sort_folders()
     
     def remove_auto_sort_term(self, term):
         """Remove an auto-sort term."""
+        if self._find_term(term) is None:
+            return
         self.config['auto_sort_terms'] = [
             t for t in self.config['auto_sort_terms'] 
             if t['term'] != term
@@ -420,20 +561,56 @@ class ConfigManager:
     
     def update_term_priority(self, term, new_priority):
         """Update the priority of a term."""
-        for term_config in self.config['auto_sort_terms']:
-            if term_config['term'] == term:
-                term_config['priority'] = new_priority
-                break
-        
-        # Re-sort terms by priority
-        self.config['auto_sort_terms'].sort(key=lambda x: x.get('priority', 999))
+        terms = self.config['auto_sort_terms']
+        term_config = self._find_term(term)
+        if term_config is not None:
+            term_config['priority'] = new_priority
+            self._reposition_term(terms, term_config)
+        else:
+            terms.sort(key=lambda x: x.get('priority', 999))
         self.save_config()
     
+    @staticmethod
+    def _reposition_term(terms, term_config):
+        """Move one term to its place in a priority-sorted term list.
+        
+        Gives the same order as a stable sort of the whole list; if the
+        other terms turn out not to be sorted (terms added or replaced
+        elsewhere) it falls back to sorting them all.
+        """
+        index = next(i for i, t in enumerate(terms) if t is term_config)
+        del terms[index]
+        priority = term_config.get('priority', 999)
+        
+        position = None
+        previous = None
+        for i, other in enumerate(terms):
+            other_priority = other.get('priority', 999)
+            if previous is not None and other_priority < previous:
+                terms.insert(index, term_config)
+                terms.sort(key=lambda x: x.get('priority', 999))
+                return
+            # Equal priorities keep their original relative order
+            if position is None and (other_priority > priority
+                                     or (other_priority == priority and i >= index)):
+                position = i
+            previous = other_priority
+        
+        terms.insert(len(terms) if position is None else position, term_config)
+    
     def get_auto_sort_settings(self):
         """Get auto-sort configuration settings (thread-safe)."""
         with self._lock:
             return copy.deepcopy(self.config.get('auto_sort_settings', {}))
     
+    def _auto_sort_settings(self):
+        """Live auto-sort settings for read-only use inside this class.
+
+        get_auto_sort_settings() deep-copies; the per-image destination
+        helpers below only read a few values, so they skip the copy.
+        """
+        return self.config.get('auto_sort_settings', {})
+    
     def update_auto_sort_settings(self, **kwargs):
         """Update auto-sort settings."""
         if 'auto_sort_settings' not in self.config:
@@ -443,27 +620,29 @@ class ConfigManager:
         self.save_config()
     
     def get_term_folder_path(self, term):
-        """Get the full path for a term's destination folder."""
+        """Get the full path for a term's destination folder (created if needed)."""
+        # Look up the term first: a rebuilt index clears the path cache
+        term_config = self._find_term(term)
         auto_sort_base = self.sorted_folders.get('auto_sorted')
-        if not auto_sort_base:
+        if not auto_sort_base or not term_config:
             return None
         
-        term_config = next(
-            (t for t in self.config['auto_sort_terms'] if t['term'] == term),
-            None
-        )
-        
-        if term_config:
-            folder_name = term_config.get('folder_name', term)
-            return os.path.join(auto_sort_base, self.sanitize_folder_name(folder_name))
+        # Cached paths are keyed by folder_name too, which may change in place
+        folder_name = term_config.get('folder_name', term)
+        cached = self._term_folder_paths.get(term)
+        if cached is not None and cached[0] == folder_name:
+            term_folder = cached[1]
+        else:
+            term_folder = os.path.join(auto_sort_base, self.sanitize_folder_name(folder_name))
+            self._term_folder_paths[term] = (folder_name, term_folder)
         
-        return None
+        if self.config['auto_sort_settings'].get('create_subfolders', True):
+            self._ensure_dir(term_folder)
+        return term_folder
     
     def validate_term_config(self, term_config):
         """Validate a term configuration object."""
-        required_fields = ['term', 'enabled', 'priority']
-        
-        for field in required_fields:
+        for field in _REQUIRED_TERM_FIELDS:
             if field not in term_config:
                 raise ValueError(f"Missing required field: {field}")
         
@@ -476,15 +655,13 @@ class ConfigManager:
             raise ValueError("Priority must be a positive integer")
         
         # Validate match type
-        valid_match_types = ['word_boundary', 'contains', 'exact', 'regex']
         match_type = term_config.get('match_type', 'word_boundary')
-        if match_type not in valid_match_types:
+        if match_type not in _VALID_MATCH_TYPES:
             raise ValueError(f"Invalid match_type: {match_type}")
         
         # Validate search scope
-        valid_search_scopes = ['prompt_only', 'tags_only', 'either', 'both']
         search_scope = term_config.get('search_scope', 'either')
-        if search_scope not in valid_search_scopes:
+        if search_scope not in _VALID_SEARCH_SCOPES:
             raise ValueError(f"Invalid search_scope: {search_scope}")
         
         # Validate include_negative_prompt is boolean
@@ -496,32 +673,23 @@ class ConfigManager:
     
     def sanitize_folder_name(self, name):
         """Sanitize a folder name for filesystem compatibility."""
-        import re
-        # Remove invalid characters and replace with underscores
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', name)
-        # Remove leading/trailing spaces and dots
-        sanitized = sanitized.strip('. ')
-        # Ensure not empty
-        if not sanitized:
-            sanitized = 'unnamed'
-        return sanitized
+        return _sanitize_folder_name(name)
     
     def export_terms(self, filename):
         """Export auto-sort terms to a file."""
         export_data = {
             'version': self.CURRENT_VERSION,
-            'export_date': datetime.now().isoformat(),
+            'export_date': time.strftime('%Y-%m-%dT%H:%M:%S'),
             'terms': self.config['auto_sort_terms'],
             'settings': self.config['auto_sort_settings']
         }
         
-        with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(_dump_json(export_data))
     
     def import_terms(self, filename, merge=True):
         """Import auto-sort terms from a file."""
-        with open(filename, 'r') as f:
-            import_data = json.load(f)
+        import_data = _load_json(filename)
         
         imported_terms = import_data.get('terms', [])
         
@@ -540,7 +708,6 @@ class ConfigManager:
             self.config['auto_sort_settings'].update(import_settings)
         
         self.save_config()
-        self.setup_auto_sort_folders()
     
     def get_bindings(self):
         """Get key/mouse bindings."""
@@ -593,19 +760,13 @@ class ConfigManager:
         
         if dest_location == 'script_dir':
             # Organized folders in script directory
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            source_name = self.sanitize_folder_name(os.path.basename(source_folder))
-            source_dest_dir = os.path.join(script_dir, f"sorted_{source_name}")
-            return os.path.join(source_dest_dir, folder_name)
+            return os.path.join(_organized_dir(source_folder), folder_name)
         elif dest_location == 'source_dirs':
             # Direct folders in source directory
             return os.path.join(source_folder, folder_name)
         elif dest_location == 'both':
             # Prefer script directory organized structure for primary sorting
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            source_name = self.sanitize_folder_name(os.path.basename(source_folder))
-            source_dest_dir = os.path.join(script_dir, f"sorted_{source_name}")
-            return os.path.join(source_dest_dir, folder_name)
+            return os.path.join(_organized_dir(source_folder), folder_name)
         else:
             # Fallback
             return os.path.join(source_folder, folder_name)
@@ -625,7 +786,7 @@ class ConfigManager:
         if not terms:
             return None
         
-        settings = self.get_auto_sort_settings()
+        settings = self._auto_sort_settings()
         separator = settings.get('combination_separator', '_')
         min_tags = settings.get('min_tags_for_combination', 2)
         max_tags = settings.get('max_tags_for_combination', 3)
@@ -659,7 +820,7 @@ class ConfigManager:
     
     def should_create_combination_folder(self, terms):
         """Determine if a combination folder should be created for the given terms."""
-        settings = self.get_auto_sort_settings()
+        settings = self._auto_sort_settings()
         if not settings.get('create_combination_folders', False):
             return False
         
@@ -680,26 +841,33 @@ class ConfigManager:
         # Sort by priority (lower number = higher priority)
         sorted_terms = sorted(matching_terms, key=lambda x: x.get('priority', 999))
         filtered_terms = []
+        included_names = set()
+        # How many included terms exclude each name
+        excluded_by = Counter()
         
         for term in sorted_terms:
-            current_exclusions = term.get('exclusion_terms', [])
-            
-            # Check if this term should be excluded by any already-included term
-            excluded = False
-            
-            # Check if any already-included term excludes this one
-            for included_term in filtered_terms:
-                included_exclusions = included_term.get('exclusion_terms', [])
-                if term['term'] in included_exclusions:
-                    excluded = True
-                    break
+            # Skip terms excluded by an already-included term
+            if excluded_by[term['term']]:
+                continue
             
-            # Check if this term excludes any already-included terms (remove those)
-            if not excluded and current_exclusions:
-                filtered_terms = [t for t in filtered_terms if t['term'] not in current_exclusions]
+            exclusions = term.get('exclusion_terms')
+            if exclusions:
+                exclusions = set(exclusions)
+                # Remove already-included terms this one excludes; their own
+                # exclusions stop applying once they are gone
+                if not exclusions.isdisjoint(included_names):
+                    kept = []
+                    for included_term in filtered_terms:
+                        if included_term['term'] in exclusions:
+                            excluded_by.subtract(set(included_term.get('exclusion_terms') or ()))
+                        else:
+                            kept.append(included_term)
+                    filtered_terms = kept
+                    included_names = {t['term'] for t in kept}
+                excluded_by.update(exclusions)
             
-            if not excluded:
-                filtered_terms.append(term)
+            filtered_terms.append(term)
+            included_names.add(term['term'])
         
         return filtered_terms
     
@@ -728,7 +896,7 @@ class ConfigManager:
         filtered_terms = self.filter_terms_by_exclusions(matching_terms)
         
         mode = self.get_multi_tag_mode()
-        settings = self.get_auto_sort_settings()
+        settings = self._auto_sort_settings()
         max_folders = settings.get('multi_tag_max_folders', 5)
         
         destinations = []
@@ -815,7 +983,7 @@ class ConfigManager:
         if len(matches) == 1:
             return matches[0]
         
-        settings = self.get_auto_sort_settings()
+        settings = self._auto_sort_settings()
         strategy = settings.get('handle_multiple_matches', 'first_match')
         
         if strategy == 'first_match':
@@ -836,7 +1004,7 @@ class ConfigManager:
         for combination in term_combinations:
             folder_path = self.get_combination_folder_path(combination)
             if folder_path:
-                os.makedirs(folder_path, exist_ok=True)
+                self._ensure_dir(folder_path)
     
     def get_basic_settings(self):
         """Get basic settings (for backward compatibility)."""
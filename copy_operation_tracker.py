@@ -21,11 +21,26 @@ logger = logging.getLogger(__name__)
 # State file location
 STATE_FILE = Path(__file__).parent / "data" / "pending_copy_operation.json"
 
+# Journal entries are flushed every JOURNAL_FLUSH_INTERVAL files; after
+# JOURNAL_COMPACT_LINES entries they are folded back into the state file
+JOURNAL_FLUSH_INTERVAL = 10
+JOURNAL_COMPACT_LINES = 50000
+
+
+def _journal_file() -> Path:
+    """Append-only log of files copied since the state file was written."""
+    return STATE_FILE.with_suffix('.journal')
+
 
 class CopyOperationTracker:
     """
     Tracks copy operations and enables resume after interruption.
 
+    The state file holds the full operation (including every source file)
+    and is only rewritten on start, compaction and resume checkpoints;
+    mark_copied appends one line per file to a journal that is replayed
+    on load.
+
     Usage:
         tracker = CopyOperationTracker()
 
@@ -48,6 +63,10 @@ class CopyOperationTracker:
 
     def __init__(self):
         self.state = None
+        # Membership index for state['copied_files'] (the list is kept for saving)
+        self._copied_set = set()
+        self._journal = None
+        self._journal_lines = 0
         self._load_state()
 
     def _load_state(self):
@@ -56,6 +75,8 @@ class CopyOperationTracker:
             try:
                 with open(STATE_FILE, 'r', encoding='utf-8') as f:
                     self.state = json.load(f)
+                self._copied_set = set(self.state.get('copied_files', []))
+                self._replay_journal()
                 logger.info(f"Loaded pending copy operation state: {self.state.get('operation_type', 'unknown')}")
             except Exception as e:
                 logger.warning(f"Failed to load copy operation state: {e}")
@@ -63,18 +84,73 @@ class CopyOperationTracker:
         else:
             self.state = None
 
+    def _replay_journal(self):
+        """Add files recorded in the journal to the loaded state.
+
+        The replayed entries are then folded into the state file, so new
+        entries never get appended after a torn line.
+        """
+        journal_file = _journal_file()
+        if not journal_file.exists():
+            return
+
+        copied_files = self.state.setdefault('copied_files', [])
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    file_path = json.loads(line)
+                except ValueError:
+                    # Torn final line from an interrupted write
+                    break
+                if file_path not in self._copied_set:
+                    self._copied_set.add(file_path)
+                    copied_files.append(file_path)
+        self._save_state()
+
+    def _append_journal(self, file_path: str) -> None:
+        """Record one copied file, flushing every JOURNAL_FLUSH_INTERVAL files."""
+        try:
+            if self._journal is None:
+                STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                self._journal = open(_journal_file(), 'a', encoding='utf-8')
+            self._journal.write(json.dumps(file_path) + '\n')
+            self._journal_lines += 1
+            if self._journal_lines % JOURNAL_FLUSH_INTERVAL == 0:
+                self._journal.flush()
+        except Exception as e:
+            logger.error(f"Failed to write copy operation journal: {e}")
+
+    def _close_journal(self, delete: bool = False) -> None:
+        """Close the journal, optionally deleting it."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        self._journal_lines = 0
+        journal_file = _journal_file()
+        if delete and journal_file.exists():
+            journal_file.unlink()
+
     def _save_state(self):
-        """Save current state to disk."""
+        """Save current state to disk and start a fresh journal."""
         try:
             STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(STATE_FILE, 'w', encoding='utf-8') as f:
+            temp_file = STATE_FILE.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(self.state, f, indent=2)
+            os.replace(temp_file, STATE_FILE)
+            # Everything journaled so far is now in the state file
+            self._close_journal(delete=True)
         except Exception as e:
             logger.error(f"Failed to save copy operation state: {e}")
 
     def _clear_state(self):
         """Clear state from disk."""
         self.state = None
+        self._copied_set = set()
+        try:
+            self._close_journal(delete=True)
+        except Exception as e:
+            logger.warning(f"Failed to delete journal file: {e}")
         if STATE_FILE.exists():
             try:
                 STATE_FILE.unlink()
@@ -106,7 +182,7 @@ class CopyOperationTracker:
         if not self.has_pending_operation():
             return None
 
-        copied_files = set(self.state.get('copied_files', []))
+        copied_files = self._copied_set
         all_files = self.state.get('source_files', [])
         remaining = [f for f in all_files if f not in copied_files]
 
@@ -141,6 +217,7 @@ class CopyOperationTracker:
             'started_at': datetime.now().isoformat(),
             'completed': False
         }
+        self._copied_set = set()
         self._save_state()
         logger.info(f"Started tracking copy operation: {operation_type}, {len(source_files)} files")
 
@@ -149,11 +226,13 @@ class CopyOperationTracker:
         if not self.state:
             return
 
-        if file_path not in self.state['copied_files']:
+        if file_path not in self._copied_set:
+            self._copied_set.add(file_path)
             self.state['copied_files'].append(file_path)
 
-            # Save every 10 files to reduce I/O while maintaining reasonable checkpoints
-            if len(self.state['copied_files']) % 10 == 0:
+            # Journal the file; only fold it into the state file occasionally
+            self._append_journal(file_path)
+            if self._journal_lines >= JOURNAL_COMPACT_LINES:
                 self._save_state()
 
     def complete_operation(self) -> None:
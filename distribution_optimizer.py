@@ -18,6 +18,9 @@ import logging
 from collections import defaultdict
 from datetime import datetime
 
+# Extensions counted as images when measuring folder sizes
+_IMAGE_EXTENSIONS = frozenset(('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif'))
+
 
 class DistributionOptimizer:
     """Optimizes multi-tag sorting for balanced folder distribution."""
@@ -60,15 +63,19 @@ class DistributionOptimizer:
             term_name = term.get('term', term.get('folder_name', 'unknown'))
             folder_path = term.get('folder_path')
 
-            if folder_path and os.path.isdir(folder_path):
-                # Count images in folder
-                image_count = len([
-                    f for f in os.listdir(folder_path)
-                    if f.lower().endswith(('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif'))
-                ])
-                folder_sizes[term_name] = image_count
-            else:
-                folder_sizes[term_name] = 0
+            image_count = 0
+            if folder_path:
+                # Count images by name only; scandir needs no per-entry stat
+                try:
+                    with os.scandir(folder_path) as entries:
+                        for entry in entries:
+                            name = entry.name
+                            if name[name.rfind('.'):].lower() in _IMAGE_EXTENSIONS:
+                                image_count += 1
+                except OSError:
+                    # Missing folder (or not a folder) counts as empty
+                    pass
+            folder_sizes[term_name] = image_count
 
         return folder_sizes
 
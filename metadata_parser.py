@@ -302,6 +302,16 @@ class MetadataParser:
             if isinstance(value, str) and key not in ['positive_prompt', 'negative_prompt', 'parameters', 'tags']:
                 other_metadata_text += value + " "
 
+        # Lowercased copies of the texts, made once per image rather than
+        # once per term (see _search_term_in_text's text_lower)
+        lowered = {}
+
+        def lower(text):
+            result = lowered.get(text)
+            if result is None:
+                result = lowered[text] = text.lower()
+            return result
+
         # Search for each term
         for term_config in search_terms:
             if not term_config.get('enabled', True):
@@ -342,8 +352,12 @@ class MetadataParser:
             
             if search_scope == 'both':
                 # Special handling for AND logic
-                prompt_match = self._search_term_in_text(current_prompt_text, term, match_type, case_sensitive)
-                tag_match = self._search_term_in_text(tag_text, term, match_type, case_sensitive)
+                prompt_match = self._search_term_in_text(
+                    current_prompt_text, term, match_type, case_sensitive,
+                    None if case_sensitive else lower(current_prompt_text))
+                tag_match = prompt_match and self._search_term_in_text(
+                    tag_text, term, match_type, case_sensitive,
+                    None if case_sensitive else lower(tag_text))
                 
                 if prompt_match and tag_match:
                     matches.append(term_config)
@@ -351,7 +365,8 @@ class MetadataParser:
                 # OR logic or single source
                 found = False
                 for search_text in search_texts:
-                    if self._search_term_in_text(search_text, term, match_type, case_sensitive):
+                    if self._search_term_in_text(search_text, term, match_type, case_sensitive,
+                                                 None if case_sensitive else lower(search_text)):
                         found = True
                         break
                 
@@ -387,12 +402,20 @@ class MetadataParser:
             self._compiled_patterns[cache_key] = None
             return None
 
-    def _search_term_in_text(self, text, term, match_type, case_sensitive):
-        """Search for a single term in text using specified match type."""
+    def _search_term_in_text(self, text, term, match_type, case_sensitive, text_lower=None):
+        """Search for a single term in text using specified match type.
+
+        Args:
+            text_lower: text.lower() if the caller already has it (avoids
+                lowercasing the same text again for every term)
+        """
         if not text or not term:
             return False
 
-        search_text = text if case_sensitive else text.lower()
+        if case_sensitive:
+            search_text = text
+        else:
+            search_text = text_lower if text_lower is not None else text.lower()
         search_term = term if case_sensitive else term.lower()
 
         if match_type == 'exact':
@@ -297,9 +297,9 @@ class ExportBatchCLI:
         )
         export_parser.add_argument(
             '--mode',
-            choices=['copy', 'symlink'],
+            choices=['copy', 'hardlink', 'symlink'],
             default='copy',
-            help='Export mode: copy files or create symlinks (default: copy)'
+            help='Export mode: copy files, hardlink them (same drive) or create symlinks (default: copy)'
         )
         export_parser.add_argument(
             '--name',
@@ -0,0 +1,86 @@
+"""
+Quantize WD14 Script - Build and check the int8 model for background sorting
+
+Creates models/wd14/model.quant.onnx (ONNX Runtime dynamic quantization) and
+compares it against the full-precision model on a folder of sample images,
+for the '*_background' tags used by the background classifier only.
+
+Usage:
+    python scripts/quantize_wd14.py --images <folder>
+    python scripts/quantize_wd14.py --images <folder> --limit 200
+
+Enable the quantized model for background sorting with:
+    set BACKGROUND_CLASSIFIER_QUANTIZED=1
+
+Author: Claude Code Implementation
+Version: 1.0
+"""
+
+import sys
+import os
+import argparse
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wd14_tagger import WD14Tagger
+from background_classifier import IMAGE_EXTENSIONS, scan_image_folders
+
+# Minimum acceptable per-tag correlation with the full-precision model
+MIN_CORRELATION = 0.99
+
+
+def score_background_tags(tagger, image_paths):
+    """Score images with a tagger, keeping only '*_background' tag columns."""
+    indices = [i for i, tag in enumerate(tagger.tag_names) if 'background' in tag.lower()]
+    rows = tagger.score_batch(image_paths, tag_indices=np.array(indices), skip_cache=True)
+    keep = [i for i, row in enumerate(rows) if row is not None]
+    return [tagger.tag_names[i] for i in indices], keep, np.stack([rows[i] for i in keep])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Quantize WD14 and compare background tags')
+    parser.add_argument('--images', required=True, help='Folder of sample images')
+    parser.add_argument('--limit', type=int, default=100, help='Maximum images to compare')
+    parser.add_argument('--threshold', type=float, default=0.35, help='Tag threshold')
+    args = parser.parse_args()
+
+    image_paths = list(scan_image_folders([args.images]))[:args.limit]
+    if not image_paths:
+        print(f"No images ({', '.join(sorted(IMAGE_EXTENSIONS))}) found in {args.images}")
+        return 1
+
+    full = WD14Tagger(use_cache=False)
+    quant = WD14Tagger(use_cache=False, quantized=True)
+    if not (full.loaded and quant.loaded and quant.quantized):
+        print("Could not load both models (is the 'onnx' package installed?)")
+        return 1
+
+    tag_names, keep_full, full_scores = score_background_tags(full, image_paths)
+    _, keep_quant, quant_scores = score_background_tags(quant, image_paths)
+    if keep_full != keep_quant:
+        print("Models failed on different images; aborting")
+        return 1
+
+    print(f"\nCompared {len(keep_full)} images, {len(tag_names)} background tags")
+    print(f"Quantized model: {quant.quantized_model_path()}\n")
+
+    worst = 1.0
+    for j, tag in enumerate(tag_names):
+        a, b = full_scores[:, j], quant_scores[:, j]
+        if a.std() == 0 or b.std() == 0:
+            continue
+        corr = float(np.corrcoef(a, b)[0, 1])
+        worst = min(worst, corr)
+        flips = int(np.sum((a >= args.threshold) != (b >= args.threshold)))
+        if corr < MIN_CORRELATION or flips:
+            print(f"  {tag:40s} r={corr:.4f}  threshold flips={flips}")
+
+    print(f"\nLowest correlation: {worst:.4f} (target >= {MIN_CORRELATION})")
+    return 0 if worst >= MIN_CORRELATION else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
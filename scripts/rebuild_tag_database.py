@@ -216,9 +216,11 @@ class TagDatabaseRebuilder:
             return []
 
         if recursive:
-            for file_path in folder.rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                    image_files.append(str(file_path))
+            # os.walk avoids building a Path for every entry in the tree
+            for root, dirs, files in os.walk(folder):
+                for name in files:
+                    if os.path.splitext(name)[1].lower() in image_extensions:
+                        image_files.append(os.path.join(root, name))
         else:
             for file_path in folder.glob('*'):
                 if file_path.is_file() and file_path.suffix.lower() in image_extensions:
@@ -516,30 +516,32 @@ class SetupDialog:
         
         # Update config manager if available
         if self.config_manager:
-            # Update basic settings
-            self.config_manager.update_basic_settings(
-                last_folder=primary_folder,
-                num_rows=self.rows_var.get(),
-                random_order=self.random_var.get(),
-                copy_instead_of_move=self.copy_var.get(),
-                include_subfolders=self.include_subfolders_var.get()
-            )
+            # One save for all of the below
+            with self.config_manager.batch():
+                # Update basic settings
+                self.config_manager.update_basic_settings(
+                    last_folder=primary_folder,
+                    num_rows=self.rows_var.get(),
+                    random_order=self.random_var.get(),
+                    copy_instead_of_move=self.copy_var.get(),
+                    include_subfolders=self.include_subfolders_var.get()
+                )
             
-            # Update source folders and active sources
-            self.config_manager.config['source_folders'] = self.source_folders
-            self.config_manager.config['active_sources'] = self.active_sources
-            self.config_manager.config['destination_settings'] = {
-                'script_dir': self.dest_script_var.get(),
-                'source_dirs': self.dest_source_var.get()
-            }
+                # Update source folders and active sources
+                self.config_manager.config['source_folders'] = self.source_folders
+                self.config_manager.config['active_sources'] = self.active_sources
+                self.config_manager.config['destination_settings'] = {
+                    'script_dir': self.dest_script_var.get(),
+                    'source_dirs': self.dest_source_var.get()
+                }
             
-            # Update UI preferences for tag handling
-            if 'ui_preferences' not in self.config_manager.config:
-                self.config_manager.config['ui_preferences'] = {}
-            self.config_manager.config['ui_preferences']['handle_tag_files'] = self.handle_tags_var.get()
-            self.config_manager.config['ui_preferences']['hide_already_sorted'] = self.hide_sorted_var.get()
+                # Update UI preferences for tag handling
+                if 'ui_preferences' not in self.config_manager.config:
+                    self.config_manager.config['ui_preferences'] = {}
+                self.config_manager.config['ui_preferences']['handle_tag_files'] = self.handle_tags_var.get()
+                self.config_manager.config['ui_preferences']['hide_already_sorted'] = self.hide_sorted_var.get()
             
-            self.config_manager.save_config()
+                self.config_manager.save_config()
         
         self.window.destroy()
 
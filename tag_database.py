@@ -17,12 +17,58 @@ Version: 1.0
 import sqlite3
 import json
 import logging
+import queue
+import threading
 from pathlib import Path
 from typing import List, Tuple, Optional, Set
 from contextlib import contextmanager
 
+# Try to import pyroaring for compressed tag bitmaps (falls back to int bitsets)
+try:
+    from pyroaring import BitMap
+    HAS_PYROARING = True
+except ImportError:
+    HAS_PYROARING = False
+
 logger = logging.getLogger(__name__)
 
+# Queued to stop the background writer thread
+_STOP_WRITER = object()
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards so user text matches literally (with ESCAPE '\\')."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _make_bitmap(ids):
+    """Build a bitmap of image ids (roaring BitMap, or an int with those bits set)."""
+    if HAS_PYROARING:
+        return BitMap(ids)
+    bits = bytearray((max(ids) >> 3) + 1 if ids else 0)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _bitmap_difference(a, b):
+    """Return ids in bitmap a but not in bitmap b."""
+    return a - b if HAS_PYROARING else a & ~b
+
+
+def _bitmap_ids(bitmap) -> List[int]:
+    """Return the ids set in a bitmap, in ascending order."""
+    if HAS_PYROARING:
+        return list(bitmap)
+    # Reversed binary string: character i is bit i
+    bits = bin(bitmap)[:1:-1]
+    ids = []
+    i = bits.find('1')
+    while i != -1:
+        ids.append(i)
+        i = bits.find('1', i + 1)
+    return ids
+
 
 class TagDatabase:
     """SQLite-based tag database with indexing and favorites support."""
@@ -36,6 +82,12 @@ class TagDatabase:
         """
         self.db_path = Path(db_path)
         self.connection = None
+        self._stmt_cache = {}  # Query shape -> SQL text
+        self._image_paths = None  # Image id -> path, for tag bitmaps
+        self._image_ids = None    # Image path -> id
+        self._bitmaps = {}        # Tag -> bitmap of image ids, loaded lazily
+        self._write_queue = queue.Queue()  # Flag updates for the writer thread
+        self._writer = None
         self._initialize_database()
 
     def _initialize_database(self):
@@ -76,10 +128,10 @@ class TagDatabase:
                 ON tags(is_favorite DESC, count DESC)
             ''')
 
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_tag_lower
-                ON tags(LOWER(tag))
-            ''')
+            # Tag search runs a plain LIKE, which no index on tags(tag) can
+            # serve, so drop the expression and NOCASE indexes it used to keep
+            cursor.execute('DROP INDEX IF EXISTS idx_tags_name_nocase')
+            cursor.execute('DROP INDEX IF EXISTS idx_tag_lower')
 
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_tag_images_tag
@@ -91,6 +143,10 @@ class TagDatabase:
                 ON tag_images(image_path)
             ''')
 
+            # Selections are answered from tag bitmaps (query_bitmap), so the
+            # (image_path, tag) index used by the old SQL version isn't needed
+            cursor.execute('DROP INDEX IF EXISTS idx_tag_images_path_tag')
+
             # Migrate existing database: add is_hidden column if it doesn't exist
             cursor.execute("PRAGMA table_info(tags)")
             columns = [row[1] for row in cursor.fetchall()]
@@ -108,6 +164,9 @@ class TagDatabase:
             self.connection = sqlite3.connect(str(self.db_path))
             self.connection.row_factory = sqlite3.Row
 
+        # Reads and writes on this connection see every queued flag update
+        self._wait_for_writes()
+
         try:
             yield self.connection
         except Exception as e:
@@ -117,8 +176,123 @@ class TagDatabase:
         else:
             self.connection.commit()
 
+    def _invalidate_bitmaps(self):
+        """Drop cached tag bitmaps after tag_images changes."""
+        self._image_paths = None
+        self._image_ids = None
+        self._bitmaps.clear()
+
+    def _queue_write(self, sql: str, params: tuple, done_message: str, missing_message: str):
+        """
+        Queue a single-row update for the writer thread and return immediately.
+
+        If the writer thread has died the update is applied synchronously.
+
+        Args:
+            sql: UPDATE statement
+            params: Statement parameters
+            done_message: Logged when a row was updated
+            missing_message: Logged when no row matched
+        """
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._writer_loop, name='TagDatabaseWriter', daemon=True)
+            self._writer.start()
+        self._write_queue.put((sql, params, done_message, missing_message))
+        if not self._writer.is_alive():
+            with self._get_connection():
+                pass
+
+    @staticmethod
+    def _apply_writes(conn, items):
+        """Run queued updates on conn in one transaction; errors are logged."""
+        try:
+            for sql, params, done_message, missing_message in items:
+                cursor = conn.execute(sql, params)
+                if cursor.rowcount > 0:
+                    logger.info(done_message)
+                else:
+                    logger.warning(missing_message)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Database error: {e}")
+
+    def _writer_loop(self):
+        """Apply queued updates on a dedicated connection, one commit per burst."""
+        conn = None
+        try:
+            conn = sqlite3.connect(str(self.db_path))
+
+            while True:
+                batch = [self._write_queue.get()]
+                while True:
+                    try:
+                        batch.append(self._write_queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                try:
+                    self._apply_writes(conn, [item for item in batch if item is not _STOP_WRITER])
+                finally:
+                    for _ in batch:
+                        self._write_queue.task_done()
+
+                if any(item is _STOP_WRITER for item in batch):
+                    return
+        except Exception as e:
+            # Updates still queued are applied by _wait_for_writes
+            logger.error(f"Tag database writer stopped: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _wait_for_writes(self):
+        """
+        Wait for the writer thread to commit queued updates.
+
+        Only waits while the writer is alive; anything left in the queue
+        after it has exited is applied here on the caller's connection.
+        """
+        write_queue = self._write_queue
+        while write_queue.unfinished_tasks:
+            writer = self._writer
+            if writer is not None and writer.is_alive():
+                with write_queue.all_tasks_done:
+                    if write_queue.unfinished_tasks:
+                        write_queue.all_tasks_done.wait(0.1)
+                continue
+
+            items = []
+            while True:
+                try:
+                    items.append(write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not items:
+                break
+            try:
+                self._apply_writes(self.connection,
+                                   [item for item in items if item is not _STOP_WRITER])
+            finally:
+                for _ in items:
+                    write_queue.task_done()
+
+    def flush_writes(self):
+        """Wait until every queued flag update is committed."""
+        with self._get_connection():
+            pass
+
     def close(self):
-        """Close database connection."""
+        """Close database connection (after committing queued updates)."""
+        if self._writer is not None:
+            if self._writer.is_alive():
+                self._write_queue.put(_STOP_WRITER)
+                self._writer.join()
+            self._writer = None
+        if self._write_queue.unfinished_tasks:
+            self.flush_writes()
+
         if self.connection:
             self.connection.close()
             self.connection = None
@@ -147,6 +321,8 @@ class TagDatabase:
             ''', (tag, len(image_paths), 1 if is_favorite else 0, 1 if is_hidden else 0,
                   len(image_paths), 1 if is_favorite else 0, 1 if is_hidden else 0))
 
+            self._invalidate_bitmaps()
+
             # Add image relationships
             for image_path in image_paths:
                 cursor.execute('''
@@ -178,6 +354,8 @@ class TagDatabase:
                 VALUES (?, ?, ?)
             ''', tag_rows)
 
+            self._invalidate_bitmaps()
+
             # Bulk insert image relationships
             cursor.executemany('''
                 INSERT INTO tag_images (tag, image_path)
@@ -192,10 +370,11 @@ class TagDatabase:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM tag_images')
             cursor.execute('DELETE FROM tags')
+            self._invalidate_bitmaps()
             logger.info("Database cleared")
 
     def list_tags(self, favorites_first: bool = True, limit: Optional[int] = None,
-                  include_hidden: bool = False) -> List[Tuple[str, int, bool, bool]]:
+                  include_hidden: bool = False, offset: int = 0) -> List[Tuple[str, int, bool, bool]]:
         """
         List all tags sorted by frequency.
 
@@ -203,6 +382,7 @@ class TagDatabase:
             favorites_first: If True, show favorites first
             limit: Optional limit on number of tags returned
             include_hidden: If True, include hidden/blocked tags
+            offset: Number of tags to skip (for paging with limit)
 
         Returns:
             List of (tag, count, is_favorite, is_hidden) tuples
@@ -221,26 +401,54 @@ class TagDatabase:
                     query += ' WHERE is_hidden = 0'
                 query += ' ORDER BY count DESC'
 
-            if limit:
-                query += f' LIMIT {limit}'
+            if limit or offset:
+                query += f' LIMIT {int(limit) if limit else -1}'
+            if offset:
+                query += f' OFFSET {int(offset)}'
 
             cursor.execute(query)
             return [(row['tag'], row['count'], bool(row['is_favorite']), bool(row['is_hidden']))
                     for row in cursor.fetchall()]
 
+    def count_tags(self, include_hidden: bool = False) -> int:
+        """
+        Count tags without loading them.
+
+        Args:
+            include_hidden: If True, include hidden/blocked tags
+
+        Returns:
+            Number of tags
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = 'SELECT COUNT(*) FROM tags'
+            if not include_hidden:
+                query += ' WHERE is_hidden = 0'
+
+            cursor.execute(query)
+            return cursor.fetchone()[0]
+
     def search_tags(self, search_text: str, limit: int = 200,
                     include_hidden: bool = False) -> List[Tuple[str, int, bool, bool]]:
         """
         Search for tags containing the search text.
 
+        SQLite's LIKE is already case-insensitive for ASCII, so the match runs
+        against the stored tag without a per-row LOWER(), walking the
+        (is_favorite, count) index and stopping after `limit` matches.
+
         Args:
-            search_text: Text to search for (case-insensitive)
+            search_text: Text to search for (case-insensitive, matched literally)
             limit: Maximum number of results
             include_hidden: If True, include hidden/blocked tags
 
         Returns:
             List of (tag, count, is_favorite, is_hidden) tuples
         """
+        pattern = f'%{_escape_like(search_text)}%'
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -248,18 +456,18 @@ class TagDatabase:
                 cursor.execute('''
                     SELECT tag, count, is_favorite, is_hidden
                     FROM tags
-                    WHERE LOWER(tag) LIKE ?
+                    WHERE tag LIKE ? ESCAPE '\\'
                     ORDER BY is_favorite DESC, count DESC
                     LIMIT ?
-                ''', (f'%{search_text.lower()}%', limit))
+                ''', (pattern, limit))
             else:
                 cursor.execute('''
                     SELECT tag, count, is_favorite, is_hidden
                     FROM tags
-                    WHERE LOWER(tag) LIKE ? AND is_hidden = 0
+                    WHERE tag LIKE ? ESCAPE '\\' AND is_hidden = 0
                     ORDER BY is_favorite DESC, count DESC
                     LIMIT ?
-                ''', (f'%{search_text.lower()}%', limit))
+                ''', (pattern, limit))
 
             return [(row['tag'], row['count'], bool(row['is_favorite']), bool(row['is_hidden']))
                     for row in cursor.fetchall()]
@@ -285,6 +493,66 @@ class TagDatabase:
 
             return [row['image_path'] for row in cursor.fetchall()]
 
+    def _cached_sql(self, key: tuple, build) -> str:
+        """
+        Return the SQL text for a query shape, building it on first use.
+
+        Queries differ only in placeholder counts, so keeping the text stable
+        per shape also lets sqlite3's statement cache skip re-parsing.
+
+        Args:
+            key: Query shape, e.g. ('images', n_include, n_exclude, operator)
+            build: Callable returning the SQL text for that shape
+        """
+        sql = self._stmt_cache.get(key)
+        if sql is None:
+            sql = self._stmt_cache[key] = build()
+        return sql
+
+    @staticmethod
+    def _build_query_images_sql(n_include: int, n_exclude: int, operator: str) -> str:
+        """Build the query_images SQL for a given tag count and operator."""
+        include_placeholders = ','.join('?' * n_include)
+        exclude_placeholders = ','.join('?' * n_exclude)
+
+        if operator == 'AND':
+            # Images must have ALL include_tags
+            query = f'''
+                SELECT image_path
+                FROM tag_images
+                WHERE tag IN ({include_placeholders})
+                GROUP BY image_path
+                HAVING COUNT(DISTINCT tag) = ?
+            '''
+
+            if n_exclude:
+                # Exclude images with any exclude_tag
+                query = f'''
+                    SELECT image_path FROM ({query})
+                    WHERE image_path NOT IN (
+                        SELECT image_path FROM tag_images
+                        WHERE tag IN ({exclude_placeholders})
+                    )
+                '''
+
+        else:  # OR
+            # Images must have AT LEAST ONE include_tag
+            query = f'''
+                SELECT DISTINCT image_path
+                FROM tag_images
+                WHERE tag IN ({include_placeholders})
+            '''
+
+            if n_exclude:
+                query += f'''
+                    AND image_path NOT IN (
+                        SELECT image_path FROM tag_images
+                        WHERE tag IN ({exclude_placeholders})
+                    )
+                '''
+
+        return query
+
     def query_images(self, include_tags: List[str], exclude_tags: List[str] = None,
                     operator: str = 'OR') -> List[str]:
         """
@@ -302,100 +570,120 @@ class TagDatabase:
             return []
 
         exclude_tags = exclude_tags or []
+        operator = 'AND' if operator.upper() == 'AND' else 'OR'
+
+        query = self._cached_sql(
+            ('images', len(include_tags), len(exclude_tags), operator),
+            lambda: self._build_query_images_sql(len(include_tags), len(exclude_tags), operator)
+        )
+        params = list(include_tags)
+        if operator == 'AND':
+            params.append(len(include_tags))
+        params.extend(exclude_tags)
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
-
-            if operator.upper() == 'AND':
-                # Images must have ALL include_tags
-                query = '''
-                    SELECT image_path
-                    FROM tag_images
-                    WHERE tag IN ({})
-                    GROUP BY image_path
-                    HAVING COUNT(DISTINCT tag) = ?
-                '''.format(','.join('?' * len(include_tags)))
-
-                params = include_tags + [len(include_tags)]
-
-                if exclude_tags:
-                    # Exclude images with any exclude_tag
-                    exclude_placeholders = ','.join('?' * len(exclude_tags))
-                    query = f'''
-                        SELECT image_path FROM ({query})
-                        WHERE image_path NOT IN (
-                            SELECT image_path FROM tag_images
-                            WHERE tag IN ({exclude_placeholders})
-                        )
-                    '''
-                    params.extend(exclude_tags)
-
-            else:  # OR
-                # Images must have AT LEAST ONE include_tag
-                placeholders = ','.join('?' * len(include_tags))
-                query = f'''
-                    SELECT DISTINCT image_path
-                    FROM tag_images
-                    WHERE tag IN ({placeholders})
-                '''
-                params = include_tags
-
-                if exclude_tags:
-                    exclude_placeholders = ','.join('?' * len(exclude_tags))
-                    query += f'''
-                        AND image_path NOT IN (
-                            SELECT image_path FROM tag_images
-                            WHERE tag IN ({exclude_placeholders})
-                        )
-                    '''
-                    params.extend(exclude_tags)
-
             cursor.execute(query, params)
             return [row['image_path'] for row in cursor.fetchall()]
 
+    def _load_image_ids(self):
+        """Number every tagged image, in path order, for bitmap queries."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT image_path FROM tag_images GROUP BY image_path')
+            self._image_paths = [row[0] for row in cursor.fetchall()]
+        self._image_ids = {path: i for i, path in enumerate(self._image_paths)}
+
+    def get_image_ids_bitmap(self, tag: str):
+        """
+        Get the bitmap of image ids that have a tag, loading it on first use.
+
+        Args:
+            tag: Tag name
+
+        Returns:
+            pyroaring BitMap if installed, else an int used as a bitset
+        """
+        bitmap = self._bitmaps.get(tag)
+        if bitmap is None:
+            if self._image_ids is None:
+                self._load_image_ids()
+            image_ids = self._image_ids
+            bitmap = self._bitmaps[tag] = _make_bitmap(
+                [image_ids[path] for path in self.get_images_for_tag(tag)])
+        return bitmap
+
+    def query_bitmap(self, or_tags: List[str], and_tags: List[str],
+                     not_tags: List[str] = None) -> List[str]:
+        """
+        Query images matching any OR tag, all AND tags and no NOT tag.
+
+        Each tag is read from SQLite once; after that, re-running a selection
+        (as the batch export dialog does on every tag click) is just bitwise
+        AND/OR/AND-NOT over the cached bitmaps.
+
+        Args:
+            or_tags: Images must have at least one of these (ignored if empty)
+            and_tags: Images must have every one of these
+            not_tags: Images must have none of these
+
+        Returns:
+            List of image paths matching the query, sorted by path
+        """
+        if not or_tags and not and_tags:
+            return []
+
+        result = None
+        for tag in and_tags:
+            bitmap = self.get_image_ids_bitmap(tag)
+            result = bitmap if result is None else result & bitmap
+
+        if or_tags:
+            any_bitmap = None
+            for tag in or_tags:
+                bitmap = self.get_image_ids_bitmap(tag)
+                any_bitmap = bitmap if any_bitmap is None else any_bitmap | bitmap
+            result = any_bitmap if result is None else result & any_bitmap
+
+        for tag in not_tags or []:
+            result = _bitmap_difference(result, self.get_image_ids_bitmap(tag))
+
+        image_paths = self._image_paths
+        return [image_paths[i] for i in _bitmap_ids(result)]
+
     def set_favorite(self, tag: str, is_favorite: bool = True):
         """
         Set a tag as favorite or unfavorite.
 
+        The update is committed by the writer thread; this returns immediately.
+
         Args:
             tag: Tag name
             is_favorite: True to favorite, False to unfavorite
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                UPDATE tags
-                SET is_favorite = ?
-                WHERE tag = ?
-            ''', (1 if is_favorite else 0, tag))
-
-            if cursor.rowcount > 0:
-                logger.info(f"Tag '{tag}' {'favorited' if is_favorite else 'unfavorited'}")
-            else:
-                logger.warning(f"Tag '{tag}' not found")
+        self._queue_write(
+            'UPDATE tags SET is_favorite = ? WHERE tag = ?',
+            (1 if is_favorite else 0, tag),
+            f"Tag '{tag}' {'favorited' if is_favorite else 'unfavorited'}",
+            f"Tag '{tag}' not found"
+        )
 
     def set_hidden(self, tag: str, is_hidden: bool = True):
         """
         Set a tag as hidden/blocked or unhide it.
 
+        The update is committed by the writer thread; this returns immediately.
+
         Args:
             tag: Tag name
             is_hidden: True to hide, False to unhide
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                UPDATE tags
-                SET is_hidden = ?
-                WHERE tag = ?
-            ''', (1 if is_hidden else 0, tag))
-
-            if cursor.rowcount > 0:
-                logger.info(f"Tag '{tag}' {'hidden' if is_hidden else 'unhidden'}")
-            else:
-                logger.warning(f"Tag '{tag}' not found")
+        self._queue_write(
+            'UPDATE tags SET is_hidden = ? WHERE tag = ?',
+            (1 if is_hidden else 0, tag),
+            f"Tag '{tag}' {'hidden' if is_hidden else 'unhidden'}",
+            f"Tag '{tag}' not found"
+        )
 
     def get_favorites(self) -> List[Tuple[str, int]]:
         """
@@ -230,39 +230,33 @@ class TagQueryEngine:
         if not self.database or not parsed_query:
             return []
 
-        include_tags = parsed_query.get('include_tags', [])
-        exclude_tags = parsed_query.get('exclude_tags', [])
+        # Tags are indexed lowercase; normalize the query's tags once
+        include_tags = [tag.lower() for tag in parsed_query.get('include_tags', [])]
+        exclude_tags = [tag.lower() for tag in parsed_query.get('exclude_tags', [])]
         operator = parsed_query.get('operator', 'AND')
 
         if not include_tags:
             return []
 
-        # Get image sets for each tag
-        tag_image_sets = {}
-        for tag in include_tags + exclude_tags:
-            tag_normalized = tag.lower()
-            if tag_normalized in self.tags_db:
-                tag_image_sets[tag_normalized] = self.tags_db[tag_normalized]
-            else:
-                tag_image_sets[tag_normalized] = set()
+        empty = set()
 
         # Apply inclusion logic
         if operator == 'SINGLE':
-            result = tag_image_sets.get(include_tags[0].lower(), set())
+            result = self.tags_db.get(include_tags[0], empty)
         elif operator == 'AND':
             # Intersection of all include tags
-            result = set(tag_image_sets.get(include_tags[0].lower(), set()))
+            result = set(self.tags_db.get(include_tags[0], empty))
             for tag in include_tags[1:]:
-                result = result.intersection(tag_image_sets.get(tag.lower(), set()))
+                result = result.intersection(self.tags_db.get(tag, empty))
         else:  # OR
             # Union of all include tags
             result = set()
             for tag in include_tags:
-                result = result.union(tag_image_sets.get(tag.lower(), set()))
+                result = result.union(self.tags_db.get(tag, empty))
 
         # Apply exclusion logic
         for tag in exclude_tags:
-            result = result - tag_image_sets.get(tag.lower(), set())
+            result = result - self.tags_db.get(tag, empty)
 
         # Convert to full paths if available
         result_with_paths = []
@@ -0,0 +1,277 @@
+"""
+Test Background Classifier Module
+
+Verifies t-shirt suitability decisions and the batched WD14 path using a
+fake tagger, so no model files are needed.
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import background_classifier
+from background_classifier import (
+    BackgroundClassifier, BackgroundType, copy_suitable_images
+)
+
+
+class FakeTagger:
+    """Stand-in for WD14Tagger returning canned tag scores per filename."""
+
+    loaded = True
+    quantized = False
+
+    def __init__(self, tags_by_name):
+        self.tags_by_name = tags_by_name
+        self.tag_names = ['1girl', 'solo'] + sorted(
+            set(BackgroundClassifier.SUITABLE_TAGS) | set(BackgroundClassifier.UNSUITABLE_TAGS))
+        self.calls = []
+
+    def iter_scores(self, image_paths, tag_indices=None, batch_size=None):
+        self.calls.append((len(image_paths), batch_size))
+        for path in image_paths:
+            scores = dict(self.tags_by_name.get(os.path.basename(path), []))
+            row = np.array([scores.get(tag, 0.0) for tag in self.tag_names], dtype=np.float32)
+            yield path, (row if tag_indices is None else row[tag_indices])
+
+
+def _make_images(folder, names):
+    """Create placeholder image files and return their paths."""
+    paths = []
+    for name in names:
+        path = os.path.join(folder, name)
+        with open(path, 'wb') as f:
+            f.write(b'\xff\xd8\xff\xe0 not a real jpeg: ' + name.encode())
+        paths.append(path)
+    return paths
+
+
+def _use_temp_cache(folder):
+    """Point the global background cache at a temporary file."""
+    background_classifier.CACHE_FILE = background_classifier.Path(folder) / "bg_cache.db"
+    background_classifier._cache = None
+
+
+def test_classification_rules():
+    """Test unsuitable-overrides-suitable and best-suitable selection."""
+    print("\n=== Testing Classification Rules ===")
+
+    tags = {
+        'white.jpg': [('white_background', 0.9), ('simple_background', 0.6)],
+        'mixed.jpg': [('simple_background', 0.95), ('floral_background', 0.4)],
+        'none.jpg': [('1girl', 0.99)],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_temp_cache(tmp)
+        white, mixed, none = _make_images(tmp, ['white.jpg', 'mixed.jpg', 'none.jpg'])
+        classifier = BackgroundClassifier(wd14_tagger=FakeTagger(tags))
+
+        result = classifier.classify_image(white)
+        assert result.is_suitable
+        assert result.background_type == BackgroundType.SOLID_COLOR
+        assert abs(result.confidence - 0.9) < 1e-6
+
+        result = classifier.classify_image(mixed)
+        assert not result.is_suitable
+        assert result.background_type == BackgroundType.PATTERN
+
+        result = classifier.classify_image(none)
+        assert not result.is_suitable
+        assert result.background_type == BackgroundType.UNKNOWN
+
+        result = classifier.classify_image(os.path.join(tmp, 'missing.jpg'))
+        assert result.reason == "File not found"
+
+    print("\n[PASS] Classification rule tests passed!")
+
+
+def test_batched_classification():
+    """Test that cache misses are streamed through WD14 and results keep input order."""
+    print("\n=== Testing Batched Classification ===")
+
+    names = [f"img_{i:02d}.jpg" for i in range(20)]
+    tags = {name: [('simple_background', 0.8)] for name in names[::2]}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_temp_cache(tmp)
+        paths = _make_images(tmp, names)
+        tagger = FakeTagger(tags)
+        classifier = BackgroundClassifier(wd14_tagger=tagger)
+
+        results = classifier.classify_batch(paths)
+        assert [r.image_path for r in results] == paths
+        assert [r.is_suitable for r in results] == [i % 2 == 0 for i in range(20)]
+        assert tagger.calls == [(20, BackgroundClassifier.BATCH_SIZE)], tagger.calls
+        print(f"WD14 calls (images, batch size): {tagger.calls}")
+
+        # Second pass is served entirely from the cache
+        suitable, all_results = classifier.find_suitable_images([tmp])
+        assert len(all_results) == 20
+        assert sorted(suitable) == sorted(paths[::2])
+        assert len(tagger.calls) == 1
+        assert classifier.stats['cache_hits'] == 20
+
+        # Cache survives a reload from disk
+        background_classifier._cache = None
+        assert background_classifier.get_cache().get(paths[0]) is not None
+
+        # A moved image is found by content without running WD14 again
+        moved = os.path.join(tmp, 'renamed.jpg')
+        os.rename(paths[0], moved)
+        result = classifier.classify_image(moved)
+        assert result.is_suitable
+        assert len(tagger.calls) == 1
+
+        # Quantized scores are not written to the shared cache
+        extra = _make_images(tmp, ['quantized.jpg'])[0]
+        tagger.quantized = True
+        classifier.classify_batch([extra])
+        assert len(tagger.calls) == 2
+        cache = background_classifier.get_cache()
+        assert cache.get(extra) is None
+
+        # Digests kept for misses that are never cached stay bounded
+        cache.DIGEST_CACHE_SIZE = 3
+        misses = _make_images(tmp, [f"miss_{i}.jpg" for i in range(6)])
+        assert cache.get_many(misses) == {}
+        assert list(cache._digests) == [cache._get_key(p) for p in misses[3:]]
+
+    print("\n[PASS] Batched classification tests passed!")
+
+
+def test_score_vector_matches_tag_rules():
+    """Test that classifying WD14 score vectors agrees with the tag-based rules."""
+    print("\n=== Testing Score Vector Classification ===")
+
+    classifier = BackgroundClassifier(wd14_tagger=FakeTagger({}))
+    classifier._ensure_bg_vocab()
+    rng = np.random.default_rng(0)
+
+    for _ in range(2000):
+        scores = (rng.random(len(classifier._bg_tag_names)) ** 6).astype(np.float32)
+        tags, tag_scores = classifier._background_tags_from_scores(scores, 0.35)
+        expected = classifier._classify_tags('img.png', tags, tag_scores)
+        actual = classifier._classify_scores('img.png', scores, 0.35, tags)
+        assert actual == expected, f"{actual} != {expected}"
+
+        # Loop kernel (compiled when numba is installed) and numpy fallback agree
+        args = (scores.astype(np.float64), classifier._bg_base, classifier._bg_unsuitable, 0.35)
+        assert (background_classifier._score_background_loop(*args)
+                == background_classifier._score_background_numpy(*args))
+
+    print("\n[PASS] Score vector classification tests passed!")
+
+
+def test_transparent_images_skip_wd14():
+    """Test that images with a clear alpha background are classified without WD14."""
+    print("\n=== Testing Alpha Channel Probe ===")
+
+    pixels = np.zeros((20, 30, 4), dtype=np.uint8)
+    pixels[5:15, 5:25] = 200
+    opaque = pixels.copy()
+    opaque[..., 3] = 255
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_temp_cache(tmp)
+        clear_png = os.path.join(tmp, 'clear.png')
+        clear_webp = os.path.join(tmp, 'clear.webp')
+        opaque_png = os.path.join(tmp, 'opaque.png')
+        Image.fromarray(pixels).save(clear_png)
+        Image.fromarray(pixels).save(clear_webp, lossless=True)
+        Image.fromarray(opaque).save(opaque_png)
+
+        tagger = FakeTagger({'opaque.png': [('white_background', 0.9)]})
+        classifier = BackgroundClassifier(wd14_tagger=tagger)
+        results = classifier.classify_batch([clear_png, opaque_png, clear_webp])
+
+        assert [r.background_type for r in results] == [
+            BackgroundType.TRANSPARENT, BackgroundType.SOLID_COLOR, BackgroundType.TRANSPARENT]
+        assert tagger.calls == [(1, BackgroundClassifier.BATCH_SIZE)], tagger.calls
+        assert classifier.stats['transparent'] == 2
+
+        # RGBA with opaque corners passes the header check but not the decode
+        assert background_classifier._fast_transparent_check(opaque_png)
+        assert not background_classifier._has_transparent_background(opaque_png)
+
+        # Palette image with a transparent colour key
+        palette_png = os.path.join(tmp, 'palette.png')
+        Image.fromarray(pixels).convert('RGB').convert('P').save(palette_png, transparency=0)
+        assert background_classifier._has_transparent_background(palette_png)
+
+        # Header-opaque images and opaque alpha images stream through WD14
+        # separately but come out in input order
+        _use_temp_cache(os.path.join(tmp, 'mixed'))
+        plain = _make_images(tmp, ['plain.jpg'])[0]
+        tagger = FakeTagger({'opaque.png': [('white_background', 0.9)],
+                             'plain.jpg': [('simple_background', 0.8)]})
+        classifier = BackgroundClassifier(wd14_tagger=tagger)
+        results = classifier.classify_batch([opaque_png, clear_png, plain])
+        assert [r.image_path for r in results] == [opaque_png, clear_png, plain]
+        assert [r.background_type for r in results][:2] == [
+            BackgroundType.SOLID_COLOR, BackgroundType.TRANSPARENT]
+        assert results[2].is_suitable
+        assert sorted(tagger.calls) == [(1, BackgroundClassifier.BATCH_SIZE)] * 2, tagger.calls
+
+    print("\n[PASS] Alpha channel probe tests passed!")
+
+
+def test_copy_suitable_images():
+    """Test that copies with clashing names get numbered, not overwritten."""
+    print("\n=== Testing Copy Suitable Images ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = []
+        for sub in ('a', 'b', 'c'):
+            os.makedirs(os.path.join(tmp, sub))
+            sources += _make_images(os.path.join(tmp, sub), ['image.jpg'])
+        out = os.path.join(tmp, 'out')
+        os.makedirs(out)
+        _make_images(out, ['image.jpg'])
+
+        result = copy_suitable_images(sources, out, track_operation=False)
+        assert result['copied'] == 3, result
+        assert sorted(os.listdir(out)) == ['image.jpg', 'image_1.jpg', 'image_2.jpg', 'image_3.jpg']
+
+    print("\n[PASS] Copy tests passed!")
+
+
+def main():
+    """Run all tests."""
+    print("="*60)
+    print("Background Classifier Test Suite")
+    print("="*60)
+
+    all_passed = True
+
+    try:
+        test_classification_rules()
+        test_batched_classification()
+        test_score_vector_matches_tag_rules()
+        test_transparent_images_skip_wd14()
+        test_copy_suitable_images()
+
+    except Exception as e:
+        print(f"\n[FAIL] Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        all_passed = False
+
+    print("\n" + "="*60)
+    if all_passed:
+        print("ALL TESTS PASSED!")
+    else:
+        print("SOME TESTS FAILED!")
+    print("="*60)
+
+    return 0 if all_passed else 1
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,217 @@
+"""
+Test Batch Exporter Module
+
+Verifies copy/hardlink/symlink exports, duplicate filename handling and companion
+files using temporary folders.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_exporter import BatchExporter
+from file_ops import fast_copy
+
+
+def _make_sources(folder, count=30):
+    """Create images spread over three folders with clashing names."""
+    paths = []
+    for i in range(count):
+        sub = os.path.join(folder, f"src_{i % 3}")
+        os.makedirs(sub, exist_ok=True)
+        path = os.path.join(sub, f"image_{i // 3:02d}.png")
+        with open(path, 'wb') as f:
+            f.write(b'\x89PNG fake image ' + path.encode())
+        with open(path + '.txt', 'w') as f:
+            f.write(f"tags for {i}")
+        paths.append(path)
+    return paths
+
+
+def test_copy_export():
+    """Test that every image and companion is copied under a unique name."""
+    print("\n=== Testing Copy Export ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _make_sources(tmp)
+        missing = os.path.join(tmp, 'missing.png')
+        exporter = BatchExporter(os.path.join(tmp, 'out'))
+
+        result = exporter.export_images(paths + [missing, paths[0]], 'test', query='a,b')
+        assert result['success'], result
+        assert (result['copied'], result['skipped'], result['failed']) == (30, 1, 0), result
+        assert result['total_size'] == sum(os.path.getsize(p) for p in paths)
+
+        names = os.listdir(result['batch_path'])
+        images = [n for n in names if n.endswith('.png')]
+        assert len(images) == 30 and len(set(images)) == 30
+        assert sum(n.endswith('.png.txt') for n in names) == 30
+        assert 'image_00.png' in images and 'image_00_2.png' in images
+
+        # Each copy carries its own source's bytes and companion
+        contents = set()
+        for name in images:
+            with open(os.path.join(result['batch_path'], name), 'rb') as f:
+                contents.add(f.read())
+        assert len(contents) == 30
+
+        with open(result['manifest_path'], encoding='utf-8') as f:
+            manifest = json.load(f)
+        assert manifest['query'] == 'a,b'
+        assert manifest['total_images'] == 31
+        # Duplicates dropped; exported folder by folder
+        assert [e['original_path'] for e in manifest['manifest']['images']] == sorted(paths)
+        assert manifest['manifest']['images'][0]['size'] == os.path.getsize(paths[0])
+
+        # One scandir per folder finds every existing source
+        stats = BatchExporter._scan_stats(sorted(paths + [missing]))
+        assert set(stats) == set(paths)
+        assert stats[paths[0]].st_size == os.path.getsize(paths[0])
+
+    # Many sources sharing one name get consecutive suffixes
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(5):
+            os.makedirs(os.path.join(tmp, str(i)))
+            paths.append(os.path.join(tmp, str(i), 'same.png'))
+            with open(paths[-1], 'wb') as f:
+                f.write(b'x')
+        result = BatchExporter(os.path.join(tmp, 'out')).export_images(paths, 'dupes')
+        names = sorted(n for n in os.listdir(result['batch_path']) if n.endswith('.png'))
+        assert names == ['same.png', 'same_1.png', 'same_2.png', 'same_3.png', 'same_4.png'], names
+
+    print("\n[PASS] Copy export tests passed!")
+
+
+def test_symlink_export():
+    """Test that symlink mode links images and companions."""
+    print("\n=== Testing Symlink Export ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _make_sources(tmp, count=6)
+        exporter = BatchExporter(os.path.join(tmp, 'out'))
+
+        result = exporter.export_images(paths, 'links', mode='symlink', pretty_manifest=False)
+        assert result['copied'] == 6, result
+        names = sorted(os.listdir(result['batch_path']))
+        assert len(names) == 13  # 6 images, 6 companions, manifest
+
+        # The streamed compact manifest is one valid JSON line
+        with open(result['manifest_path'], encoding='utf-8') as f:
+            text = f.read()
+        assert '\n' not in text
+        assert [e['original_path'] for e in json.loads(text)['manifest']['images']] == sorted(paths)
+
+        # A failed companion link falls back to copying without touching the source
+        original = BatchExporter._symlink_with_fallback
+        calls = []
+
+        def flaky_symlink(src, dst):
+            calls.append(src)
+            if len(calls) == 2:
+                raise OSError("companion link failed")
+            original(src, dst)
+
+        with open(paths[0], 'rb') as f:
+            source_bytes = f.read()
+        BatchExporter._symlink_with_fallback = staticmethod(flaky_symlink)
+        try:
+            result = exporter.export_images(paths[:1], 'flaky', mode='symlink')
+        finally:
+            BatchExporter._symlink_with_fallback = staticmethod(original)
+        assert result['copied'] == 1, result
+        with open(paths[0], 'rb') as f:
+            assert f.read() == source_bytes
+        copied = os.path.join(result['batch_path'], os.path.basename(paths[0]))
+        assert not os.path.islink(copied) and os.path.getsize(copied) == len(source_bytes)
+
+        # fast_copy refuses to copy a file onto a link to itself
+        link = os.path.join(tmp, 'link.png')
+        os.symlink(paths[1], link)
+        try:
+            fast_copy(paths[1], link)
+            assert False, "Copied a file onto itself"
+        except shutil.SameFileError:
+            pass
+        assert os.path.getsize(paths[1]) > 0
+
+    print("\n[PASS] Symlink export tests passed!")
+
+
+def test_hardlink_export():
+    """Test that hardlink mode shares inodes and records the mode."""
+    print("\n=== Testing Hardlink Export ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _make_sources(tmp, count=6)
+        exporter = BatchExporter(os.path.join(tmp, 'out'))
+
+        result = exporter.export_images(paths, 'links', mode='hardlink')
+        assert result['copied'] == 6, result
+        for name in os.listdir(result['batch_path']):
+            if name.endswith('.png'):
+                assert os.stat(os.path.join(result['batch_path'], name)).st_nlink == 2
+        with open(result['manifest_path'], encoding='utf-8') as f:
+            assert json.load(f)['mode'] == 'hardlink'
+
+    print("\n[PASS] Hardlink export tests passed!")
+
+
+def test_background_manifest():
+    """Test that a background manifest lands complete at the returned path."""
+    print("\n=== Testing Background Manifest ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _make_sources(tmp, count=6)
+        exporter = BatchExporter(os.path.join(tmp, 'out'))
+
+        result = exporter.export_images(paths, 'later', background_manifest=True)
+        assert result['success'] and result['manifest_path'], result
+        for thread in threading.enumerate():
+            if thread.name == 'manifest-writer':
+                thread.join()
+        with open(result['manifest_path'], encoding='utf-8') as f:
+            assert len(json.load(f)['manifest']['images']) == 6
+        assert not os.path.exists(result['manifest_path'] + '.tmp')
+
+    print("\n[PASS] Background manifest tests passed!")
+
+
+def main():
+    """Run all tests."""
+    print("="*60)
+    print("Batch Exporter Test Suite")
+    print("="*60)
+
+    all_passed = True
+
+    try:
+        test_copy_export()
+        test_symlink_export()
+        test_hardlink_export()
+        test_background_manifest()
+
+    except Exception as e:
+        print(f"\n[FAIL] Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        all_passed = False
+
+    print("\n" + "="*60)
+    if all_passed:
+        print("ALL TESTS PASSED!")
+    else:
+        print("SOME TESTS FAILED!")
+    print("="*60)
+
+    return 0 if all_passed else 1
+
+
+if __name__ == '__main__':
+    exit(main())
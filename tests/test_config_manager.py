@@ -0,0 +1,281 @@
+"""
+Test Config Manager Module
+
+Verifies folder setup, term lookups and saving using a configuration whose
+source folder (and therefore every output folder) lives in a temporary
+directory.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_manager import ConfigManager
+
+
+def _make_manager(folder, **overrides):
+    """Create a ConfigManager whose folders all live under folder."""
+    source = os.path.join(folder, 'source')
+    os.makedirs(source, exist_ok=True)
+    config = {
+        'config_version': ConfigManager.CURRENT_VERSION,
+        'source_folders': [source],
+        'destination_location': 'source_dirs',
+    }
+    config.update(overrides)
+    config_file = os.path.join(folder, 'config.json')
+    with open(config_file, 'w') as f:
+        json.dump(config, f)
+    return ConfigManager(config_file), source
+
+
+def test_lazy_term_folders():
+    """Test that term folders are only created when first requested."""
+    print("\n=== Testing Lazy Term Folders ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cm, source = _make_manager(tmp)
+        auto_sorted = os.path.join(source, 'auto_sorted')
+        assert cm.sorted_folders['auto_sorted'] == auto_sorted
+        assert os.path.isdir(os.path.join(source, 'removed'))
+
+        cm.add_auto_sort_term('blue sky', priority=1, folder_name='blue: sky')
+        assert os.listdir(auto_sorted) == []
+
+        path = cm.get_term_folder_path('blue sky')
+        assert path == os.path.join(auto_sorted, 'blue_ sky'), path
+        assert os.path.isdir(path)
+        assert cm.get_term_folder_path('missing') is None
+
+        # Folders deleted during the session come back on the next setup
+        os.rmdir(path)
+        os.rmdir(os.path.join(source, 'removed'))
+        cm.setup_folders()
+        assert os.path.isdir(os.path.join(source, 'removed'))
+        assert cm.get_term_folder_path('blue sky') == path and os.path.isdir(path)
+
+    print("\n[PASS] Lazy term folder tests passed!")
+
+
+def test_save_roundtrip():
+    """Test that saved and exported configs reload, including non-ASCII terms."""
+    print("\n=== Testing Save Round Trip ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cm, _ = _make_manager(tmp)
+        cm.add_auto_sort_term('café', priority=1)
+        cm.add_auto_sort_term('猫', priority=2)
+
+        reloaded = ConfigManager(cm.config_file)
+        assert [t['term'] for t in reloaded.get_auto_sort_terms()] == ['café', '猫']
+
+        export_file = os.path.join(tmp, 'terms.json')
+        cm.export_terms(export_file)
+        other, _ = _make_manager(os.path.join(tmp, 'other'))
+        other.import_terms(export_file)
+        assert [t['term'] for t in other.get_auto_sort_terms()] == ['café', '猫']
+
+    print("\n[PASS] Save round trip tests passed!")
+
+
+def test_batch_saves():
+    """Test that changes inside batch() are written once, at the end."""
+    print("\n=== Testing Batched Saves ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cm, _ = _make_manager(tmp)
+        with cm.batch():
+            cm.add_auto_sort_term('one', priority=1)
+            with cm.batch():
+                cm.add_auto_sort_term('two', priority=2)
+            cm.update_auto_sort_settings(multi_tag_mode='multi_folder')
+            with open(cm.config_file, 'rb') as f:
+                assert json.load(f).get('auto_sort_terms', []) == []
+
+        with open(cm.config_file, 'rb') as f:
+            saved = json.load(f)
+        assert [t['term'] for t in saved['auto_sort_terms']] == ['one', 'two']
+        assert saved['auto_sort_settings']['multi_tag_mode'] == 'multi_folder'
+
+        # A block without changes doesn't save
+        mtime = os.stat(cm.config_file).st_mtime_ns
+        with cm.batch():
+            pass
+        assert os.stat(cm.config_file).st_mtime_ns == mtime
+
+    print("\n[PASS] Batched save tests passed!")
+
+
+def test_term_lookup():
+    """Test term lookups after internal and external changes to the term list."""
+    print("\n=== Testing Term Lookup ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cm, source = _make_manager(tmp)
+        with cm.batch():
+            for i, term in enumerate(['red', 'green', 'blue'], 1):
+                cm.add_auto_sort_term(term, priority=i)
+        try:
+            cm.add_auto_sort_term('green')
+            assert False, "Duplicate term was accepted"
+        except ValueError:
+            pass
+
+        cm.update_term_priority('red', 5)
+        assert [t['term'] for t in cm.config['auto_sort_terms']] == ['green', 'blue', 'red']
+
+        cm.remove_auto_sort_term('green')
+        assert cm.get_term_folder_path('green') is None
+        cm.add_auto_sort_term('green', priority=9)
+
+        # Replaced from outside (as the term manager dialog does)
+        cm.config['auto_sort_terms'] = [{'term': 'cyan', 'enabled': True, 'priority': 1}]
+        assert cm.get_term_folder_path('red') is None
+        assert cm.get_term_folder_path('cyan') == os.path.join(source, 'auto_sorted', 'cyan')
+
+    print("\n[PASS] Term lookup tests passed!")
+
+
+def test_in_place_term_edits():
+    """Test lookups after the term manager edits term dicts in place twice."""
+    print("\n=== Testing In-Place Term Edits ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cm, source = _make_manager(tmp)
+        auto_sorted = os.path.join(source, 'auto_sorted')
+        cm.add_auto_sort_term('cat', priority=1)
+        terms = cm.config['auto_sort_terms']
+        assert cm.get_term_folder_path('cat') == os.path.join(auto_sorted, 'cat')
+
+        # Same list reassigned after each edit, as TermManagerDialog._auto_save does
+        for old, new in (('cat', 'kitten'), ('kitten', 'kitty')):
+            terms[0].update({'term': new, 'folder_name': new + '_pics'})
+            cm.config['auto_sort_terms'] = terms
+            cm.save_config()
+            assert cm.get_term_folder_path(old) is None
+            assert cm.get_term_folder_path(new) == os.path.join(auto_sorted, new + '_pics')
+
+        # Even without a save, a changed folder_name is picked up
+        terms[0]['folder_name'] = 'moved'
+        assert cm.get_term_folder_path('kitty') == os.path.join(auto_sorted, 'moved')
+        terms[0]['term'] = 'renamed'
+        assert cm.get_term_folder_path('kitty') is None
+        assert cm.get_term_folder_path('renamed') == os.path.join(auto_sorted, 'moved')
+
+    print("\n[PASS] In-place term edit tests passed!")
+
+
+def test_exclusions():
+    """Test that exclusions follow priority and drop with the excluding term."""
+    print("\n=== Testing Term Exclusions ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cm, _ = _make_manager(tmp)
+        terms = [
+            {'term': 'cat', 'priority': 3, 'exclusion_terms': ['dog']},
+            {'term': 'dog', 'priority': 4},
+            {'term': 'pet', 'priority': 1, 'exclusion_terms': []},
+            {'term': 'kitten', 'priority': 2, 'exclusion_terms': ['pet']},
+        ]
+        names = [t['term'] for t in cm.filter_terms_by_exclusions(terms)]
+        assert names == ['kitten', 'cat'], names
+
+        # Once 'cat' is removed by 'animal', its exclusion of 'dog' no longer applies
+        terms.append({'term': 'animal', 'priority': 3.5, 'exclusion_terms': ['cat']})
+        names = [t['term'] for t in cm.filter_terms_by_exclusions(terms)]
+        assert names == ['kitten', 'animal', 'dog'], names
+        assert cm.filter_terms_by_exclusions([]) == []
+
+    print("\n[PASS] Term exclusion tests passed!")
+
+
+def test_active_sources():
+    """Test the active source list after reassignment and in-place edits."""
+    print("\n=== Testing Active Sources ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cm, source = _make_manager(tmp)
+        assert cm.get_active_source_folders() == [source]
+        cm.get_active_source_folders().append('changed by caller')
+        assert cm.get_active_source_folders() == [source]
+
+        # Reassigned from outside (as the hub and setup dialog do)
+        cm.config['source_folders'] = ['a', 'b', 'c']
+        cm.config['active_sources'] = {'a': True, 'b': False}
+        assert cm.get_active_source_folders() == ['a', 'c']
+
+        # Toggled in place and reassigned (as the hub's toggle_folder does)
+        active = cm.config['active_sources']
+        active['a'] = False
+        cm.config['active_sources'] = active
+        assert cm.get_active_source_folders() == ['c']
+
+    print("\n[PASS] Active source tests passed!")
+
+
+def test_load_merges_defaults():
+    """Test that partial nested sections and old terms get default fields."""
+    print("\n=== Testing Default Merging ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cm, _ = _make_manager(
+            tmp,
+            auto_sort_settings={'multi_tag_mode': 'multi_folder'},
+            auto_sort_terms=[{'term': 'old', 'enabled': True, 'priority': 1},
+                             {'term': 'older', 'enabled': True, 'priority': 2}],
+        )
+        settings = cm.get_auto_sort_settings()
+        assert settings['multi_tag_mode'] == 'multi_folder'
+        assert settings['max_tags_for_combination'] == 3
+
+        old, older = cm.config['auto_sort_terms']
+        assert old['search_scope'] == 'either' and old['exclusion_terms'] == []
+        assert old['exclusion_terms'] is not older['exclusion_terms']
+
+        # Defaults are never shared with a loaded config
+        cm.config['auto_sort_settings']['multi_tag_mode'] = 'single_folder'
+        assert cm.default_config['auto_sort_settings']['multi_tag_mode'] == 'all_combinations'
+
+    print("\n[PASS] Default merging tests passed!")
+
+
+def main():
+    """Run all tests."""
+    print("="*60)
+    print("Config Manager Test Suite")
+    print("="*60)
+
+    all_passed = True
+
+    try:
+        test_lazy_term_folders()
+        test_save_roundtrip()
+        test_batch_saves()
+        test_term_lookup()
+        test_in_place_term_edits()
+        test_exclusions()
+        test_active_sources()
+        test_load_merges_defaults()
+
+    except Exception as e:
+        print(f"\n[FAIL] Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        all_passed = False
+
+    print("\n" + "="*60)
+    if all_passed:
+        print("ALL TESTS PASSED!")
+    else:
+        print("SOME TESTS FAILED!")
+    print("="*60)
+
+    return 0 if all_passed else 1
+
+
+if __name__ == '__main__':
+    exit(main())
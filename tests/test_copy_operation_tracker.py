@@ -0,0 +1,154 @@
+"""
+Test Copy Operation Tracker Module
+
+Verifies progress tracking and resuming with the state file redirected to a
+temporary directory.
+"""
+
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy_operation_tracker
+from copy_operation_tracker import CopyOperationTracker
+
+
+def _make_sources(folder, count):
+    """Create count small source files."""
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"image_{i:03d}.png")
+        with open(path, 'wb') as f:
+            f.write(b'fake image %d' % i)
+        paths.append(path)
+    return paths
+
+
+def test_resume():
+    """Test that an interrupted operation resumes with only the remaining files."""
+    print("\n=== Testing Resume ===")
+
+    state_file = copy_operation_tracker.STATE_FILE
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            copy_operation_tracker.STATE_FILE = Path(tmp) / 'data' / 'pending.json'
+            paths = _make_sources(tmp, 25)
+            output = os.path.join(tmp, 'out')
+            os.makedirs(output)
+
+            tracker = CopyOperationTracker()
+            assert not tracker.has_pending_operation()
+            tracker.start_operation(paths, output, operation_type='test_copy')
+            for path in paths[:12] + paths[:3]:
+                tracker.mark_copied(path)
+            assert tracker.state['copied_files'] == paths[:12]
+
+            # A new tracker (next session) sees the last checkpoint
+            tracker = CopyOperationTracker()
+            info = tracker.get_pending_info()
+            assert info['operation_type'] == 'test_copy'
+            assert info['copied_count'] == 10, info
+            assert info['remaining_files'] == paths[10:]
+
+            result = tracker.resume_operation()
+            assert result['resumed_copied'] == 15 and result['failed'] == 0, result
+            assert len(os.listdir(output)) == 15
+            assert not tracker.has_pending_operation()
+            assert not copy_operation_tracker.STATE_FILE.exists()
+    finally:
+        copy_operation_tracker.STATE_FILE = state_file
+
+    print("\n[PASS] Resume tests passed!")
+
+
+def test_journal():
+    """Test that progress goes to the journal and is folded back on compaction."""
+    print("\n=== Testing Journal ===")
+
+    state_file = copy_operation_tracker.STATE_FILE
+    compact_lines = copy_operation_tracker.JOURNAL_COMPACT_LINES
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            copy_operation_tracker.STATE_FILE = Path(tmp) / 'pending.json'
+            journal = copy_operation_tracker._journal_file()
+            paths = _make_sources(tmp, 30)
+
+            tracker = CopyOperationTracker()
+            tracker.start_operation(paths, tmp)
+            with open(copy_operation_tracker.STATE_FILE, 'rb') as f:
+                base = f.read()
+            for path in paths[:20]:
+                tracker.mark_copied(path)
+            with open(copy_operation_tracker.STATE_FILE, 'rb') as f:
+                assert f.read() == base
+            tracker._journal.close()
+
+            # A torn final line is ignored on replay, and the replayed
+            # journal is folded into the state file
+            with open(journal, 'a', encoding='utf-8') as f:
+                f.write('"' + paths[20][:-3])
+            tracker = CopyOperationTracker()
+            assert tracker.get_pending_info()['copied_count'] == 20
+            assert not journal.exists()
+
+            # Crash again after more progress: nothing is glued to the torn line
+            for path in paths[20:23]:
+                tracker.mark_copied(path)
+            tracker._journal.close()
+            tracker = CopyOperationTracker()
+            assert tracker.state['copied_files'] == paths[:23]
+
+            # Compaction folds the journal into the state file
+            copy_operation_tracker.JOURNAL_COMPACT_LINES = 2
+            for path in paths[23:25]:
+                tracker.mark_copied(path)
+            assert not journal.exists()
+            with open(copy_operation_tracker.STATE_FILE, encoding='utf-8') as f:
+                assert json.load(f)['copied_files'] == paths[:25]
+            tracker.mark_copied(paths[25])
+            assert journal.exists()
+
+            tracker.cancel_operation()
+            assert not journal.exists() and not copy_operation_tracker.STATE_FILE.exists()
+    finally:
+        copy_operation_tracker.STATE_FILE = state_file
+        copy_operation_tracker.JOURNAL_COMPACT_LINES = compact_lines
+
+    print("\n[PASS] Journal tests passed!")
+
+
+def main():
+    """Run all tests."""
+    print("="*60)
+    print("Copy Operation Tracker Test Suite")
+    print("="*60)
+
+    all_passed = True
+
+    try:
+        test_resume()
+        test_journal()
+
+    except Exception as e:
+        print(f"\n[FAIL] Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        all_passed = False
+
+    print("\n" + "="*60)
+    if all_passed:
+        print("ALL TESTS PASSED!")
+    else:
+        print("SOME TESTS FAILED!")
+    print("="*60)
+
+    return 0 if all_passed else 1
+
+
+if __name__ == '__main__':
+    exit(main())
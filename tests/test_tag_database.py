@@ -0,0 +1,163 @@
+"""
+Test Tag Database Module
+
+Verifies tag search and image queries against a small temporary SQLite
+database.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tag_database import TagDatabase
+
+
+TAG_DATA = {
+    '1girl': ['a.png', 'b.png', 'c.png', 'd.png'],
+    'solo': ['a.png', 'b.png', 'c.png'],
+    'white_background': ['a.png', 'b.png', 'c.png'],
+    'simple_background': ['a.png', 'b.png'],
+    'smile': ['b.png', 'd.png'],
+    '100%_cotton': ['d.png'],
+    'Blonde_Hair': ['c.png'],
+}
+
+
+def _make_db(folder):
+    """Create a database populated with TAG_DATA."""
+    db = TagDatabase(os.path.join(folder, 'tags.db'))
+    db.bulk_insert_tags(TAG_DATA)
+    return db
+
+
+def test_search_tags():
+    """Test case-insensitive substring search with literal wildcards."""
+    print("\n=== Testing Tag Search ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _make_db(tmp)
+
+        tags = [row[0] for row in db.search_tags('background')]
+        assert tags == ['white_background', 'simple_background'], tags
+
+        assert [row[0] for row in db.search_tags('blonde')] == ['Blonde_Hair']
+        assert [row[0] for row in db.search_tags('%')] == ['100%_cotton']
+        assert [row[0] for row in db.search_tags('e_b')] == ['white_background', 'simple_background']
+        assert db.search_tags('e%b') == []
+        assert len(db.search_tags('', limit=3)) == 3
+
+        # Paging walks the same order as a full listing
+        full = db.list_tags()
+        pages = db.list_tags(limit=3) + db.list_tags(limit=3, offset=3) + db.list_tags(limit=3, offset=6)
+        assert pages == full and db.count_tags() == len(full) == len(TAG_DATA)
+
+        db.set_hidden('smile')
+        assert db.search_tags('smile') == []
+        assert db.search_tags('smile', include_hidden=True)[0][3] is True
+
+        db.set_favorite('simple_background')
+        assert db.search_tags('background')[0][:3] == ('simple_background', 2, True)
+        db.close()
+
+    print("\n[PASS] Tag search tests passed!")
+
+
+def test_query_bitmap():
+    """Test the bitmap OR/AND/NOT query against Python set logic."""
+    print("\n=== Testing Bitmap Queries ===")
+
+    def expected(or_tags, and_tags, not_tags):
+        if not or_tags and not and_tags:
+            return set()
+        images = {path for paths in TAG_DATA.values() for path in paths}
+        if or_tags:
+            images &= {path for tag in or_tags for path in TAG_DATA.get(tag, [])}
+        for tag in and_tags:
+            images &= set(TAG_DATA[tag])
+        for tag in not_tags:
+            images -= set(TAG_DATA[tag])
+        return images
+
+    queries = [
+        (['smile'], [], []),
+        (['smile', 'white_background'], [], []),
+        ([], ['solo', 'simple_background'], []),
+        (['white_background', 'smile'], ['solo'], []),
+        (['white_background', 'smile'], ['solo', '1girl'], ['Blonde_Hair']),
+        ([], ['1girl'], ['smile', 'white_background']),
+        ([], [], ['smile']),
+        (['missing_tag'], [], []),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _make_db(tmp)
+        for or_tags, and_tags, not_tags in queries:
+            images = db.query_bitmap(or_tags, and_tags, not_tags)
+            assert images == sorted(expected(or_tags, and_tags, not_tags)), (or_tags, and_tags, not_tags)
+
+        # query_images with both operators and exclusions
+        assert sorted(db.query_images(['solo', 'smile'], [], 'AND')) == ['b.png']
+        assert sorted(db.query_images(['1girl', 'smile'], [], 'and')) == ['b.png', 'd.png']
+        assert sorted(db.query_images(['solo', 'smile'], ['white_background'])) == ['d.png']
+        db.close()
+
+    print("\n[PASS] Bitmap query tests passed!")
+
+
+def test_writer_failure():
+    """Test that flag updates still land when the writer thread cannot start."""
+    print("\n=== Testing Writer Failure ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _make_db(tmp)
+        assert db.search_tags('smile')[0][2] is False
+
+        # The writer opens its own connection from db_path; make that fail
+        db.db_path = Path(tmp) / 'missing' / 'tags.db'
+        db.set_favorite('smile')
+        assert db.search_tags('smile')[0][2] is True
+        assert not db._writer.is_alive()
+
+        db.set_hidden('solo')
+        db.flush_writes()
+        assert db.search_tags('solo') == []
+        db.close()
+
+    print("\n[PASS] Writer failure tests passed!")
+
+
+def main():
+    """Run all tests."""
+    print("="*60)
+    print("Tag Database Test Suite")
+    print("="*60)
+
+    all_passed = True
+
+    try:
+        test_search_tags()
+        test_query_bitmap()
+        test_writer_failure()
+
+    except Exception as e:
+        print(f"\n[FAIL] Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        all_passed = False
+
+    print("\n" + "="*60)
+    if all_passed:
+        print("ALL TESTS PASSED!")
+    else:
+        print("SOME TESTS FAILED!")
+    print("="*60)
+
+    return 0 if all_passed else 1
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -19,6 +19,7 @@ Version: 1.1 - Added result caching
 import os
 import cv2
 import json
+import mmap
 import numpy as np
 import pandas as pd
 import logging
@@ -27,6 +28,7 @@ from pathlib import Path
 from PIL import Image
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 logging.basicConfig(
     level=logging.INFO,
@@ -114,6 +116,77 @@ def smart_resize(img, size):
     return img
 
 
+def _imdecode_mmap(image_path):
+    """imdecode straight from a read-only memory map of the file."""
+    with open(image_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        data = np.frombuffer(mapped, dtype=np.uint8)
+        try:
+            return cv2.imdecode(data, cv2.IMREAD_UNCHANGED)
+        finally:
+            # The map can't be closed while an array still exports it
+            del data
+
+
+def decode_bgr(image_path, use_mmap=False):
+    """
+    Decode an 8-bit image with OpenCV, compositing any alpha onto white.
+
+    Args:
+        image_path: Path to image file
+        use_mmap: Decode from a memory map of the file instead of reading
+            it into a buffer first (one copy less per image)
+
+    Returns:
+        BGR uint8 array, or None if OpenCV can't decode it as 8-bit
+    """
+    # np.fromfile/open + imdecode also cope with non-ASCII paths on Windows
+    try:
+        if use_mmap:
+            image = _imdecode_mmap(image_path)
+        else:
+            image = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8),
+                                 cv2.IMREAD_UNCHANGED)
+    except (OSError, ValueError, cv2.error):
+        # Empty files can't be mapped (ValueError) or decoded (cv2.error)
+        return None
+    if image is None or image.dtype != np.uint8:
+        return None
+
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 4:
+        # Alpha to white background: bgr * a + 255 * (1 - a)
+        alpha = image[:, :, 3:].astype(np.uint16)
+        bgr = image[:, :, :3].astype(np.uint16)
+        return ((bgr * alpha + 255 * (255 - alpha) + 127) // 255).astype(np.uint8)
+    if image.shape[2] == 3:
+        return image
+    return None
+
+
+def decode_bgr_pil(image_path):
+    """
+    Decode an image with PIL, compositing any alpha onto white.
+
+    Args:
+        image_path: Path to image file
+
+    Returns:
+        BGR uint8 array
+    """
+    image = Image.open(image_path)
+
+    # Alpha to white background
+    image = image.convert('RGBA')
+    new_image = Image.new('RGBA', image.size, 'WHITE')
+    new_image.paste(image, mask=image)
+    image = new_image.convert('RGB')
+
+    # PIL RGB to OpenCV BGR
+    return np.asarray(image)[:, :, ::-1]
+
+
 class WD14Tagger:
     """WaifuDiffusion 1.4 tagger for anime/AI art image analysis."""
 
@@ -121,11 +194,19 @@ class WD14Tagger:
     CACHE_EXTENSION = '.wd14cache.json'
     CACHE_VERSION = '1.1'  # Increment when model or processing changes
 
+    # Images per session.run() call in the batched inference path
+    DEFAULT_BATCH_SIZE = 16
+
+    # Suffix of the int8 model written next to model_path
+    QUANTIZED_SUFFIX = '.quant.onnx'
+
     def __init__(self,
                  model_path='models/wd14/model.onnx',
                  tags_path='models/wd14/selected_tags.csv',
                  threshold=0.35,
-                 use_cache=True):
+                 use_cache=True,
+                 quantized=False,
+                 use_mmap=False):
         """
         Initialize WD14 tagger.
 
@@ -134,12 +215,18 @@ class WD14Tagger:
             tags_path: Path to tags CSV file
             threshold: Minimum confidence threshold for tags (0.0-1.0)
             use_cache: Whether to use file-based caching (default True)
+            quantized: Run an int8 (dynamically quantized) copy of the model,
+                created next to model_path on first use. Faster on CPU but
+                less precise, so results are not written to the cache files.
+            use_mmap: Decode images from memory-mapped files
         """
         self.logger = logging.getLogger(__name__)
         self.model_path = Path(model_path)
         self.tags_path = Path(tags_path)
         self.threshold = threshold
         self.use_cache = use_cache
+        self.quantized = quantized
+        self.use_mmap = use_mmap
         self.model = None
         self.tags_df = None
         self.tag_names = []
@@ -214,7 +301,8 @@ class WD14Tagger:
         Returns:
             True if cache saved successfully
         """
-        if not self.use_cache:
+        # Cache files are shared with full-precision tagging
+        if not self.use_cache or self.quantized:
             return False
 
         cache_path = self._get_cache_path(image_path)
@@ -261,13 +349,20 @@ class WD14Tagger:
             self.loaded = False
             return
 
+        model_path = self.model_path
+        if self.quantized:
+            model_path = self._ensure_quantized_model()
+            if model_path is None:
+                self.quantized = False
+                model_path = self.model_path
+
         try:
-            print(f"Loading WD14 model from {self.model_path}...")
+            print(f"Loading WD14 model from {model_path}...")
             providers = get_providers()
             print(f"Using providers: {providers}")
 
             self.model = ort.InferenceSession(
-                str(self.model_path),
+                str(model_path),
                 providers=providers
             )
 
@@ -279,6 +374,35 @@ class WD14Tagger:
             self.logger.error(f"Failed to load model: {e}")
             self.loaded = False
 
+    def quantized_model_path(self) -> Path:
+        """Path of the int8 copy of the model (model.onnx -> model.quant.onnx)."""
+        return self.model_path.with_suffix(self.QUANTIZED_SUFFIX)
+
+    def _ensure_quantized_model(self) -> Optional[Path]:
+        """
+        Create the int8 model with ONNX Runtime dynamic quantization, once.
+
+        Returns:
+            Path to the quantized model, or None if it can't be created
+        """
+        quant_path = self.quantized_model_path()
+        if quant_path.exists() and quant_path.stat().st_mtime >= self.model_path.stat().st_mtime:
+            return quant_path
+
+        try:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+        except ImportError as e:
+            self.logger.warning(f"ONNX quantization unavailable, using full model: {e}")
+            return None
+
+        try:
+            print(f"Quantizing WD14 model to {quant_path} (one-time)...")
+            quantize_dynamic(str(self.model_path), str(quant_path), weight_type=QuantType.QInt8)
+            return quant_path
+        except Exception as e:
+            self.logger.warning(f"Failed to quantize model, using full model: {e}")
+            return None
+
     def _load_tags(self):
         """Load tag vocabulary from CSV."""
         if not self.tags_path.exists():
@@ -310,20 +434,10 @@ class WD14Tagger:
         # Get model input size
         _, height, _, _ = self.model.get_inputs()[0].shape
 
-        # Load image with PIL
-        image = Image.open(image_path)
-
-        # Alpha to white background
-        image = image.convert('RGBA')
-        new_image = Image.new('RGBA', image.size, 'WHITE')
-        new_image.paste(image, mask=image)
-        image = new_image.convert('RGB')
-
-        # Convert to numpy (OpenCV format)
-        image = np.asarray(image)
-
-        # PIL RGB to OpenCV BGR
-        image = image[:, :, ::-1]
+        # Decode with OpenCV; PIL handles what it can't (GIF, 16-bit, ...)
+        image = decode_bgr(image_path, self.use_mmap)
+        if image is None:
+            image = decode_bgr_pil(image_path)
 
         # Make square and resize to model input size
         image = make_square(image, height)
@@ -335,6 +449,28 @@ class WD14Tagger:
 
         return image
 
+    def _run_inference(self, images: np.ndarray) -> np.ndarray:
+        """
+        Run the ONNX model on a stack of preprocessed images.
+
+        Args:
+            images: Float32 array of shape (N, H, W, 3)
+
+        Returns:
+            Confidence array of shape (N, len(tag_names))
+        """
+        input_name = self.model.get_inputs()[0].name
+        label_name = self.model.get_outputs()[0].name
+        return self.model.run([label_name], {input_name: images})[0]
+
+    def _preprocess_or_none(self, image_path):
+        """Preprocess an image, returning None instead of raising on failure."""
+        try:
+            return self.preprocess_image(image_path)
+        except Exception as e:
+            self.logger.error(f"Preprocessing failed for {image_path}: {e}")
+            return None
+
     def interrogate(self, image_path, skip_cache=False):
         """
         Run WD14 model inference on image (with caching).
@@ -364,9 +500,7 @@ class WD14Tagger:
             image = self.preprocess_image(image_path)
 
             # Run inference
-            input_name = self.model.get_inputs()[0].name
-            label_name = self.model.get_outputs()[0].name
-            confidences = self.model.run([label_name], {input_name: image})[0]
+            confidences = self._run_inference(image)
 
             # Combine tags with confidences
             tag_confidences = {}
@@ -382,6 +516,189 @@ class WD14Tagger:
             self.logger.error(f"Inference failed for {image_path}: {e}")
             return {}
 
+    def _infer_pending(self, image_paths, pending, batch_size):
+        """
+        Run batched inference for the given indices into image_paths.
+
+        Images are decoded on a thread pool and stacked so the model runs once
+        per batch instead of once per image. The next batch is decoded while
+        the current one is in the model, so disk and decode time overlap
+        inference.
+
+        Yields:
+            (index, confidence_row) for every pending index, in order;
+            confidence_row is None if the image failed
+        """
+        if not self.loaded or self.model is None:
+            if pending:
+                self.logger.warning("Model not loaded, cannot interrogate")
+            for i in pending:
+                yield i, None
+            return
+
+        # Models exported with a fixed batch dimension only accept one image
+        if self.model.get_inputs()[0].shape[0] == 1:
+            batch_size = 1
+
+        chunks = [pending[start:start + batch_size]
+                  for start in range(0, len(pending), batch_size)]
+        if not chunks:
+            return
+
+        workers = min(batch_size, os.cpu_count() or 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            def start_decoding(chunk):
+                return [(i, pool.submit(self._preprocess_or_none, image_paths[i]))
+                        for i in chunk]
+
+            upcoming = start_decoding(chunks[0])
+            for n in range(len(chunks)):
+                decoding = upcoming
+                if n + 1 < len(chunks):
+                    upcoming = start_decoding(chunks[n + 1])
+
+                images = [(i, future.result()) for i, future in decoding]
+                valid = [(i, image) for i, image in images if image is not None]
+                rows = {}
+
+                if valid:
+                    try:
+                        confidences = self._run_inference(
+                            np.concatenate([image for _, image in valid]))
+                        rows = {i: row for (i, _), row in zip(valid, confidences)}
+                    except Exception as e:
+                        # Some exported models have a fixed batch dimension of 1
+                        self.logger.debug(f"Batched inference failed, running per image: {e}")
+                        for i, image in valid:
+                            try:
+                                rows[i] = self._run_inference(image)[0]
+                            except Exception as e:
+                                self.logger.error(f"Inference failed for {image_paths[i]}: {e}")
+
+                for i, _ in images:
+                    yield i, rows.get(i)
+
+    def _split_cached(self, image_paths, skip_cache):
+        """
+        Look up per-image caches for a list of images.
+
+        Returns:
+            (cached, pending): dict of index -> cached tag_confidences, and the
+            list of indices that still need inference
+        """
+        cached = {}
+        pending = []
+        for i, image_path in enumerate(image_paths):
+            if not skip_cache:
+                tag_confidences = self._load_cache(image_path)
+                if tag_confidences is not None:
+                    cached[i] = tag_confidences
+                    continue
+            self.cache_misses += 1
+            pending.append(i)
+        return cached, pending
+
+    def interrogate_batch(self, image_paths, batch_size=None, skip_cache=False):
+        """
+        Run WD14 model inference on many images, batch_size images per call.
+
+        Cached images are served from their cache files; only the rest reach
+        the model.
+
+        Args:
+            image_paths: List of image file paths
+            batch_size: Images per inference call (uses DEFAULT_BATCH_SIZE if None)
+            skip_cache: If True, bypass cache and force re-inference
+
+        Returns:
+            List of tag->confidence dicts, aligned with image_paths
+            (empty dict for images that failed)
+        """
+        batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+        cached, pending = self._split_cached(image_paths, skip_cache)
+
+        results = [cached.get(i, {}) for i in range(len(image_paths))]
+        for i, row in self._infer_pending(image_paths, pending, batch_size):
+            if row is None:
+                continue
+            tag_confidences = dict(zip(self.tag_names, row.tolist()))
+            self._save_cache(image_paths[i], tag_confidences)
+            results[i] = tag_confidences
+
+        return results
+
+    def iter_scores(self, image_paths, tag_indices=None, batch_size=None, skip_cache=False):
+        """
+        Stream raw confidence vectors for many images using batched inference.
+
+        Results come out in input order as soon as each batch finishes, so
+        callers can report progress while later batches are still decoding.
+        Unlike interrogate_batch, no per-tag dicts are built for inferred
+        images, so callers interested in a handful of tags can index the
+        vector directly.
+
+        Args:
+            image_paths: List of image file paths
+            tag_indices: Optional array of vocabulary indices to keep
+                (defaults to the whole vocabulary)
+            batch_size: Images per inference call (uses DEFAULT_BATCH_SIZE if None)
+            skip_cache: If True, bypass cache and force re-inference
+
+        Yields:
+            (image_path, scores) where scores is a float32 array (one entry per
+            tag_indices element, in the same order), or None if the image failed
+        """
+        batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+        if tag_indices is None:
+            tag_indices = np.arange(len(self.tag_names))
+        names = [self.tag_names[j] for j in tag_indices]
+
+        # _save_cache refuses quantized scores, so skip building their dicts
+        save_cache = self.use_cache and not self.quantized
+        cached, pending = self._split_cached(image_paths, skip_cache)
+        inferred = self._infer_pending(image_paths, pending, batch_size)
+
+        for i, image_path in enumerate(image_paths):
+            if i in cached:
+                tag_confidences = cached[i]
+                yield image_path, np.fromiter(
+                    (tag_confidences.get(name, 0.0) for name in names),
+                    dtype=np.float32, count=len(names))
+                continue
+
+            _, row = next(inferred)
+            if row is None:
+                yield image_path, None
+                continue
+            if save_cache:
+                self._save_cache(image_path, dict(zip(self.tag_names, row.tolist())))
+            yield image_path, row[tag_indices]
+
+    def score_batch(self, image_paths, tag_indices=None, batch_size=None, skip_cache=False):
+        """
+        Get raw confidence vectors for many images using batched inference.
+
+        List form of iter_scores.
+
+        Returns:
+            List of float32 arrays (or None for images that failed), aligned
+            with image_paths
+        """
+        return [scores for _, scores in
+                self.iter_scores(image_paths, tag_indices, batch_size, skip_cache)]
+
+    def _filter_tags(self, tag_confidences, threshold):
+        """Filter tag confidences by threshold, sorted by confidence descending."""
+        filtered_tags = [
+            (tag, conf)
+            for tag, conf in tag_confidences.items()
+            if conf >= threshold
+        ]
+
+        filtered_tags.sort(key=lambda x: x[1], reverse=True)
+
+        return filtered_tags
+
     def get_tags(self, image_path, threshold=None):
         """
         Get filtered tags above confidence threshold.
@@ -402,16 +719,27 @@ class WD14Tagger:
         if not tag_confidences:
             return []
 
-        # Filter by threshold and sort by confidence
-        filtered_tags = [
-            (tag, conf)
-            for tag, conf in tag_confidences.items()
-            if conf >= threshold
-        ]
+        return self._filter_tags(tag_confidences, threshold)
 
-        filtered_tags.sort(key=lambda x: x[1], reverse=True)
+    def get_tags_batch(self, image_paths, threshold=None, batch_size=None):
+        """
+        Get filtered tags for many images using batched inference.
 
-        return filtered_tags
+        Args:
+            image_paths: List of image file paths
+            threshold: Confidence threshold (uses self.threshold if None)
+            batch_size: Images per inference call (uses DEFAULT_BATCH_SIZE if None)
+
+        Returns:
+            List of (tag, confidence) lists, aligned with image_paths
+        """
+        if threshold is None:
+            threshold = self.threshold
+
+        return [
+            self._filter_tags(tag_confidences, threshold)
+            for tag_confidences in self.interrogate_batch(image_paths, batch_size)
+        ]
 
     def generate_tags_for_image(self, image_path, threshold=None):
         """